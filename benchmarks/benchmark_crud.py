@@ -0,0 +1,222 @@
+"""
+Mikrobenchmark CRUD operací podle velikosti tabulky.
+
+Pro každou velikost (výchozí 1k, 100k a 1M řádků) připraví tabulku
+s daným počtem úkolů a změří jednotlivá volání uloz_ukol_do_databaze,
+obou čtecích funkcí, zmenit_stav_ukolu_v_databazi a odstranit_ukol_z_databaze.
+Pro každou operaci vypíše rozložení latence (p50, p90, p99, max)
+a propustnost a výsledky uloží jako JSON.
+
+S parametrem --porovnat porovná výsledky s uloženým základem a označí
+operace, jejichž medián latence nebo propustnost se zhoršily víc, než
+dovoluje --tolerance; v takovém případě skončí s návratovým kódem 1.
+
+Spuštění z kořene projektu:
+    $ python -m benchmarks.benchmark_crud --velikosti 1000,100000
+    $ python -m benchmarks.benchmark_crud --porovnat benchmarks/zaklad_crud.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from src.jadro import (
+    STAVY,
+    UlozisteMySQL,
+    UlozisteSQLite,
+    nacist_ukoly_z_databaze,
+    nacist_vsechny_ukoly_z_databaze,
+    nastavit_cache,
+    odstranit_ukol_z_databaze,
+    uloz_ukol_do_databaze,
+    uloz_ukoly_hromadne,
+    zmenit_stav_ukolu_hromadne,
+    zmenit_stav_ukolu_v_databazi,
+)
+from benchmarks.benchmark_uloziste import pripravit_tabulku
+
+# úkoly se při plnění tabulky posílají po částech, aby se milion řádků
+# nemusel najednou držet v paměti
+VELIKOST_PLNENI = 10000
+
+
+def naplnit_tabulku(pocet):
+    """Vloží do prázdné tabulky 'pocet' úkolů s náhodným stavem; vrátí jejich ID."""
+    vlozena_id = []
+    for zacatek in range(0, pocet, VELIKOST_PLNENI):
+        konec = min(pocet, zacatek + VELIKOST_PLNENI)
+        vlozena_id.extend(
+            uloz_ukoly_hromadne([(f"Úkol {i}", f"Popis {i}") for i in range(zacatek, konec)])[0]
+        )
+    # stavy se rozdělí rovnoměrně, aby čtení aktivních úkolů vracelo asi dvě třetiny tabulky
+    for poradi, stav in enumerate(STAVY[1:], start=1):
+        zmenit_stav_ukolu_hromadne(vlozena_id[poradi :: len(STAVY)], stav)
+    return vlozena_id
+
+
+def percentil(serazene, podil):
+    """Vrátí percentil z již seřazeného seznamu (nejbližší vyšší hodnota)."""
+    index = min(len(serazene) - 1, max(0, round(podil * len(serazene) + 0.5) - 1))
+    return serazene[index]
+
+
+def shrnout(latence):
+    """Z latencí jednotlivých volání (v sekundách) spočte souhrn v milisekundách."""
+    serazene = sorted(latence)
+    celkem = sum(serazene)
+    return {
+        "volani": len(serazene),
+        "p50_ms": percentil(serazene, 0.50) * 1000,
+        "p90_ms": percentil(serazene, 0.90) * 1000,
+        "p99_ms": percentil(serazene, 0.99) * 1000,
+        "max_ms": serazene[-1] * 1000,
+        "prumer_ms": statistics.fmean(serazene) * 1000,
+        "ops_s": len(serazene) / celkem if celkem else float("inf"),
+    }
+
+
+def merit(funkce, argumenty):
+    """Zavolá funkci pro každou n-tici argumentů a vrátí seznam latencí."""
+    latence = []
+    for parametry in argumenty:
+        zacatek = time.perf_counter()
+        funkce(*parametry)
+        latence.append(time.perf_counter() - zacatek)
+    return latence
+
+
+def zmerit_velikost(velikost, opakovani, generator):
+    """Připraví tabulku o dané velikosti a změří všechny operace."""
+    vlozena_id = naplnit_tabulku(velikost)
+    # čtení celé tabulky roste s její velikostí, u velkých tabulek se proto opakuje méně
+    opakovani_cteni = max(3, min(opakovani, opakovani * 1000 // velikost))
+    vzorek = generator.sample(vlozena_id, min(opakovani, len(vlozena_id)))
+
+    vysledky = {}
+    vysledky["vložení"] = shrnout(
+        merit(uloz_ukol_do_databaze, [(f"Nový {i}", "Popis") for i in range(opakovani)])
+    )
+    vysledky["čtení aktivních"] = shrnout(
+        merit(nacist_ukoly_z_databaze, [()] * opakovani_cteni)
+    )
+    vysledky["čtení všech"] = shrnout(
+        merit(nacist_vsechny_ukoly_z_databaze, [()] * opakovani_cteni)
+    )
+    # cílový stav se střídá, aby každé volání skutečně řádek změnilo
+    vysledky["změna stavu"] = shrnout(
+        merit(
+            zmenit_stav_ukolu_v_databazi,
+            [(id_ukolu, "probíhá" if i % 2 else "hotovo") for i, id_ukolu in enumerate(vzorek)],
+        )
+    )
+    vysledky["odstranění"] = shrnout(
+        merit(odstranit_ukol_z_databaze, [(id_ukolu,) for id_ukolu in vzorek])
+    )
+    return vysledky
+
+
+def porovnat(vysledky, zaklad, tolerance):
+    """
+    Porovná výsledky se základem.
+
+    Návratová hodnota:
+        list: n-tice (velikost, operace, metrika, základ, nyní, poměr) pro
+        každou metriku, která se zhoršila o víc než 'tolerance' (0.2 = 20 %).
+    """
+    regrese = []
+    for velikost, operace in vysledky["velikosti"].items():
+        zaklad_velikosti = zaklad.get("velikosti", {}).get(velikost, {})
+        for nazev, hodnoty in operace.items():
+            puvodni = zaklad_velikosti.get(nazev)
+            if puvodni is None:
+                continue
+            if hodnoty["p50_ms"] > puvodni["p50_ms"] * (1 + tolerance):
+                regrese.append(
+                    (velikost, nazev, "p50_ms", puvodni["p50_ms"], hodnoty["p50_ms"],
+                     hodnoty["p50_ms"] / puvodni["p50_ms"])
+                )
+            if hodnoty["ops_s"] < puvodni["ops_s"] / (1 + tolerance):
+                regrese.append(
+                    (velikost, nazev, "ops_s", puvodni["ops_s"], hodnoty["ops_s"],
+                     hodnoty["ops_s"] / puvodni["ops_s"])
+                )
+    return regrese
+
+
+def vypsat(vysledky):
+    print(f"{'řádků':>9}  {'operace':<16}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}"
+          f"{'max ms':>9}{'ops/s':>11}")
+    for velikost, operace in vysledky["velikosti"].items():
+        for nazev, h in operace.items():
+            print(f"{velikost:>9}  {nazev:<16}{h['p50_ms']:>9.3f}{h['p90_ms']:>9.3f}"
+                  f"{h['p99_ms']:>9.3f}{h['max_ms']:>9.3f}{h['ops_s']:>11.1f}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--velikosti", default="1000,100000,1000000",
+                        help="počty řádků oddělené čárkou")
+    parser.add_argument("--opakovani", type=int, default=200,
+                        help="počet měřených volání každé operace")
+    parser.add_argument("--uloziste", choices=("sqlite", "mysql"), default="sqlite",
+                        help="sqlite v paměti, nebo MySQL databáze 'ukoly_db_test'")
+    parser.add_argument("--vystup", default="benchmarks/vysledky_crud.json")
+    parser.add_argument("--porovnat", metavar="ZAKLAD.json",
+                        help="soubor s výsledky, proti kterým se hledají regrese")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--seminko", type=int, default=42)
+    argumenty = parser.parse_args()
+
+    # cache by měřila sama sebe, ne úložiště
+    nastavit_cache(ttl=0)
+    generator = random.Random(argumenty.seminko)
+
+    vysledky = {
+        "uloziste": argumenty.uloziste,
+        "opakovani": argumenty.opakovani,
+        "python": platform.python_version(),
+        "platforma": platform.platform(),
+        "cas": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "velikosti": {},
+    }
+    for velikost in (int(hodnota) for hodnota in argumenty.velikosti.split(",")):
+        if argumenty.uloziste == "sqlite":
+            uloziste = UlozisteSQLite()
+        else:
+            uloziste = UlozisteMySQL(database="ukoly_db_test")
+        if not pripravit_tabulku(uloziste):
+            print(f"{argumenty.uloziste}: nelze se připojit.\n")
+            return 2
+        print(f"Měření při {velikost} řádcích...")
+        vysledky["velikosti"][str(velikost)] = zmerit_velikost(
+            velikost, argumenty.opakovani, generator
+        )
+    print()
+    vypsat(vysledky)
+
+    with open(argumenty.vystup, "w", encoding="utf-8") as soubor:
+        json.dump(vysledky, soubor, ensure_ascii=False, indent=2)
+    print(f"Výsledky uloženy do {argumenty.vystup}\n")
+
+    if argumenty.porovnat:
+        with open(argumenty.porovnat, encoding="utf-8") as soubor:
+            zaklad = json.load(soubor)
+        regrese = porovnat(vysledky, zaklad, argumenty.tolerance)
+        if not regrese:
+            print(f"Bez regresí proti {argumenty.porovnat} (tolerance {argumenty.tolerance:.0%}).")
+            return 0
+        print(f"REGRESE proti {argumenty.porovnat} (tolerance {argumenty.tolerance:.0%}):")
+        for velikost, nazev, metrika, puvodni, nyni, pomer in regrese:
+            print(f"  {velikost:>9} {nazev:<16} {metrika:<7} {puvodni:>10.3f} -> {nyni:>10.3f}"
+                  f"  ({pomer:.2f}x)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
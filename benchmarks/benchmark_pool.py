@@ -0,0 +1,94 @@
+"""
+Benchmark sdíleného poolu spojení.
+
+Porovná počet operací za sekundu při otevírání nového spojení pro každou
+operaci (původní chování) a při zapůjčování spojení ze sdíleného poolu.
+Měří v samostatné databázi s nově vytvořenými tabulkami: výchozí je
+SQLite, s --uloziste mysql databáze 'ukoly_db_test'. Když se čtení
+nepodaří, skončí s chybou místo vypsání poměru.
+
+Spuštění z kořene projektu:
+    $ python -m benchmarks.benchmark_pool --operaci 2000
+    $ python -m benchmarks.benchmark_pool --uloziste mysql
+"""
+
+import argparse
+import sys
+import time
+
+from src.jadro import (
+    UlozisteMySQL,
+    UlozisteSQLite,
+    _nove_spojeni,
+    nacist_ukoly_z_databaze,
+    nastavit_cache,
+    nastavit_pool,
+    posledni_chyba,
+)
+from benchmarks.benchmark_crud import naplnit_tabulku
+from benchmarks.benchmark_uloziste import pripravit_tabulku
+
+
+def bez_poolu(pocet):
+    """Každá operace si otevře a zavře vlastní spojení."""
+    for _ in range(pocet):
+        pripojeni = _nove_spojeni()
+        nacist_ukoly_z_databaze(pripojeni=pripojeni)
+        pripojeni.close()
+
+
+def s_poolem(pocet):
+    """Každá operace si zapůjčí spojení ze sdíleného poolu."""
+    for _ in range(pocet):
+        nacist_ukoly_z_databaze()
+
+
+def zmerit(nazev, funkce, pocet):
+    """
+    Spustí funkci a vypíše dosažený počet operací za sekundu.
+    Vrátí None, pokud některé čtení skončilo chybou.
+    """
+    posledni_chyba()
+    zacatek = time.perf_counter()
+    funkce(pocet)
+    trvani = time.perf_counter() - zacatek
+    chyba = posledni_chyba()
+    if chyba is not None:
+        print(f"{nazev}: čtení selhalo ({chyba}).")
+        return None
+    print(f"{nazev:<12} {pocet / trvani:10.1f} ops/s  ({trvani:.2f} s)")
+    return pocet / trvani
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--operaci", type=int, default=1000)
+    parser.add_argument("--velikost-poolu", type=int, default=5)
+    parser.add_argument("--ukolu", type=int, default=100, help="počet úkolů v tabulce")
+    parser.add_argument("--uloziste", choices=("sqlite", "mysql"), default="sqlite",
+                        help="nová databáze SQLite, nebo MySQL databáze 'ukoly_db_test'")
+    argumenty = parser.parse_args()
+
+    # bez cache čtení, jinak by čtení s poolem vracela cache a ne databáze
+    nastavit_cache(ttl=0)
+    uloziste = (
+        UlozisteMySQL(database="ukoly_db_test")
+        if argumenty.uloziste == "mysql"
+        else UlozisteSQLite()
+    )
+    if not pripravit_tabulku(uloziste):
+        print(f"{argumenty.uloziste}: nelze se připojit, benchmark nelze spustit.")
+        return 2
+    naplnit_tabulku(argumenty.ukolu)
+
+    nastavit_pool(velikost=argumenty.velikost_poolu)
+    pred = zmerit("bez poolu", bez_poolu, argumenty.operaci)
+    po = zmerit("s poolem", s_poolem, argumenty.operaci)
+    if pred is None or po is None:
+        return 1
+    print(f"\nZrychlení: {po / pred:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
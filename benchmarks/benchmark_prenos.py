@@ -0,0 +1,80 @@
+"""
+Benchmark exportu a importu úkolů (CSV a JSON Lines).
+
+Pro každou velikost tabulky vyexportuje všechny úkoly do souboru a ten
+naimportuje do prázdné tabulky. Vypíše propustnost a špičku paměti
+alokované Pythonem (tracemalloc); u streamovaného přenosu má špička
+zůstat přibližně stejná bez ohledu na počet řádků. Měření paměti
+přenos zpomaluje, propustnost proto slouží jen k porovnání mezi běhy.
+
+Spuštění z kořene projektu:
+    $ python -m benchmarks.benchmark_prenos --velikosti 10000,100000
+    $ python -m benchmarks.benchmark_prenos --uloziste mysql
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.jadro import (
+    UlozisteMySQL,
+    UlozisteSQLite,
+    exportovat_ukoly,
+    importovat_ukoly,
+    nastavit_cache,
+)
+from benchmarks.benchmark_crud import naplnit_tabulku
+from benchmarks.benchmark_uloziste import pripravit_tabulku
+
+
+def vytvorit_uloziste(druh):
+    if druh == "mysql":
+        return UlozisteMySQL(database="ukoly_db_test")
+    return UlozisteSQLite()
+
+
+def merit(funkce, *argumenty, **parametry):
+    """Zavolá funkci a vrátí (výsledek, doba v sekundách, špička paměti v MiB)."""
+    tracemalloc.start()
+    zacatek = time.perf_counter()
+    try:
+        vysledek = funkce(*argumenty, **parametry)
+        return vysledek, time.perf_counter() - zacatek, tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--velikosti", default="10000,100000",
+                        help="počty řádků oddělené čárkou")
+    parser.add_argument("--uloziste", choices=("sqlite", "mysql"), default="sqlite",
+                        help="sqlite v paměti, nebo MySQL databáze 'ukoly_db_test'")
+    argumenty = parser.parse_args()
+
+    nastavit_cache(ttl=0)
+    print(f"{'řádků':>9}  {'formát':<7}{'operace':<9}{'řádků/s':>11}{'špička MiB':>12}")
+    with tempfile.TemporaryDirectory() as adresar:
+        for velikost in (int(hodnota) for hodnota in argumenty.velikosti.split(",")):
+            for format in ("csv", "jsonl"):
+                soubor = os.path.join(adresar, f"ukoly_{velikost}.{format}")
+                if not pripravit_tabulku(vytvorit_uloziste(argumenty.uloziste)):
+                    print(f"{argumenty.uloziste}: nelze se připojit.\n")
+                    return 2
+                naplnit_tabulku(velikost)
+                zapsano, doba, spicka = merit(exportovat_ukoly, soubor)
+                print(f"{velikost:>9}  {format:<7}{'export':<9}{zapsano / doba:>11.0f}{spicka:>12.2f}")
+
+                pripravit_tabulku(vytvorit_uloziste(argumenty.uloziste))
+                vysledek, doba, spicka = merit(importovat_ukoly, soubor)
+                print(f"{velikost:>9}  {format:<7}{'import':<9}"
+                      f"{vysledek['vlozeno'] / doba:>11.0f}{spicka:>12.2f}")
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
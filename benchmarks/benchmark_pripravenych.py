@@ -0,0 +1,102 @@
+"""
+Úspora připravených dotazů: obyčejný kurzor proti dotazu připravenému na spojení.
+
+Na jednom spojení z poolu provede každý z PRIPRAVENE_DOTAZY funkcí CRUD
+N-krát nejdřív přes nový obyčejný kurzor (MySQL dotaz pokaždé znovu
+rozebere a výsledek pošle textovým protokolem) a pak přes kurzor z
+pripraveny(), který dotaz připraví jednou a dále posílá jen parametry.
+Zápisy se potvrzují po každém dotazu jako ve funkcích CRUD.
+
+SQLite si přeložené dotazy ukládá v každém spojení sama, rozdíl je tam
+proto jen v režii kurzoru; úsporu rozboru dotazu ukáže --uloziste mysql.
+
+Spuštění z kořene projektu:
+    $ python -m benchmarks.benchmark_pripravenych --opakovani 2000
+    $ python -m benchmarks.benchmark_pripravenych --uloziste mysql --ukolu 100
+"""
+
+import argparse
+import itertools
+import sys
+import time
+
+from src.jadro import (
+    DOTAZ_AKTIVNI,
+    DOTAZ_ODSTRANENI,
+    DOTAZ_VLOZENI,
+    DOTAZ_VSECHNY,
+    DOTAZ_ZMENA_STAVU,
+    UlozisteMySQL,
+    UlozisteSQLite,
+    nastavit_cache,
+    ziskat_pripojeni,
+)
+from benchmarks.benchmark_crud import naplnit_tabulku
+from benchmarks.benchmark_uloziste import pripravit_tabulku
+
+
+def merit(pripojeni, dotaz, parametry, pripraveny):
+    """Provede dotaz pro každou n-tici parametrů; vrátí průměrnou dobu v mikrosekundách."""
+    cteni = dotaz.startswith("SELECT")
+    zacatek = time.perf_counter()
+    for hodnoty in parametry:
+        kurzor = pripojeni.pripraveny(dotaz) if pripraveny else pripojeni.cursor()
+        kurzor.execute(dotaz, hodnoty)
+        if cteni:
+            kurzor.fetchall()
+        else:
+            pripojeni.commit()
+        kurzor.close()
+    return (time.perf_counter() - zacatek) / len(parametry) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--opakovani", type=int, default=2000)
+    parser.add_argument("--ukolu", type=int, default=100,
+                        help="velikost tabulky; malá tabulka zvýrazní rozbor dotazu proti přenosu dat")
+    parser.add_argument("--uloziste", choices=("sqlite", "mysql"), default="sqlite",
+                        help="sqlite v paměti, nebo MySQL databáze 'ukoly_db_test'")
+    argumenty = parser.parse_args()
+    opakovani = argumenty.opakovani
+
+    nastavit_cache(ttl=0)
+    uloziste = (
+        UlozisteMySQL(database="ukoly_db_test")
+        if argumenty.uloziste == "mysql"
+        else UlozisteSQLite()
+    )
+    if not pripravit_tabulku(uloziste):
+        print(f"{argumenty.uloziste}: nelze se připojit.\n")
+        return 2
+    id_ukolu = naplnit_tabulku(argumenty.ukolu)
+    stavy = itertools.cycle(("hotovo", "probíhá"))
+    nove_id = itertools.count(max(id_ukolu) + 1)
+
+    print(f"{opakovani} opakování, {argumenty.ukolu} úkolů, úložiště {argumenty.uloziste}\n")
+    print(f"{'dotaz':<16}{'obyčejný µs':>14}{'připravený µs':>16}{'zrychlení':>11}")
+    pripojeni = ziskat_pripojeni()
+    try:
+        for nazev, dotaz, parametry in (
+            ("čtení aktivních", DOTAZ_AKTIVNI, lambda: [()] * opakovani),
+            ("čtení všech", DOTAZ_VSECHNY, lambda: [()] * opakovani),
+            ("vložení", DOTAZ_VLOZENI, lambda: [(f"Nový {i}", "Popis", "nezahájeno", 0, 0)
+                                                for i in range(opakovani)]),
+            ("změna stavu", DOTAZ_ZMENA_STAVU, lambda: [
+                (stav, 0, id_ukolu[i % len(id_ukolu)], stav)
+                for i, stav in zip(range(opakovani), stavy)
+            ]),
+            # odstraňují se úkoly vložené v řádku vložení, v obou měřeních jiné
+            ("odstranění", DOTAZ_ODSTRANENI, lambda: [(next(nove_id),) for _ in range(opakovani)]),
+        ):
+            obycejny = merit(pripojeni, dotaz, parametry(), pripraveny=False)
+            pripraveny = merit(pripojeni, dotaz, parametry(), pripraveny=True)
+            print(f"{nazev:<16}{obycejny:>14.1f}{pripraveny:>16.1f}{obycejny / pripraveny:>10.2f}x")
+    finally:
+        pripojeni.close()
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
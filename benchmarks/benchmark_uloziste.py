@@ -0,0 +1,135 @@
+"""
+Porovnání úložišť na stejné zátěži.
+
+Na každém úložišti připraví prázdnou tabulku, provede sérii CRUD operací
+a vypíše počet operací za sekundu. MySQL se měří jen tehdy, když je
+dostupná databáze 'ukoly_db_test'.
+
+Spuštění z kořene projektu:
+    $ python -m benchmarks.benchmark_uloziste --ukolu 2000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from src.jadro import (
+    UlozisteMySQL,
+    UlozisteSQLite,
+    nacist_stranku_vsech_ukolu,
+    nacist_ukoly_z_databaze,
+    nastavit_cache,
+    nastavit_uloziste,
+    odstranit_ukol_z_databaze,
+    provest_migrace,
+    uloz_ukol_do_databaze,
+    uloz_ukoly_hromadne,
+    zmenit_stav_ukolu_v_databazi,
+)
+
+
+def pripravit_tabulku(uloziste):
+    """
+    Přepne funkce na dané úložiště a znovu v něm vytvoří prázdné tabulky.
+    Vrátí False, pokud se nelze připojit.
+    """
+    nastavit_uloziste(uloziste)
+    pripojeni = uloziste.pripojit()
+    if pripojeni is None:
+        return False
+    kurzor = pripojeni.cursor()
+    kurzor.execute("DROP TABLE IF EXISTS ukoly_fts")
+    kurzor.execute("DROP TABLE IF EXISTS ukoly")
+    kurzor.execute("DROP TABLE IF EXISTS schema_verze")
+    kurzor.execute("DROP TABLE IF EXISTS citac_zmen")
+    kurzor.execute("DROP TABLE IF EXISTS verze_zapisu")
+    kurzor.execute("DROP TABLE IF EXISTS ukoly_smazane")
+    kurzor.execute("DROP TABLE IF EXISTS importy")
+    kurzor.execute("DROP TABLE IF EXISTS ukoly_archiv")
+    pripojeni.commit()
+    kurzor.close()
+    provest_migrace(pripojeni)
+    pripojeni.close()
+    return True
+
+
+def zatez(pocet):
+    """Vrátí seznam dvojic (název operace, funkce bez parametrů, počet opakování)."""
+    id_ukolu = []
+
+    def vlozit():
+        for i in range(pocet):
+            uloz_ukol_do_databaze(f"Úkol {i}", "Popis")
+
+    def vlozit_hromadne():
+        id_ukolu.extend(uloz_ukoly_hromadne([(f"Dávka {i}", "Popis") for i in range(pocet)])[0])
+
+    def cist_aktivni():
+        for _ in range(pocet // 10):
+            nacist_ukoly_z_databaze()
+
+    def cist_stranky():
+        for _ in range(pocet):
+            nacist_stranku_vsech_ukolu()
+
+    def zmenit_stav():
+        for id_ in id_ukolu:
+            zmenit_stav_ukolu_v_databazi(id_, "hotovo")
+
+    def odstranit():
+        for id_ in id_ukolu:
+            odstranit_ukol_z_databaze(id_)
+
+    return [
+        ("vložení", vlozit, pocet),
+        ("hromadné vložení", vlozit_hromadne, pocet),
+        ("čtení aktivních", cist_aktivni, pocet // 10),
+        ("čtení stránky", cist_stranky, pocet),
+        ("změna stavu", zmenit_stav, pocet),
+        ("odstranění", odstranit, pocet),
+    ]
+
+
+def zmerit(pocet):
+    """Změří zátěž na nastaveném úložišti; vrátí slovník operace -> ops/s."""
+    vysledky = {}
+    for nazev, funkce, opakovani in zatez(pocet):
+        zacatek = time.perf_counter()
+        funkce()
+        vysledky[nazev] = opakovani / (time.perf_counter() - zacatek)
+    return vysledky
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ukolu", type=int, default=1000)
+    argumenty = parser.parse_args()
+
+    # cache by měřila sama sebe, ne úložiště
+    nastavit_cache(ttl=0)
+
+    with tempfile.TemporaryDirectory() as adresar:
+        kandidati = [
+            ("sqlite (paměť)", UlozisteSQLite()),
+            ("sqlite (soubor)", UlozisteSQLite(os.path.join(adresar, "ukoly.db"))),
+            ("mysql", UlozisteMySQL(database="ukoly_db_test")),
+        ]
+        vysledky = {}
+        for nazev, uloziste in kandidati:
+            if not pripravit_tabulku(uloziste):
+                print(f"{nazev}: nelze se připojit, přeskočeno.\n")
+                continue
+            vysledky[nazev] = zmerit(argumenty.ukolu)
+
+    operace = [nazev for nazev, _, _ in zatez(0)]
+    print(f"{'operace (ops/s)':<20}" + "".join(f"{nazev:>18}" for nazev in vysledky))
+    for nazev_operace in operace:
+        radek = "".join(
+            f"{hodnoty[nazev_operace]:>18.1f}" for hodnoty in vysledky.values()
+        )
+        print(f"{nazev_operace:<20}{radek}")
+
+
+if __name__ == "__main__":
+    main()
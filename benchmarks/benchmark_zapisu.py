@@ -0,0 +1,91 @@
+"""
+Propustnost vkládání úkolů: synchronní zápis proti zápisu na pozadí.
+
+Vloží N úkolů nejdřív funkcí uloz_ukol_do_databaze(), kdy každé volání
+potvrzuje vlastní transakci, a pak se zapnutým zápisem na pozadí
+(nastavit_zapis_na_pozadi) funkcí uloz_ukol_na_pozadi(), která na potvrzení
+nečeká, takže se úkoly potvrzují po skupinách. Doba druhého měření zahrnuje
+i závěrečné vyprazdnit_zapisy(), tedy potvrzení všech úkolů.
+
+Spuštění z kořene projektu:
+    $ python -m benchmarks.benchmark_zapisu --ukolu 5000
+    $ python -m benchmarks.benchmark_zapisu --uloziste mysql --vlaken 4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from src.jadro import (
+    UlozisteMySQL,
+    UlozisteSQLite,
+    nastavit_cache,
+    nastavit_pool,
+    nastavit_zapis_na_pozadi,
+    uloz_ukol_do_databaze,
+    uloz_ukol_na_pozadi,
+    vyprazdnit_zapisy,
+)
+from benchmarks.benchmark_uloziste import pripravit_tabulku
+
+
+def vkladat(ulozit, pocet, vlaken):
+    """Vloží 'pocet' úkolů funkcí 'ulozit' z 'vlaken' vláken; vrátí dobu v sekundách."""
+
+    def pracovnik(od):
+        for i in range(od, pocet, vlaken):
+            ulozit(f"Úkol {i}", "Popis")
+
+    zacatek = time.perf_counter()
+    vlakna = [threading.Thread(target=pracovnik, args=(i,)) for i in range(vlaken)]
+    for vlakno in vlakna:
+        vlakno.start()
+    for vlakno in vlakna:
+        vlakno.join()
+    vyprazdnit_zapisy()
+    return time.perf_counter() - zacatek
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ukolu", type=int, default=5000)
+    parser.add_argument("--vlaken", type=int, default=1)
+    parser.add_argument("--velikost-skupiny", type=int, default=500)
+    parser.add_argument("--interval", type=float, default=0.05)
+    parser.add_argument("--uloziste", choices=("sqlite", "mysql"), default="sqlite",
+                        help="dočasný soubor SQLite, nebo MySQL databáze 'ukoly_db_test'")
+    argumenty = parser.parse_args()
+
+    nastavit_cache(ttl=0)
+    with tempfile.TemporaryDirectory() as adresar:
+        # v paměti by potvrzení nic nestálo, SQLite proto běží nad souborem
+        if argumenty.uloziste == "mysql":
+            uloziste = UlozisteMySQL(database="ukoly_db_test")
+        else:
+            uloziste = UlozisteSQLite(os.path.join(adresar, "zapis.db"))
+        if not pripravit_tabulku(uloziste):
+            print(f"{argumenty.uloziste}: nelze se připojit.\n")
+            return 2
+        nastavit_pool(velikost=argumenty.vlaken + 1)
+
+        print(f"{argumenty.ukolu} úkolů, {argumenty.vlaken} vláken, úložiště {argumenty.uloziste}\n")
+        synchronne = vkladat(uloz_ukol_do_databaze, argumenty.ukolu, argumenty.vlaken)
+        print(f"{'synchronně':<14}{argumenty.ukolu / synchronne:>10.0f} úkolů/s")
+
+        nastavit_zapis_na_pozadi(
+            velikost_skupiny=argumenty.velikost_skupiny, interval=argumenty.interval
+        )
+        na_pozadi = vkladat(uloz_ukol_na_pozadi, argumenty.ukolu, argumenty.vlaken)
+        nastavit_zapis_na_pozadi(False)
+        print(f"{'na pozadí':<14}{argumenty.ukolu / na_pozadi:>10.0f} úkolů/s"
+              f"  ({synchronne / na_pozadi:.1f}x)\n")
+        # dočasný soubor jde smazat až po zavření všech spojení
+        nastavit_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
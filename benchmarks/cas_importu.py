@@ -0,0 +1,79 @@
+"""
+Měření doby importu modulů správce úkolů.
+
+Každý modul se importuje v novém procesu Pythonu, aby se neměřila už
+načtená cache modulů. Vypíše nejkratší a střední dobu importu a moduly
+ovladačů, které import načetl. Jádro musí zůstat pod ROZPOCET_IMPORTU_MS
+a nesmí načíst moduly z TEZKE_MODULY; to druhé hlídá i test
+test_import_jadra_je_lehky (doba importu závisí na stroji, test ji neměří).
+
+Spuštění z kořene projektu:
+    $ python -m benchmarks.cas_importu --opakovani 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# horní mez doby importu jádra (nejkratší z několika měření) v milisekundách
+ROZPOCET_IMPORTU_MS = 100
+
+# moduly, které jádro nesmí načíst při importu (načítá je až funkce, která je potřebuje)
+TEZKE_MODULY = ("tkinter", "mysql.connector", "concurrent.futures", "tempfile")
+
+KOREN_PROJEKTU = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_SKRIPT = """
+import json, sys, time
+zacatek = time.perf_counter()
+import {modul}
+trvani = time.perf_counter() - zacatek
+print(json.dumps({{"ms": trvani * 1000, "tezke": [m for m in {tezke!r} if m in sys.modules]}}))
+"""
+
+
+def zmerit_import(modul, opakovani=5):
+    """
+    Změří import modulu v 'opakovani' nových procesech.
+
+    Návratová hodnota:
+        dict: 'min_ms', 'median_ms' a 'tezke' (těžké moduly načtené importem).
+    """
+    casy = []
+    tezke = set()
+    for _ in range(opakovani):
+        vystup = subprocess.run(
+            [sys.executable, "-c", _SKRIPT.format(modul=modul, tezke=TEZKE_MODULY)],
+            cwd=KOREN_PROJEKTU,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        vysledek = json.loads(vystup.stdout.strip().splitlines()[-1])
+        casy.append(vysledek["ms"])
+        tezke.update(vysledek["tezke"])
+    return {
+        "min_ms": min(casy),
+        "median_ms": statistics.median(casy),
+        "tezke": sorted(tezke),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--opakovani", type=int, default=10)
+    argumenty = parser.parse_args()
+
+    print(f"{'modul':<20}{'min ms':>9}{'medián ms':>11}  načtené těžké moduly")
+    for modul in ("src.jadro", "src.paty_projekt"):
+        vysledek = zmerit_import(modul, argumenty.opakovani)
+        print(f"{modul:<20}{vysledek['min_ms']:>9.1f}{vysledek['median_ms']:>11.1f}  "
+              f"{', '.join(vysledek['tezke']) or '-'}")
+    print(f"\nRozpočet jádra: {ROZPOCET_IMPORTU_MS} ms")
+
+
+if __name__ == "__main__":
+    main()
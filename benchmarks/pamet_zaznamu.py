@@ -0,0 +1,101 @@
+"""
+Paměť řádků úkolů: slovníky proti záznamům Ukol.
+
+Vytvoří N řádků (výchozí 1 000 000) jako n-tice ze sdílených hodnot a změří
+(tracemalloc), kolik bajtů na řádek navíc stojí jejich převod na slovníky,
+jak to dělal kurzor s dictionary=True, a na záznamy Ukol. Hodnoty jsou
+v obou případech stejné objekty, rozdíl je tedy jen režie kontejneru.
+
+S parametrem --z-databaze naplní SQLite v paměti a změří i paměť, kterou
+drží výsledek celého čtení: dříve cursor(dictionary=True).fetchall(),
+nyní nacist_vsechny_ukoly_z_databaze().
+
+Spuštění z kořene projektu:
+    $ python -m benchmarks.pamet_zaznamu --radku 1000000
+    $ python -m benchmarks.pamet_zaznamu --radku 1000000 --z-databaze
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+
+from src.jadro import (
+    Ukol,
+    UlozisteSQLite,
+    nacist_vsechny_ukoly_z_databaze,
+    nastavit_cache,
+    ziskat_pripojeni,
+)
+from benchmarks.benchmark_crud import naplnit_tabulku
+from benchmarks.benchmark_uloziste import pripravit_tabulku
+
+
+def drzena_pamet(funkce):
+    """Zavolá funkci a vrátí (výsledek, bajty alokované během volání a držené výsledkem)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        vysledek = funkce()
+        return vysledek, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def cist_slovniky():
+    """Původní čtení všech úkolů: každý řádek jako slovník."""
+    pripojeni = ziskat_pripojeni()
+    try:
+        kurzor = pripojeni.cursor(dictionary=True)
+        kurzor.execute("SELECT id, nazev, popis, stav FROM ukoly")
+        ukoly = kurzor.fetchall()
+        kurzor.close()
+        return ukoly
+    finally:
+        pripojeni.close()
+
+
+def vypsat(nazev, pocet, bajtu):
+    print(f"{nazev:<40}{bajtu / 2**20:>10.1f} MiB{bajtu / pocet:>10.1f} B/řádek")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--radku", type=int, default=1000000)
+    parser.add_argument("--z-databaze", action="store_true",
+                        help="změřit i čtení celé tabulky ze SQLite v paměti")
+    argumenty = parser.parse_args()
+    pocet = argumenty.radku
+
+    print(f"Velikost jednoho řádku (sys.getsizeof): slovník "
+          f"{sys.getsizeof(dict(zip(Ukol.SLOUPCE, range(4))))} B, "
+          f"Ukol {sys.getsizeof(Ukol(range(4)))} B\n")
+
+    radky = [(i, f"Úkol {i}", "Popis", "nezahájeno") for i in range(pocet)]
+    print(f"Režie kontejneru při {pocet} řádcích:")
+    slovniky, bajtu = drzena_pamet(lambda: [dict(zip(Ukol.SLOUPCE, radek)) for radek in radky])
+    vypsat("  slovníky (dictionary=True)", pocet, bajtu)
+    del slovniky
+    zaznamy, bajtu = drzena_pamet(lambda: list(map(Ukol, radky)))
+    vypsat("  záznamy Ukol", pocet, bajtu)
+    del zaznamy, radky
+    print()
+
+    if argumenty.z_databaze:
+        # cache by výsledek držela dál a zkreslila měření
+        nastavit_cache(ttl=0)
+        pripravit_tabulku(UlozisteSQLite())
+        print(f"Plnění tabulky {pocet} úkoly...")
+        naplnit_tabulku(pocet)
+        print(f"Paměť držená výsledkem čtení celé tabulky ({pocet} řádků):")
+        ukoly, bajtu = drzena_pamet(cist_slovniky)
+        vypsat("  cursor(dictionary=True).fetchall()", len(ukoly), bajtu)
+        del ukoly
+        ukoly, bajtu = drzena_pamet(nacist_vsechny_ukoly_z_databaze)
+        vypsat("  nacist_vsechny_ukoly_z_databaze()", len(ukoly), bajtu)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
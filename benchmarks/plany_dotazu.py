@@ -0,0 +1,50 @@
+"""
+Provede migrace schématu a vypíše plány (EXPLAIN) čtecích dotazů před a po nich.
+
+Pracuje s testovacím úložištěm, nikdy s databází aplikace: výchozí je nová
+databáze SQLite v paměti, s --uloziste mysql databáze 'ukoly_db_test'
+(jinou určí --databaze). Chybí-li tabulka ukoly, vytvoří ji v podobě před
+migracemi, aby plány před migrací měly s čím pracovat.
+
+Spuštění z kořene projektu:
+    $ python -m benchmarks.plany_dotazu
+    $ python -m benchmarks.plany_dotazu --uloziste mysql --databaze ukoly_db_test
+"""
+
+import argparse
+import sys
+
+from src.jadro import UlozisteMySQL, UlozisteSQLite, nastavit_uloziste, provest_migrace
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--uloziste", choices=("sqlite", "mysql"), default="sqlite",
+                        help="nová databáze SQLite v paměti, nebo databáze MySQL z --databaze")
+    parser.add_argument("--databaze", default="ukoly_db_test",
+                        help="databáze MySQL (výchozí 'ukoly_db_test')")
+    argumenty = parser.parse_args()
+
+    uloziste = nastavit_uloziste(
+        UlozisteMySQL(database=argumenty.databaze)
+        if argumenty.uloziste == "mysql"
+        else UlozisteSQLite()
+    )
+    pripojeni = uloziste.pripojit()
+    if pripojeni is None:
+        print(f"{argumenty.uloziste}: nelze se připojit.\n")
+        return 2
+    try:
+        kurzor = pripojeni.cursor()
+        uloziste.vytvorit_tabulku_ukoly(kurzor)
+        kurzor.close()
+        pripojeni.commit()
+        provedene = provest_migrace(pripojeni, vypsat_plany=True)
+        print(f"Provedené migrace: {provedene or 'žádné'}")
+    finally:
+        pripojeni.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
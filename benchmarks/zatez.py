@@ -0,0 +1,254 @@
+"""
+Generátor souběžné smíšené zátěže.
+
+Spustí N pracovníků (vlákna, nebo s --procesy samostatné procesy), kteří
+po pevně danou dobu náhodně volají CRUD funkce v zadaném poměru čtení,
+vložení, změn stavu a odstranění. Nakonec vypíše propustnost, latenci
+(p50, p99), počty chyb podle druhu a počet vypršených čekání na zámek.
+
+Spuštění z kořene projektu:
+    $ python -m benchmarks.zatez --pracovniku 8 --doba 30 --mix cteni=70,vlozeni=10,zmena=15,odstraneni=5
+    $ python -m benchmarks.zatez --uloziste mysql --procesy
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from src.jadro import (
+    STAVY,
+    UlozisteMySQL,
+    UlozisteSQLite,
+    je_cekani_na_zamek,
+    nacist_stranku_aktivnich_ukolu,
+    nastavit_cache,
+    nastavit_pool,
+    nastavit_uloziste,
+    odstranit_ukol_z_databaze,
+    posledni_chyba,
+    rozsah_id_ukolu,
+    uloz_ukol_do_databaze,
+    uloz_ukoly_hromadne,
+    zmenit_stav_ukolu_v_databazi,
+)
+from benchmarks.benchmark_crud import percentil
+from benchmarks.benchmark_uloziste import pripravit_tabulku
+
+OPERACE = ("cteni", "vlozeni", "zmena", "odstraneni")
+
+
+def nacist_mix(text):
+    """Převede 'cteni=70,vlozeni=10,...' na slovník operace -> váha."""
+    mix = {}
+    for cast in text.split(","):
+        nazev, _, vaha = cast.partition("=")
+        nazev = nazev.strip()
+        if nazev not in OPERACE:
+            raise argparse.ArgumentTypeError(f"Neznámá operace '{nazev}', povolené: {OPERACE}")
+        mix[nazev] = float(vaha)
+    if sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError("Součet vah mixu musí být kladný.")
+    return mix
+
+
+def vytvorit_uloziste(druh, soubor):
+    if druh == "mysql":
+        return UlozisteMySQL(database="ukoly_db_test")
+    return UlozisteSQLite(soubor)
+
+
+def _klasifikovat(chyba):
+    kod = getattr(chyba, "errno", None)
+    trida = getattr(chyba, "trida", None) or type(chyba).__name__
+    return f"{trida} {kod}" if kod else trida
+
+
+def pracovnik(doba, mix, rozsah, seminko):
+    """
+    Volá operace podle mixu po dobu 'doba' sekund.
+
+    Návratová hodnota:
+        dict: 'latence' (operace -> seznam sekund úspěšných volání),
+        'chyby' (Counter druhů chyb) a 'zamky' (vypršená čekání na zámek).
+    """
+    generator = random.Random(seminko)
+    nazvy = list(mix)
+    vahy = [mix[nazev] for nazev in nazvy]
+    nejmensi, nejvetsi = rozsah
+    latence = {nazev: [] for nazev in nazvy}
+    chyby = Counter()
+    zamky = 0
+    posledni_chyba()
+
+    konec = time.monotonic() + doba
+    while time.monotonic() < konec:
+        nazev = generator.choices(nazvy, vahy)[0]
+        id_ukolu = generator.randint(nejmensi, nejvetsi)
+        zacatek = time.perf_counter()
+        if nazev == "cteni":
+            nacist_stranku_aktivnich_ukolu(po_id=id_ukolu)
+        elif nazev == "vlozeni":
+            uloz_ukol_do_databaze(f"Zátěž {id_ukolu}", "Popis")
+        elif nazev == "zmena":
+            zmenit_stav_ukolu_v_databazi(id_ukolu, generator.choice(STAVY))
+        else:
+            odstranit_ukol_z_databaze(id_ukolu)
+        trvani = time.perf_counter() - zacatek
+
+        chyba = posledni_chyba()
+        if chyba is None:
+            latence[nazev].append(trvani)
+        else:
+            chyby[f"{nazev}: {_klasifikovat(chyba)}"] += 1
+            if je_cekani_na_zamek(chyba):
+                zamky += 1
+    return {"latence": latence, "chyby": chyby, "zamky": zamky}
+
+
+def _pracovnik_v_procesu(parametry):
+    druh, soubor, velikost_poolu, doba, mix, rozsah, seminko = parametry
+    nastavit_cache(ttl=0)
+    nastavit_uloziste(vytvorit_uloziste(druh, soubor))
+    nastavit_pool(velikost=velikost_poolu)
+    return pracovnik(doba, mix, rozsah, seminko)
+
+
+def spustit(argumenty, mix, rozsah):
+    """
+    Spustí pracovníky a vrátí seznam jejich výsledků. Každý pracovník měří
+    dobu běhu až od svého spuštění, start procesů se tedy do ní nezapočítá.
+    """
+    if argumenty.procesy:
+        kontext = multiprocessing.get_context("spawn")
+        ulohy = [
+            (argumenty.uloziste, argumenty.soubor, 1, argumenty.doba, mix, rozsah,
+             argumenty.seminko + i)
+            for i in range(argumenty.pracovniku)
+        ]
+        with kontext.Pool(argumenty.pracovniku) as procesy:
+            vysledky = procesy.map(_pracovnik_v_procesu, ulohy)
+    else:
+        vysledky = [None] * argumenty.pracovniku
+
+        def bezet(poradi):
+            vysledky[poradi] = pracovnik(argumenty.doba, mix, rozsah, argumenty.seminko + poradi)
+
+        vlakna = [
+            threading.Thread(target=bezet, args=(i,)) for i in range(argumenty.pracovniku)
+        ]
+        for vlakno in vlakna:
+            vlakno.start()
+        for vlakno in vlakna:
+            vlakno.join()
+    return vysledky
+
+
+def souhrn(vysledky, doba):
+    """Sloučí výsledky pracovníků do slovníku vhodného pro výpis i JSON."""
+    latence = {}
+    chyby = Counter()
+    zamky = 0
+    for vysledek in vysledky:
+        for nazev, hodnoty in vysledek["latence"].items():
+            latence.setdefault(nazev, []).extend(hodnoty)
+        chyby.update(vysledek["chyby"])
+        zamky += vysledek["zamky"]
+
+    operace = {}
+    for nazev, hodnoty in latence.items():
+        hodnoty.sort()
+        chyb = sum(pocet for druh, pocet in chyby.items() if druh.startswith(f"{nazev}:"))
+        operace[nazev] = {
+            "uspesnych": len(hodnoty),
+            "chyb": chyb,
+            "ops_s": len(hodnoty) / doba,
+            "p50_ms": percentil(hodnoty, 0.50) * 1000 if hodnoty else None,
+            "p99_ms": percentil(hodnoty, 0.99) * 1000 if hodnoty else None,
+        }
+    vse = sorted(h for hodnoty in latence.values() for h in hodnoty)
+    return {
+        "doba_s": doba,
+        "ops_s": len(vse) / doba,
+        "p50_ms": percentil(vse, 0.50) * 1000 if vse else None,
+        "p99_ms": percentil(vse, 0.99) * 1000 if vse else None,
+        "chyb": sum(chyby.values()),
+        "cekani_na_zamek": zamky,
+        "operace": operace,
+        "druhy_chyb": dict(chyby),
+    }
+
+
+def _ms(hodnota):
+    return f"{hodnota:>10.3f}" if hodnota is not None else f"{'-':>10}"
+
+
+def vypsat(vysledek):
+    print(f"{'operace':<12}{'úspěšných':>11}{'chyb':>7}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for nazev, h in vysledek["operace"].items():
+        print(f"{nazev:<12}{h['uspesnych']:>11}{h['chyb']:>7}{h['ops_s']:>10.1f}"
+              f"{_ms(h['p50_ms'])}{_ms(h['p99_ms'])}")
+    print(f"{'celkem':<12}{'':>11}{vysledek['chyb']:>7}{vysledek['ops_s']:>10.1f}"
+          f"{_ms(vysledek['p50_ms'])}{_ms(vysledek['p99_ms'])}\n")
+    print(f"Vypršená čekání na zámek: {vysledek['cekani_na_zamek']}")
+    for druh, pocet in sorted(vysledek["druhy_chyb"].items()):
+        print(f"  {druh}: {pocet}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pracovniku", type=int, default=4)
+    parser.add_argument("--doba", type=float, default=10.0, help="délka běhu v sekundách")
+    parser.add_argument("--mix", type=nacist_mix,
+                        default=nacist_mix("cteni=70,vlozeni=10,zmena=15,odstraneni=5"))
+    parser.add_argument("--procesy", action="store_true",
+                        help="pracovníci jako procesy místo vláken")
+    parser.add_argument("--uloziste", choices=("sqlite", "mysql"), default="sqlite",
+                        help="soubor SQLite, nebo MySQL databáze 'ukoly_db_test'")
+    parser.add_argument("--soubor", help="soubor SQLite (výchozí dočasný soubor)")
+    parser.add_argument("--predplnit", type=int, default=10000,
+                        help="kolik úkolů vložit před spuštěním zátěže")
+    parser.add_argument("--seminko", type=int, default=42)
+    parser.add_argument("--json", help="kam uložit výsledky jako JSON")
+    argumenty = parser.parse_args()
+
+    # cache by měřila sama sebe, ne úložiště
+    nastavit_cache(ttl=0)
+    with tempfile.TemporaryDirectory() as adresar:
+        # SQLite v paměti nejde sdílet mezi procesy, zátěž proto běží nad souborem
+        if argumenty.uloziste == "sqlite" and not argumenty.soubor:
+            argumenty.soubor = os.path.join(adresar, "zatez.db")
+        if not pripravit_tabulku(vytvorit_uloziste(argumenty.uloziste, argumenty.soubor)):
+            print(f"{argumenty.uloziste}: nelze se připojit.\n")
+            return 2
+        nastavit_pool(velikost=argumenty.pracovniku)
+        for zacatek in range(0, argumenty.predplnit, 10000):
+            konec = min(argumenty.predplnit, zacatek + 10000)
+            uloz_ukoly_hromadne([(f"Úkol {i}", "Popis") for i in range(zacatek, konec)])
+        nejmensi, nejvetsi = rozsah_id_ukolu()
+        rozsah = (nejmensi or 1, nejvetsi or 1)
+
+        druh = "procesů" if argumenty.procesy else "vláken"
+        print(f"Zátěž: {argumenty.pracovniku} {druh}, {argumenty.doba:g} s, "
+              f"mix {argumenty.mix}, úložiště {argumenty.uloziste}\n")
+        vysledky = spustit(argumenty, argumenty.mix, rozsah)
+        # dočasný soubor jde smazat až po zavření všech spojení
+        nastavit_pool()
+
+    vysledek = souhrn(vysledky, argumenty.doba)
+    vypsat(vysledek)
+    if argumenty.json:
+        with open(argumenty.json, "w", encoding="utf-8") as soubor:
+            json.dump(vysledek, soubor, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,42 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-import pytest
-import io
+from tkinter import ttk, messagebox, simpledialog, filedialog
+from concurrent.futures import ThreadPoolExecutor
+import os
+import queue
+import re
+import subprocess
 import sys
-from paty_projekt import (
+import threading
+from collections import OrderedDict
+from jadro import (
+    VELIKOST_STRANKY,
     uloz_ukol_do_databaze,
-    nacist_vsechny_ukoly_z_databaze,
+    nacist_stranku_vsech_ukolu,
+    id_ukolu_na_pozici,
+    pocet_ukolu,
+    aktualni_verze_zmen,
+    nacist_zmeny,
     zmenit_stav_ukolu_v_databazi,
+    zmenit_stav_ukolu_hromadne,
     odstranit_ukol_z_databaze,
-    odstranit_ukol,
+    odstranit_ukoly_hromadne,
+    popis_metrik,
+    hledat_ukoly,
+    STAVY,
+    metriky_json,
+    metriky_prometheus,
 )
 
 # -----------------------------------
 # Funkce pro testování v GUI
 # -----------------------------------
+# Každý test běží v samostatném procesu pytest (čisté importy při každém
+# spuštění), několik najednou. Vlákna spouštěče jen čekají na procesy
+# a výsledky předávají frontou, kterou okno testů vybírá přes after().
+
+KOREN_PROJEKTU = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOUBOR_TESTU = "tests/test_paty_projekt.py"
+PARALELNICH_TESTU = max(1, min(4, os.cpu_count() or 1))
 
 seznam_testu = [
     "test_pridat_ukol_pozitivni",
@@ -25,74 +48,788 @@ seznam_testu = [
 ]
 
 
-def spustit_test(jmeno_testu):
-    """Spustí jeden test podle názvu a vrátí výsledek."""
-    zasobnik = io.StringIO()
-    sys.stdout = zasobnik
-    try:
-        pytest.main(["-q", "--disable-warnings", "-k", jmeno_testu])
-    finally:
-        sys.stdout = sys.__stdout__
-        vysledek = zasobnik.getvalue()
-    return vysledek
+def _pytest(*argumenty):
+    return [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", *argumenty]
 
 
-def spustit_test_v_seznamu():
-    """Vybere a spustí test ze seznamu."""
-    vyber = seznam_listbox.curselection()
-    if not vyber:
-        messagebox.showwarning("Varování", "Vyberte test k spuštění.")
-        return
-    jmeno_testu = seznam_listbox.get(vyber)
-    vysledek = spustit_test(jmeno_testu)
-    messagebox.showinfo(f"Výsledek {jmeno_testu}", vysledek)
+def najit_testy():
+    """Nechá pytest vypsat testy v SOUBOR_TESTU a vrátí jejich názvy."""
+    vystup = subprocess.run(
+        _pytest("--collect-only", "-q", SOUBOR_TESTU),
+        cwd=KOREN_PROJEKTU,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return [
+        radek.split("::", 1)[1]
+        for radek in vystup.splitlines()
+        if radek.startswith(f"{SOUBOR_TESTU}::")
+    ]
 
 
-def spustit_vsechny():
-    """Spustí všechny testy a vypíše výsledek."""
-    zasobnik = io.StringIO()
-    sys.stdout = zasobnik
-    try:
-        pytest.main(["-q", "--disable-warnings"])
-    finally:
-        sys.stdout = sys.__stdout__
-        vysledek = zasobnik.getvalue()
-    messagebox.showinfo("Výsledek testů", vysledek)
+VYSLEDKY_PYTEST = {
+    "PASSED": "prošel",
+    "XPASS": "prošel",
+    "FAILED": "selhal",
+    "ERROR": "selhal",
+    "SKIPPED": "přeskočen",
+    "XFAIL": "přeskočen",
+}
+
+
+JEDNOTKY_DOBY = {"us": 1e-6, "ms": 1e-3, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def radek_vysledku(radek):
+    """
+    Rozpozná řádek výstupu 'pytest -v -o console_output_style=times'
+    s výsledkem jednoho testu, např. '...::test_x PASSED  460.7us'
+    nebo '...::test_y FAILED  1m 5s'.
+
+    Návratová hodnota:
+        tuple: (název testu, výsledek, doba v sekundách nebo None), nebo None.
+    """
+    shoda = re.match(
+        rf"{re.escape(SOUBOR_TESTU)}::(\S+) ({'|'.join(VYSLEDKY_PYTEST)})\b", radek
+    )
+    if shoda is None:
+        return None
+    jmeno, vysledek = shoda.groups()
+    konec = re.search(r"(?:\s[\d.]+(?:us|ms|s|m|h))+\s*$", radek[shoda.end():])
+    doba = None
+    if konec is not None:
+        doba = sum(
+            float(cislo) * JEDNOTKY_DOBY[jednotka]
+            for cislo, jednotka in re.findall(r"([\d.]+)(us|ms|s|m|h)", konec.group())
+        )
+    return jmeno, VYSLEDKY_PYTEST[vysledek], doba
+
+
+def vystupy_selhani(vystup):
+    """Vrátí slovník název testu -> podrobný výpis chyby ze závěru výstupu pytest."""
+    return dict(
+        re.findall(r"^_{3,} (\S+) _{3,}\n(.*?)(?=^_{3,} |^={3,})", vystup, re.MULTILINE | re.DOTALL)
+    )
+
+
+class SpoustecTestu:
+    """
+    Rozdělí vybrané testy mezi 'paralelne' procesů pytest a průběžně čte
+    jejich výstup, takže výsledek každého testu je vidět hned po doběhnutí.
+
+    Parametry:
+        po_testu: funkce (jmeno, vysledek, doba, vystup) volaná v hlavním
+            vlákně Tk pro každý dokončený test (a znovu, když se doplní
+            podrobný výpis chyby).
+        po_dokonceni: funkce bez parametrů volaná po posledním testu
+            nebo po zrušení běhu.
+    """
+
+    def __init__(self, okno, po_testu, po_dokonceni, paralelne=PARALELNICH_TESTU):
+        self.okno = okno
+        self.po_testu = po_testu
+        self.po_dokonceni = po_dokonceni
+        self.paralelne = paralelne
+        self.vlakna = ThreadPoolExecutor(max_workers=paralelne, thread_name_prefix="testy")
+        self.hotove = queue.Queue()
+        self.procesy = set()
+        self.zamek = threading.Lock()
+        self.zbyva = 0
+        self.zruseno = False
+
+    def spustit(self, testy):
+        self.zbyva = len(testy)
+        for poradi in range(self.paralelne):
+            davka = testy[poradi :: self.paralelne]
+            if davka:
+                self.vlakna.submit(self._spustit_davku, davka, poradi)
+        self.okno.after(INTERVAL_FRONTY_MS, self._zpracovat_hotove)
+
+    def zrusit(self):
+        """Ukončí běžící procesy; testy, které nestihly doběhnout, se označí jako zrušené."""
+        with self.zamek:
+            self.zruseno = True
+            for proces in self.procesy:
+                proces.terminate()
+
+    def _spustit_davku(self, davka, poradi):
+        nedokoncene = list(davka)
+        while nedokoncene:
+            vystup = self._spustit_proces(nedokoncene, poradi)
+            if vystup is None:
+                break
+            # neznámý test shodí celý proces, zbytek dávky se proto spustí znovu bez něj
+            nenalezene = [
+                jmeno for jmeno in nedokoncene
+                if re.search(rf"^ERROR: not found: .*::{re.escape(jmeno)}$", vystup, re.MULTILINE)
+            ]
+            for jmeno in nenalezene:
+                nedokoncene.remove(jmeno)
+                self.hotove.put((jmeno, "nenalezen", None, vystup, True))
+            if not nenalezene:
+                for jmeno in nedokoncene:
+                    self.hotove.put((jmeno, "selhal", None, vystup, True))
+                return
+        for jmeno in nedokoncene:
+            self.hotove.put((jmeno, "zrušen", None, "", True))
+
+    def _spustit_proces(self, nedokoncene, poradi):
+        """
+        Spustí jeden proces pytest nad testy v 'nedokoncene' a z jejich seznamu
+        odebírá testy, jejichž výsledek už přišel. Proces dostane jméno
+        pracovníka 'gw<poradi>' jako pod pytest-xdist, takže souběžné procesy
+        pracují s MySQL každý ve vlastní testovací databázi.
+
+        Návratová hodnota:
+            str: celý výstup procesu, nebo None, pokud byl běh zrušen.
+        """
+        with self.zamek:
+            if self.zruseno:
+                return None
+            proces = subprocess.Popen(
+                _pytest("-v", "--disable-warnings", "-o", "console_output_style=times",
+                        *(f"{SOUBOR_TESTU}::{jmeno}" for jmeno in nedokoncene)),
+                cwd=KOREN_PROJEKTU,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                env={**os.environ, "PYTHONUNBUFFERED": "1", "PYTEST_XDIST_WORKER": f"gw{poradi}"},
+            )
+            self.procesy.add(proces)
+        spustene = list(nedokoncene)
+        vystup = []
+        for radek in proces.stdout:
+            vystup.append(radek)
+            vysledek = radek_vysledku(radek)
+            if vysledek is None:
+                continue
+            jmeno, stav, doba = vysledek
+            # chyba v teardown přidá k již hotovému testu další řádek
+            nove = jmeno in nedokoncene
+            if nove:
+                nedokoncene.remove(jmeno)
+            self.hotove.put((jmeno, stav, doba, radek, nove))
+        proces.wait()
+        with self.zamek:
+            self.procesy.discard(proces)
+            zruseno = self.zruseno
+        vystup = "".join(vystup)
+        for jmeno, text in vystupy_selhani(vystup).items():
+            if jmeno in spustene:
+                self.hotove.put((jmeno, "selhal", None, text, False))
+        return None if zruseno else vystup
+
+    def _zpracovat_hotove(self):
+        while True:
+            try:
+                jmeno, vysledek, doba, vystup, nove = self.hotove.get_nowait()
+            except queue.Empty:
+                break
+            if nove:
+                self.zbyva -= 1
+            if self.okno.winfo_exists():
+                self.po_testu(jmeno, vysledek, doba, vystup)
+        if self.zbyva > 0:
+            self.okno.after(INTERVAL_FRONTY_MS, self._zpracovat_hotove)
+            return
+        self.vlakna.shutdown(wait=False)
+        if self.okno.winfo_exists():
+            self.po_dokonceni()
 
 
 def testovac_gui():
-    """Okno s výběrem testů a tlačítky pro spuštění."""
+    """
+    Okno s výběrem testů. Testy běží na pozadí, výsledky s dobou běhu
+    přibývají v tabulce průběžně a běh lze zrušit; po výběru řádku
+    se zobrazí výstup testu.
+    """
     okno = tk.Toplevel(koren)
     okno.title("Testy")
-    okno.geometry("400x350")
+    okno.geometry("700x600")
+
+    seznam_listbox = tk.Listbox(okno, height=10, selectmode=tk.EXTENDED)
+    for jmeno in seznam_testu:
+        seznam_listbox.insert(tk.END, jmeno)
+    seznam_listbox.pack(padx=10, pady=10, fill=tk.X)
+
+    ramec = tk.Frame(okno)
+    ramec.pack(pady=5)
+    tlc_spustit_vybrane = tk.Button(ramec, text="Spustit vybrané testy")
+    tlc_spustit_vybrane.pack(side=tk.LEFT, padx=5)
+    tlc_spustit_vse = tk.Button(ramec, text="Spustit všechny testy")
+    tlc_spustit_vse.pack(side=tk.LEFT, padx=5)
+    tlc_zrusit = tk.Button(ramec, text="Zrušit", state=tk.DISABLED)
+    tlc_zrusit.pack(side=tk.LEFT, padx=5)
+    souhrn = tk.Label(okno, text="")
+    souhrn.pack()
+
+    vysledky = ttk.Treeview(okno, columns=("Test", "Výsledek", "Doba"), show="headings", height=8)
+    for sloupec, sirka in (("Test", 400), ("Výsledek", 120), ("Doba", 100)):
+        vysledky.heading(sloupec, text=sloupec)
+        vysledky.column(sloupec, width=sirka, anchor="w" if sloupec == "Test" else "center")
+    vysledky.pack(padx=10, fill=tk.BOTH, expand=True)
+    vystup_testu = tk.Text(okno, height=10, font=("Courier", 9))
+    vystup_testu.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+
+    vystupy = {}
+    pocty = {}
+    hotove = {}
+    beh = None
+
+    def aktualizovat_souhrn(hotovo, celkem):
+        casti = ", ".join(
+            f"{vysledek}: {pocet}" for vysledek, pocet in sorted(pocty.items()) if pocet
+        )
+        souhrn.config(text=f"Hotovo {hotovo}/{celkem}" + (f" ({casti})" if casti else ""))
+
+    def spustit(testy):
+        nonlocal beh
+        if beh is not None or not testy:
+            return
+        vysledky.delete(*vysledky.get_children())
+        vystup_testu.delete("1.0", tk.END)
+        vystupy.clear()
+        pocty.clear()
+        hotove.clear()
+        for jmeno in testy:
+            vysledky.insert("", tk.END, iid=jmeno, values=(jmeno, "čeká", ""))
+        celkem = len(testy)
+        aktualizovat_souhrn(0, celkem)
+
+        def po_testu(jmeno, vysledek, doba, vystup):
+            # opakované volání pro týž test jen doplní výpis chyby
+            if jmeno in hotove:
+                predchozi, predchozi_doba = hotove[jmeno]
+                pocty[predchozi] -= 1
+                doba = predchozi_doba if doba is None else doba
+            hotove[jmeno] = (vysledek, doba)
+            vystupy[jmeno] = vystup
+            pocty[vysledek] = pocty.get(vysledek, 0) + 1
+            vysledky.item(
+                jmeno, values=(jmeno, vysledek, "" if doba is None else f"{doba:.3f} s")
+            )
+            aktualizovat_souhrn(len(hotove), celkem)
+
+        def po_dokonceni():
+            nonlocal beh
+            beh = None
+            tlc_zrusit.config(state=tk.DISABLED)
+            tlc_spustit_vybrane.config(state=tk.NORMAL)
+            tlc_spustit_vse.config(state=tk.NORMAL)
+
+        beh = SpoustecTestu(okno, po_testu, po_dokonceni)
+        tlc_zrusit.config(state=tk.NORMAL)
+        tlc_spustit_vybrane.config(state=tk.DISABLED)
+        tlc_spustit_vse.config(state=tk.DISABLED)
+        beh.spustit(testy)
+
+    def spustit_vybrane():
+        vyber = seznam_listbox.curselection()
+        if not vyber:
+            messagebox.showwarning("Varování", "Vyberte test k spuštění.", parent=okno)
+            return
+        spustit([seznam_listbox.get(index) for index in vyber])
+
+    def zobrazit_vystup(_udalost):
+        vybrane = vysledky.selection()
+        vystup_testu.delete("1.0", tk.END)
+        if vybrane:
+            vystup_testu.insert(tk.END, vystupy.get(vybrane[0], ""))
+
+    def po_nalezeni(testy):
+        if testy and okno.winfo_exists():
+            seznam_listbox.delete(0, tk.END)
+            for jmeno in testy:
+                seznam_listbox.insert(tk.END, jmeno)
+
+    def zavrit():
+        if beh is not None:
+            beh.zrusit()
+        okno.destroy()
 
-    global seznam_listbox
-    seznam_listbox = tk.Listbox(okno, height=12)
-    for _ in seznam_testu:
-        seznam_listbox.insert(tk.END, _)
-    seznam_listbox.pack(pady=10, fill=tk.BOTH, expand=True)
+    tlc_spustit_vybrane.config(command=spustit_vybrane)
+    tlc_spustit_vse.config(command=lambda: spustit(list(seznam_listbox.get(0, tk.END))))
+    tlc_zrusit.config(command=lambda: beh is not None and beh.zrusit())
+    vysledky.bind("<<TreeviewSelect>>", zobrazit_vystup)
+    okno.protocol("WM_DELETE_WINDOW", zavrit)
 
-    tlc_spustit_jeden = tk.Button(
-        okno, text="Spustit vybraný test", command=spustit_test_v_seznamu
-    )
-    tlc_spustit_jeden.pack(pady=5)
+    # seznam testů se doplní podle skutečného obsahu souboru testů
+    nalezeni = ThreadPoolExecutor(max_workers=1)
+    budouci = nalezeni.submit(najit_testy)
+    nalezeni.shutdown(wait=False)
 
-    tlc_spustit_vse = tk.Button(
-        okno, text="Spustit všechny testy", command=spustit_vsechny
+    def cekat_na_nalezeni():
+        if budouci.done():
+            po_nalezeni(budouci.result() if budouci.exception() is None else [])
+        elif okno.winfo_exists():
+            okno.after(INTERVAL_FRONTY_MS, cekat_na_nalezeni)
+
+    cekat_na_nalezeni()
+
+
+# -----------------------------------
+# Statistiky dotazů
+# -----------------------------------
+
+INTERVAL_STATISTIK_MS = 2000
+
+
+def statistiky_gui():
+    """Okno s metrikami dotazů, které se samo obnovuje; metriky lze uložit jako JSON nebo Prometheus."""
+    okno = tk.Toplevel(koren)
+    okno.title("Statistiky dotazů")
+    okno.geometry("900x450")
+
+    text = tk.Text(okno, font=("Courier", 10), wrap=tk.NONE)
+    text.pack(fill=tk.BOTH, expand=True)
+
+    def obnovit():
+        if not okno.winfo_exists():
+            return
+        text.delete("1.0", tk.END)
+        text.insert(tk.END, "\n".join(popis_metrik()))
+        okno.after(INTERVAL_STATISTIK_MS, obnovit)
+
+    def ulozit(obsah, pripona):
+        cesta = filedialog.asksaveasfilename(
+            parent=okno, defaultextension=pripona, initialfile=f"metriky{pripona}"
+        )
+        if cesta:
+            with open(cesta, "w", encoding="utf-8") as soubor:
+                soubor.write(obsah())
+
+    ramec = tk.Frame(okno)
+    ramec.pack(pady=5)
+    tk.Button(ramec, text="Uložit JSON", command=lambda: ulozit(metriky_json, ".json")).pack(
+        side=tk.LEFT, padx=5
     )
-    tlc_spustit_vse.pack(pady=5)
+    tk.Button(
+        ramec, text="Uložit Prometheus", command=lambda: ulozit(metriky_prometheus, ".prom")
+    ).pack(side=tk.LEFT, padx=5)
+    obnovit()
+
+
+# -----------------------------------
+# Práce s databází na pozadí
+# -----------------------------------
+# Databázové operace běží ve vláknech pracovníků, aby nezamrzalo okno.
+# Výsledky se předávají frontou, kterou hlavní vlákno vybírá přes after().
+pracovnici = ThreadPoolExecutor(max_workers=4, thread_name_prefix="databaze")
+hotove_ulohy = queue.Queue()
+bezicich_uloh = 0
+INTERVAL_FRONTY_MS = 50
+INTERVAL_ZMEN_MS = 3000
+
+
+def ohlasit_chybu(chyba):
+    """Výchozí obsluha výjimky z úlohy na pozadí: zobrazí ji uživateli."""
+    messagebox.showerror("Chyba", f"Operace s databází selhala: {chyba}")
+
+
+def na_pozadi(funkce, *argumenty, po_dokonceni=None, pri_chybe=ohlasit_chybu):
+    """
+    Spustí funkci ve vlákně pracovníka.
+    Funkce po_dokonceni(vysledek) se potom zavolá v hlavním vlákně Tk;
+    skončí-li funkce výjimkou, zavolá se místo ní pri_chybe(chyba), aby
+    volající mohl vrátit svůj stav (příznaky, rozpracovaná načtení) zpět.
+    """
+    global bezicich_uloh
+    bezicich_uloh += 1
+    zobrazit_zaneprazdneni()
+
+    def uloha():
+        try:
+            hotove_ulohy.put((po_dokonceni, pri_chybe, funkce(*argumenty), None))
+        except Exception as chyba:
+            hotove_ulohy.put((po_dokonceni, pri_chybe, None, chyba))
+
+    pracovnici.submit(uloha)
+
+
+def zpracovat_hotove_ulohy():
+    """
+    Předá výsledky dokončených úloh jejich obsluze a naplánuje další kontrolu.
+    Další kontrola se naplánuje i tehdy, když obsluha sama skončí výjimkou.
+    """
+    global bezicich_uloh
+    try:
+        while True:
+            try:
+                po_dokonceni, pri_chybe, vysledek, chyba = hotove_ulohy.get_nowait()
+            except queue.Empty:
+                break
+            bezicich_uloh -= 1
+            if chyba is not None:
+                if pri_chybe is not None:
+                    pri_chybe(chyba)
+            elif po_dokonceni is not None:
+                po_dokonceni(vysledek)
+    finally:
+        zobrazit_zaneprazdneni()
+        koren.after(INTERVAL_FRONTY_MS, zpracovat_hotove_ulohy)
+
+
+def zobrazit_zaneprazdneni():
+    """Zobrazí nebo skryje indikátor probíhající práce s databází."""
+    if bezicich_uloh:
+        stav_prace.config(text="Pracuji s databází…")
+        koren.config(cursor="watch")
+    else:
+        stav_prace.config(text="")
+        koren.config(cursor="")
+
+
+# -----------------------------------
+# Virtualizovaný seznam úkolů
+# -----------------------------------
+def nacist_stranku_radku(pozice, po_id, limit):
+    """
+    Načte až 'limit' úkolů od dané pozice v seznamu seřazeném podle ID.
+    Je-li známé ID úkolu před pozicí (po_id), pokračuje se od něj, jinak
+    se nejdřív zjistí ID úkolu na předchozí pozici.
+    """
+    if po_id is None and pozice > 0:
+        po_id = id_ukolu_na_pozici(pozice - 1)
+        if po_id is None:
+            return []
+    ukoly, _ = nacist_stranku_vsech_ukolu(po_id, limit)
+    return ukoly
+
+
+class VirtualniSeznamUkolu:
+    """
+    Seznam úkolů v Treeview, který drží jen řádky viditelného okna.
+
+    Úkoly se načítají po stránkách řádků: stránka k obsahuje úkoly na pozicích
+    k * velikost_stranky až (k + 1) * velikost_stranky - 1 v pořadí podle ID.
+    Stránka se načte stránkováním podle klíče od posledního ID předchozí
+    stránky; na vzdálenou stránku, jejíž začátek ještě není znám, se skočí
+    přes ID úkolu na její první pozici. Kolem okna se přednačítá
+    'okraj_stranek' stránek na každou stranu a naposledy použité stránky se
+    drží v cache o nejvýše 'max_stranek' položkách. Posuvník odpovídá pozici
+    prvního zobrazeného řádku mezi všemi úkoly.
+
+    Změny od ostatních klientů se zjišťují dotazem na změny od poslední
+    značky každých INTERVAL_ZMEN_MS. Upravené úkoly se nahradí přímo
+    ve stránkách; vložení nebo odstranění posune pozice řádků, takže se
+    seznam obnoví celý.
+    """
+
+    def __init__(
+        self, tree, posuvnik, velikost_stranky=VELIKOST_STRANKY, max_stranek=64, okraj_stranek=1
+    ):
+        self.tree = tree
+        self.posuvnik = posuvnik
+        self.velikost_stranky = velikost_stranky
+        self.max_stranek = max_stranek
+        self.okraj_stranek = okraj_stranek
+        self.pocet = None
+        self.prvni = 0  # pozice prvního zobrazeného řádku
+        self.vyska = 10
+        self.stranky = OrderedDict()  # číslo stránky -> úkoly seřazené podle ID
+        # číslo stránky -> ID posledního úkolu před ní (pokračovací token)
+        self.zacatky_stranek = {}
+        self.nacitane_stranky = set()
+        # ID -> hodnoty řádku zobrazené v Treeview; iid položky je ID úkolu
+        self.zobrazene = {}
+        # zvýší se při obnově, aby se zahodily stránky načtené pro starý stav
+        self.verze = 0
+        self.probiha_obnova = False
+        self.ceka_obnova = False
+        self.znacka_zmen = None
+        # úkoly nalezené hledáním; dokud není None, zobrazují se místo okna
+        self.vysledky_hledani = None
+
+        posuvnik.configure(command=self.posunout)
+        tree.bind("<Configure>", self._zmena_velikosti)
+        tree.bind("<MouseWheel>", self._kolecko)
+        tree.bind("<Button-4>", lambda _: self.posunout("scroll", -3, "units"))
+        tree.bind("<Button-5>", lambda _: self.posunout("scroll", 3, "units"))
+
+    def obnovit(self):
+        """
+        Zahodí načtené stránky a na pozadí znovu načte počet úkolů a viditelné okno.
+        Požadavky, které přijdou během probíhající obnovy, se sloučí do jedné další.
+        """
+        if self.probiha_obnova:
+            self.ceka_obnova = True
+            return
+        self.probiha_obnova = True
+        na_pozadi(
+            pocet_ukolu,
+            po_dokonceni=self._po_nacteni_poctu,
+            pri_chybe=self._obnova_selhala,
+        )
+
+    def _obnova_selhala(self, chyba):
+        self.probiha_obnova = False
+        self.ceka_obnova = False
+        ohlasit_chybu(chyba)
+
+    def sledovat_zmeny(self):
+        """Zjistí aktuální značku změn, načte seznam a začne pravidelně hledat změny."""
+        na_pozadi(
+            aktualni_verze_zmen,
+            po_dokonceni=self._po_nacteni_znacky,
+            pri_chybe=self._zjisteni_zmen_selhalo,
+        )
+
+    def _zjisteni_zmen_selhalo(self, _chyba):
+        # nedostupná databáze nesmí sledování změn zastavit, zkusí se znovu
+        self.tree.after(INTERVAL_ZMEN_MS, self._zjistit_zmeny)
+
+    def _po_nacteni_znacky(self, znacka):
+        # značka se zjistí před načtením seznamu, aby se žádná změna neztratila
+        self.znacka_zmen = znacka
+        self.obnovit()
+        self.tree.after(INTERVAL_ZMEN_MS, self._zjistit_zmeny)
+
+    def _zjistit_zmeny(self):
+        if self.znacka_zmen is None:
+            self.sledovat_zmeny()
+            return
+        na_pozadi(
+            nacist_zmeny,
+            self.znacka_zmen,
+            po_dokonceni=self._po_nacteni_zmen,
+            pri_chybe=self._zjisteni_zmen_selhalo,
+        )
+
+    def _po_nacteni_zmen(self, zmeny):
+        self.tree.after(INTERVAL_ZMEN_MS, self._zjistit_zmeny)
+        if zmeny is None:
+            return
+        self.znacka_zmen = zmeny["verze"]
+        if zmeny["vlozene"] or zmeny["smazane"]:
+            self.obnovit()
+            return
+        upravene = {ukol.id: ukol for ukol in zmeny["upravene"]}
+        if not upravene:
+            return
+        for cislo, ukoly in self.stranky.items():
+            self.stranky[cislo] = [upravene.get(ukol.id, ukol) for ukol in ukoly]
+        # rozpracovaná načtení mohla skončit před změnou, vyžádají se znovu
+        self.verze += 1
+        self.nacitane_stranky.clear()
+        self.vykreslit()
+
+    def _po_nacteni_poctu(self, pocet):
+        self.pocet = pocet
+        self.verze += 1
+        self.stranky.clear()
+        self.zacatky_stranek = {0: None}
+        self.nacitane_stranky.clear()
+        self.probiha_obnova = False
+        self.vykreslit()
+        if self.ceka_obnova:
+            self.ceka_obnova = False
+            self.obnovit()
+
+    def vykreslit(self):
+        """
+        Zobrazí okno úkolů od pozice 'prvni' ze stránek v cache.
+        Chybějící stránky okna a okraje si vyžádá; dokud okno není celé
+        načtené, nechá v Treeview původní řádky.
+        """
+        if self.vysledky_hledani is not None:
+            return
+        if not self.pocet:
+            self._promitnout([])
+            self.posuvnik.set(0, 1)
+            return
+
+        self.prvni = min(max(self.prvni, 0), max(0, self.pocet - self.vyska))
+        konec = min(self.prvni + self.vyska, self.pocet)
+        prvni_stranka = self.prvni // self.velikost_stranky
+        posledni_stranka = (konec - 1) // self.velikost_stranky
+        radky = []
+        okno_nacteno = True
+        for cislo in range(prvni_stranka, posledni_stranka + 1):
+            ukoly = self._stranka(cislo)
+            if ukoly is None:
+                okno_nacteno = False
+                break
+            radky.extend(ukoly)
+
+        nejvyssi_stranka = (self.pocet - 1) // self.velikost_stranky
+        for cislo in range(
+            max(0, prvni_stranka - self.okraj_stranek),
+            min(nejvyssi_stranka, posledni_stranka + self.okraj_stranek) + 1,
+        ):
+            if cislo not in self.stranky:
+                self._nacist_stranku(cislo)
+
+        if okno_nacteno:
+            zacatek = self.prvni - prvni_stranka * self.velikost_stranky
+            self._promitnout(radky[zacatek : zacatek + self.vyska])
+            self.posuvnik.set(self.prvni / self.pocet, konec / self.pocet)
+
+    def posunout(self, akce, pocet=None, jednotka=None):
+        """Obsluha posuvníku a kolečka myši (stejné parametry jako Treeview.yview)."""
+        if self.vysledky_hledani is not None:
+            # výsledky hledání jsou v Treeview celé, posouvá je přímo Treeview
+            self.tree.yview(akce, pocet, *([jednotka] if jednotka else []))
+            self.posuvnik.set(*self.tree.yview())
+            return
+        if not self.pocet:
+            return
+        if akce == "moveto":
+            self.prvni = round(float(pocet) * self.pocet)
+        else:
+            self.prvni += int(pocet) * (self.vyska if jednotka == "pages" else 1)
+        self.vykreslit()
+
+    def _stranka(self, cislo):
+        ukoly = self.stranky.get(cislo)
+        if ukoly is not None:
+            self.stranky.move_to_end(cislo)
+        return ukoly
+
+    def _nacist_stranku(self, cislo):
+        if cislo in self.nacitane_stranky:
+            return
+        self.nacitane_stranky.add(cislo)
+        verze = self.verze
+        na_pozadi(
+            nacist_stranku_radku,
+            cislo * self.velikost_stranky,
+            self.zacatky_stranek.get(cislo),
+            self.velikost_stranky,
+            po_dokonceni=lambda ukoly: self._po_nacteni_stranky(cislo, ukoly, verze),
+            pri_chybe=lambda chyba: self._nacteni_stranky_selhalo(cislo, chyba, verze),
+        )
+
+    def _nacteni_stranky_selhalo(self, cislo, chyba, verze):
+        # stránka se při příštím vykreslení vyžádá znovu
+        if verze == self.verze:
+            self.nacitane_stranky.discard(cislo)
+        ohlasit_chybu(chyba)
+
+    def _po_nacteni_stranky(self, cislo, ukoly, verze):
+        if verze != self.verze:
+            return
+        self.nacitane_stranky.discard(cislo)
+        if not ukoly:
+            # chyba čtení (hlásí ji jádro); prázdná stránka se neuloží,
+            # aby se při příštím vykreslení načetla znovu
+            return
+        self.stranky[cislo] = ukoly
+        if len(ukoly) == self.velikost_stranky:
+            self.zacatky_stranek[cislo + 1] = ukoly[-1].id
+        while len(self.stranky) > self.max_stranek:
+            self.stranky.popitem(last=False)
+        self.vykreslit()
+
+    def _promitnout(self, ukoly):
+        """Změní v Treeview jen řádky, které do okna přibyly, změnily se nebo z něj zmizely."""
+        nove = {ukol.id: (ukol.id, ukol.nazev, ukol.stav) for ukol in ukoly}
+        odstranena = [id_ukolu for id_ukolu in self.zobrazene if id_ukolu not in nove]
+        if odstranena:
+            self.tree.delete(*[str(id_ukolu) for id_ukolu in odstranena])
+        for pozice, (id_ukolu, hodnoty) in enumerate(nove.items()):
+            puvodni = self.zobrazene.get(id_ukolu)
+            if puvodni is None:
+                self.tree.insert("", pozice, iid=str(id_ukolu), values=hodnoty)
+            elif puvodni != hodnoty:
+                self.tree.item(str(id_ukolu), values=hodnoty)
+        self.zobrazene = nove
+
+    def zobrazit_vysledky(self, ukoly):
+        """Nahradí okno seznamu výsledky hledání (až do zrusit_hledani())."""
+        self.vysledky_hledani = ukoly
+        self._promitnout(ukoly)
+        self.tree.yview_moveto(0)
+        self.posuvnik.set(*self.tree.yview())
+
+    def zrusit_hledani(self):
+        """Vrátí zobrazení k oknu celého seznamu."""
+        if self.vysledky_hledani is None:
+            return
+        self.vysledky_hledani = None
+        self.tree.yview_moveto(0)
+        self.vykreslit()
+
+    def _zmena_velikosti(self, udalost):
+        vyska_radku = ttk.Style().lookup("Treeview", "rowheight") or 20
+        vyska = max(1, (udalost.height - 25) // int(vyska_radku))
+        if vyska != self.vyska:
+            self.vyska = vyska
+            self.vykreslit()
+
+    def _kolecko(self, udalost):
+        krok = -1 if udalost.delta > 0 else 1
+        self.posunout("scroll", 3 * krok, "units")
 
 
 # -----------------------------------
 # Funkce pro GUI operace
 # -----------------------------------
 def aktualizace_treeview(tree):
-    """Aktualizuje seznam úkolů v Treeview."""
-    for vetev in tree.get_children():
-        tree.delete(vetev)
-    ukoly = nacist_vsechny_ukoly_z_databaze()
-    for ukol in ukoly:
-        tree.insert("", "end", values=(ukol["id"], ukol["nazev"], ukol["stav"]))
+    """Aktualizuje seznam úkolů v Treeview podle databáze (jen viditelné okno nebo výsledky hledání)."""
+    seznam_ukolu.obnovit()
+    if seznam_ukolu.vysledky_hledani is not None:
+        spustit_hledani()
+
+
+# -----------------------------------
+# Hledání úkolů
+# -----------------------------------
+# Hledá se až po chvíli bez psaní; starší odpovědi, které dorazí po novějším
+# dotazu, se zahodí podle pořadového čísla dotazu.
+ZPOZDENI_HLEDANI_MS = 300
+VELIKOST_VYSLEDKU_HLEDANI = 200
+VSECHNY_STAVY = "všechny stavy"
+odlozene_hledani = None
+poradi_hledani = 0
+
+
+def naplanovat_hledani(_udalost=None):
+    """Odloží hledání o ZPOZDENI_HLEDANI_MS; každý další stisk klávesy ho posune."""
+    global odlozene_hledani
+    if odlozene_hledani is not None:
+        koren.after_cancel(odlozene_hledani)
+    odlozene_hledani = koren.after(ZPOZDENI_HLEDANI_MS, spustit_hledani)
+
+
+def spustit_hledani():
+    """Spustí hledání podle pole hledání na pozadí; prázdné pole hledání zruší."""
+    global odlozene_hledani, poradi_hledani
+    odlozene_hledani = None
+    poradi_hledani += 1
+    text = pole_hledani.get().strip()
+    if not text:
+        seznam_ukolu.zrusit_hledani()
+        return
+    stav = volba_stavu.get()
+    poradi = poradi_hledani
+    na_pozadi(
+        hledat_ukoly,
+        text,
+        None if stav == VSECHNY_STAVY else stav,
+        0,
+        VELIKOST_VYSLEDKU_HLEDANI,
+        po_dokonceni=lambda vysledek: _po_hledani(poradi, vysledek),
+    )
+
+
+def _po_hledani(poradi, vysledek):
+    if poradi != poradi_hledani:
+        return
+    ukoly, _ = vysledek
+    seznam_ukolu.zobrazit_vysledky(ukoly)
+
+
+def _po_zapisu(uspech_text, chyba_text):
+    """Vrátí obsluhu výsledku zápisu: ohlásí výsledek a obnoví seznam."""
+
+    def obsluha(uspesne):
+        if uspesne:
+            messagebox.showinfo("Úspěch", uspech_text)
+            aktualizace_treeview(strom)
+        else:
+            messagebox.showerror("Chyba", chyba_text)
+
+    return obsluha
 
 
 def pridej_ukol():
@@ -102,23 +839,25 @@ def pridej_ukol():
     popis = simpledialog.askstring("Nový úkol", "Zadejte popis úkolu (max 200 znaků):")
     if popis is None:
         return
-    uspesne = uloz_ukol_do_databaze(nazev, popis)
-    if uspesne:
-        messagebox.showinfo("Úspěch", "Úkol byl přidán!")
-        aktualizace_treeview(strom)
-    else:
-        messagebox.showerror("Chyba", "Nepodařilo se přidat úkol.")
+    na_pozadi(
+        uloz_ukol_do_databaze,
+        nazev,
+        popis,
+        po_dokonceni=_po_zapisu("Úkol byl přidán!", "Nepodařilo se přidat úkol."),
+    )
 
 
 def aktualizovat_stav():
-    """Změní stav vybraného úkolu."""
+    """Změní stav vybraného úkolu, případně všech vybraných úkolů."""
     vybrany = strom.selection()
     if not vybrany:
         messagebox.showwarning("Varování", "Nejprve vyberte úkol ke změně stavu.")
         return
-    radek = strom.item(vybrany[0])["values"]
-    id_ukolu = radek[0]
-    soucasny_stav = radek[2]
+    radky = [strom.item(vetev)["values"] for vetev in vybrany]
+    if len(radky) == 1:
+        soucasny_stav = radky[0][2]
+    else:
+        soucasny_stav = f"vybráno úkolů: {len(radky)}"
     novy_stav = simpledialog.askstring(
         "Změna stavu",
         f"Zadejte nový stav ('nezahájeno', 'hotovo', 'probíhá')\nSoučasný stav: {soucasny_stav}",
@@ -126,30 +865,41 @@ def aktualizovat_stav():
     if novy_stav not in ("nezahájeno", "hotovo", "probíhá"):
         messagebox.showerror("Chyba", "Neplatný stav.")
         return
-    uspesne = zmenit_stav_ukolu_v_databazi(id_ukolu, novy_stav)
-    if uspesne:
-        messagebox.showinfo("Úspěch", "Stav byl změněn.")
-        aktualizace_treeview(strom)
+    obsluha = _po_zapisu("Stav byl změněn.", "Nepodařilo se změnit stav úkolu.")
+    if len(radky) == 1:
+        na_pozadi(
+            zmenit_stav_ukolu_v_databazi, radky[0][0], novy_stav, po_dokonceni=obsluha
+        )
     else:
-        messagebox.showerror("Chyba", "Nepodařilo se změnit stav úkolu.")
+        na_pozadi(
+            zmenit_stav_ukolu_hromadne,
+            [radek[0] for radek in radky],
+            novy_stav,
+            po_dokonceni=obsluha,
+        )
 
 
 def odstranit_ukol():
-    """Mazání vybraného úkolu."""
+    """Mazání vybraného úkolu, případně všech vybraných úkolů."""
     vybrany = strom.selection()
     if not vybrany:
         messagebox.showwarning("Varování", "Vyberte úkol ke smazání.")
         return
-    radek = strom.item(vybrany[0])["values"]
-    id_ukolu = radek[0]
-    nazev = radek[1]
-    if messagebox.askyesno("Potvrzení", f"Opravdu chcete odstranit úkol '{nazev}'?"):
-        uspesne = odstranit_ukol_z_databaze(id_ukolu)
-        if uspesne:
-            messagebox.showinfo("Úspěch", "Úkol byl odstraněn.")
-            aktualizace_treeview(strom)
+    radky = [strom.item(vetev)["values"] for vetev in vybrany]
+    if len(radky) == 1:
+        otazka = f"Opravdu chcete odstranit úkol '{radky[0][1]}'?"
+    else:
+        otazka = f"Opravdu chcete odstranit vybrané úkoly (počet: {len(radky)})?"
+    if messagebox.askyesno("Potvrzení", otazka):
+        obsluha = _po_zapisu("Úkol byl odstraněn.", "Nepodařilo se odstranit úkol.")
+        if len(radky) == 1:
+            na_pozadi(odstranit_ukol_z_databaze, radky[0][0], po_dokonceni=obsluha)
         else:
-            messagebox.showerror("Chyba", "Nepodařilo se odstranit úkol.")
+            na_pozadi(
+                odstranit_ukoly_hromadne,
+                [radek[0] for radek in radky],
+                po_dokonceni=obsluha,
+            )
 
 
 def vyber_a_spust_gui():
@@ -187,11 +937,28 @@ koren.geometry("600x400")
 
 # Treeview seznamu úkolů
 bunky = ("ID", "Název", "Stav")
-strom = ttk.Treeview(koren, columns=bunky, show="headings")
+strom = ttk.Treeview(koren, columns=bunky, show="headings", selectmode="extended")
 for bunka in bunky:
     strom.heading(bunka, text=bunka)
     strom.column(bunka, width=200, anchor="center")
+# Pole hledání nad seznamem
+ramec_hledani = tk.Frame(koren)
+ramec_hledani.pack(side=tk.TOP, fill=tk.X, padx=10, pady=(10, 0))
+tk.Label(ramec_hledani, text="Hledat:").pack(side=tk.LEFT)
+pole_hledani = tk.Entry(ramec_hledani)
+pole_hledani.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+pole_hledani.bind("<KeyRelease>", naplanovat_hledani)
+volba_stavu = ttk.Combobox(
+    ramec_hledani, values=(VSECHNY_STAVY, *STAVY), state="readonly", width=14
+)
+volba_stavu.set(VSECHNY_STAVY)
+volba_stavu.pack(side=tk.LEFT)
+volba_stavu.bind("<<ComboboxSelected>>", naplanovat_hledani)
+
+posuvnik = ttk.Scrollbar(koren, orient=tk.VERTICAL)
+posuvnik.pack(side=tk.RIGHT, fill=tk.Y)
 strom.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+seznam_ukolu = VirtualniSeznamUkolu(strom, posuvnik)
 
 # Tlačítka
 ramec_tlacitek = tk.Frame(strom)
@@ -210,10 +977,16 @@ tlc_smazat.pack(side=tk.LEFT, pady=5)
 tlc_testovat = tk.Button(koren, text="Testovat", command=testovac_gui)
 tlc_testovat.pack(side=tk.LEFT, pady=5)
 
-# Obnova seznamu při spuštění
-aktualizace_treeview(strom)
+tlc_statistiky = tk.Button(koren, text="Statistiky", command=statistiky_gui)
+tlc_statistiky.pack(side=tk.LEFT, padx=5)
+
+# Indikátor práce s databází
+stav_prace = tk.Label(koren, text="")
+stav_prace.pack(side=tk.RIGHT, padx=10)
 
-# Aktualizace seznamu úkolů při spuštění
-aktualizace_treeview(strom)
+# Načtení seznamu úkolů při spuštění a sledování změn od ostatních klientů
+seznam_ukolu.sledovat_zmeny()
 
-koren.mainloop()
\ No newline at end of file
+koren.after(INTERVAL_FRONTY_MS, zpracovat_hotove_ulohy)
+koren.mainloop()
+pracovnici.shutdown(wait=False)
\ No newline at end of file
@@ -0,0 +1,3498 @@
+"""
+Jádro správce úkolů: úložiště, pool spojení, cache, migrace a funkce pro práci
+s úkoly. Modul nenačítá tkinter a ovladač MySQL načte až při prvním připojení
+k MySQL, aby byl jeho import rychlý i pro skripty, které GUI ani MySQL nepotřebují.
+"""
+
+import os
+import re
+import csv
+import json
+import atexit
+import functools
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import closing
+from operator import itemgetter
+
+class ChybaMySQL(Exception):
+    """
+    Chyba ovladače MySQL převedená na výjimku tohoto modulu (viz _SpojeniMySQL),
+    aby ji šlo zachytit přes ChybaDatabaze, aniž by se ovladač musel načíst
+    už při importu. Původní výjimka je v __cause__.
+
+    Atributy:
+        errno (int): kód chyby MySQL, nebo None.
+        sqlstate (str): SQLSTATE chyby, nebo None.
+        trida (str): název třídy původní výjimky (např. 'ProgrammingError').
+    """
+
+    def __init__(self, chyba):
+        super().__init__(str(chyba))
+        self.errno = getattr(chyba, "errno", None)
+        self.sqlstate = getattr(chyba, "sqlstate", None)
+        self.trida = type(chyba).__name__
+
+
+# chyby, které může vyvolat kterékoli z podporovaných úložišť; n-tice se nikdy
+# nemění, takže platí i v modulech, které si ji importovaly
+ChybaDatabaze = (sqlite3.Error, ChybaMySQL)
+
+# kódy chyb MySQL: vypršelo čekání na zámek řádku, uváznutí transakcí
+KOD_CEKANI_NA_ZAMEK = 1205
+KOD_UVAZNUTI = 1213
+
+# kolik naposledy přidaných úkolů si program pamatuje v seznamu 'ukoly'
+POCET_NEDAVNYCH_UKOLU = 100
+
+# úkoly přidané v této relaci programu, jen posledních POCET_NEDAVNYCH_UKOLU
+ukoly = deque(maxlen=POCET_NEDAVNYCH_UKOLU)
+
+# poslední chyba databáze zachycená v daném vlákně, viz posledni_chyba()
+_stav_vlakna = threading.local()
+
+
+def _nahlasit_chybu(zprava, chyba):
+    """Vypíše chybu databáze, zapamatuje si ji pro aktuální vlákno a započítá do metrik."""
+    print(f"{zprava}: {chyba}\n")
+    _stav_vlakna.posledni_chyba = chyba
+    _metriky.zaznamenat_chybu_operace(_aktualni_operace(), chyba)
+
+
+def posledni_chyba():
+    """
+    Vrátí poslední chybu databáze, kterou funkce modulu zachytily
+    v aktuálním vlákně, a zapomene ji. Funkce chyby jen vypisují
+    a vracejí False, [] nebo None; tady je lze rozlišit.
+
+    Návratová hodnota:
+        Výjimka (ChybaMySQL nebo sqlite3.Error), nebo None.
+    """
+    chyba = getattr(_stav_vlakna, "posledni_chyba", None)
+    _stav_vlakna.posledni_chyba = None
+    return chyba
+
+
+def je_cekani_na_zamek(chyba):
+    """Zjistí, zda chyba znamená vypršené čekání na zámek (MySQL 1205, zamčená SQLite)."""
+    if isinstance(chyba, sqlite3.OperationalError):
+        text = str(chyba).lower()
+        return "locked" in text or "busy" in text
+    return getattr(chyba, "errno", None) == KOD_CEKANI_NA_ZAMEK
+
+# přihlašovací údaje k databázi
+NASTAVENI_DATABAZE = {
+    "host": "127.0.0.1",
+    "user": "root",
+    "password": "1234",
+    "database": "ukoly_db",
+}
+
+# povolené hodnoty sloupce 'stav'
+STAVY = ("nezahájeno", "hotovo", "probíhá")
+
+# výchozí velikost dávky pro hromadné operace
+VELIKOST_DAVKY = 1000
+
+# výchozí počet úkolů na jedné stránce výpisu
+VELIKOST_STRANKY = 50
+
+# kolik řádků si streamované čtení najednou vyzvedne ze serveru
+VELIKOST_DAVKY_CTENI = 500
+
+# výchozí parametry cache čtení úkolů
+TTL_CACHE = 5.0
+VELIKOST_CACHE = 128
+
+# hranice košů histogramu latence v sekundách (poslední koš je +Inf)
+KOSE_LATENCE = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# dotazy delší než tento počet sekund se zapíšou do logu pomalých dotazů
+PRAH_POMALEHO_DOTAZU = 0.1
+VELIKOST_LOGU_POMALYCH = 100
+
+# výchozí parametry zápisu na pozadí: nejvýše tolik úkolů v jednom potvrzení,
+# nejdéle tolik sekund čekání zápisu ve frontě a nejvýše tolik úkolů ve frontě
+VELIKOST_SKUPINY_ZAPISU = 500
+INTERVAL_ZAPISU = 0.05
+MAX_FRONTA_ZAPISU = 10000
+
+# archivace hotových úkolů: výchozí minimální stáří úkolu ve dnech a počet
+# úkolů přesunutých jednou transakcí
+STARI_ARCHIVACE_DNU = 30
+VELIKOST_DAVKY_ARCHIVACE = 500
+
+# výchozí parametry poolu spojení
+VELIKOST_POOLU = 5
+MAX_NECINNOST_SPOJENI = 300.0
+CEKANI_NA_SPOJENI = 10.0
+
+# repliky pro čtení: kolik sekund po zápisu se čte z primárního úložiště (aby byl
+# zápis vidět i při zpoždění replikace) a na kolik sekund se vynechá replika,
+# ke které se nepodařilo připojit
+CTENI_PO_ZAPISU = 5.0
+PAUZA_REPLIKY = 30.0
+
+# sledování změn: po kolika sekundách se verze zápisu, který se dosud nepotvrdil,
+# považuje za zrušenou (zápis trvající déle se může sledování změn ztratit)
+MAX_TRVANI_ZAPISU = 60.0
+# po kolika přidělených verzích se z tabulky verze_zapisu odstraní řádky,
+# které už sledování změn nepotřebuje
+PROCISTIT_PO_VERZICH = 1000
+
+
+# -----------------------------------
+# Záznamy úkolů
+# -----------------------------------
+
+
+class _Zaznam(tuple):
+    """
+    Neměnný řádek výsledku jako n-tice se sloupci podle SLOUPCE. Hodnoty jsou
+    dostupné jako atributy (ukol.nazev) i podle názvu sloupce (ukol["nazev"]),
+    takže kód psaný pro slovníky funguje dál, ale řádek neopakuje názvy
+    sloupců a nemá vlastní __dict__.
+    """
+
+    __slots__ = ()
+    SLOUPCE = ()
+
+    def __init_subclass__(cls, **parametry):
+        super().__init_subclass__(**parametry)
+        cls._pozice = {sloupec: poradi for poradi, sloupec in enumerate(cls.SLOUPCE)}
+        for poradi, sloupec in enumerate(cls.SLOUPCE):
+            setattr(cls, sloupec, property(itemgetter(poradi)))
+
+    def __getitem__(self, klic):
+        if isinstance(klic, str):
+            try:
+                klic = self._pozice[klic]
+            except KeyError:
+                raise KeyError(klic) from None
+        return tuple.__getitem__(self, klic)
+
+    def get(self, klic, vychozi=None):
+        poradi = self._pozice.get(klic)
+        return vychozi if poradi is None else tuple.__getitem__(self, poradi)
+
+    def keys(self):
+        return self.SLOUPCE
+
+    def jako_slovnik(self):
+        """Vrátí záznam jako slovník sloupec -> hodnota (např. pro JSON)."""
+        return dict(zip(self.SLOUPCE, self))
+
+    def __repr__(self):
+        hodnoty = ", ".join(f"{sloupec}={hodnota!r}" for sloupec, hodnota in zip(self.SLOUPCE, self))
+        return f"{type(self).__name__}({hodnoty})"
+
+
+class Ukol(_Zaznam):
+    """Úkol z databáze: (id, nazev, popis, stav)."""
+
+    __slots__ = ()
+    SLOUPCE = ("id", "nazev", "popis", "stav")
+
+
+class NalezenyUkol(Ukol):
+    """Výsledek hledání: úkol a jeho relevance 'skore'."""
+
+    __slots__ = ()
+    SLOUPCE = Ukol.SLOUPCE + ("skore",)
+
+
+class ZmenenyUkol(Ukol):
+    """Úkol ze sledování změn i s verzí poslední změny a verzí vložení."""
+
+    __slots__ = ()
+    SLOUPCE = Ukol.SLOUPCE + ("verze", "verze_vlozeni")
+
+
+# -----------------------------------
+# Úložiště
+# -----------------------------------
+
+
+def _ovladac_mysql():
+    """Načte ovladač MySQL (jen poprvé)."""
+    import mysql.connector
+
+    return mysql.connector
+
+
+def _prevadet_chyby(funkce, chyba_ovladace):
+    """Obalí metodu ovladače MySQL tak, aby jeho chyby vyvolávala jako ChybaMySQL."""
+
+    def obal(*args, **kwargs):
+        try:
+            return funkce(*args, **kwargs)
+        except chyba_ovladace as chyba:
+            raise ChybaMySQL(chyba) from chyba
+
+    return obal
+
+
+class _ObalMySQL:
+    """Spojení nebo kurzor ovladače MySQL, jehož metody vyvolávají ChybaMySQL."""
+
+    def __init__(self, objekt, chyba_ovladace):
+        self._objekt = objekt
+        self._chyba_ovladace = chyba_ovladace
+
+    def __getattr__(self, jmeno):
+        hodnota = getattr(self._objekt, jmeno)
+        if callable(hodnota):
+            return _prevadet_chyby(hodnota, self._chyba_ovladace)
+        return hodnota
+
+
+class _KurzorMySQL(_ObalMySQL):
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+
+class _SpojeniMySQL(_ObalMySQL):
+    def cursor(self, *args, **kwargs):
+        kurzor = _prevadet_chyby(self._objekt.cursor, self._chyba_ovladace)(*args, **kwargs)
+        return _KurzorMySQL(kurzor, self._chyba_ovladace)
+
+
+def _pripojit_mysql(**nastaveni):
+    """Otevře spojení s MySQL; chyby ovladače vyvolá jako ChybaMySQL."""
+    ovladac = _ovladac_mysql()
+    try:
+        return _SpojeniMySQL(ovladac.connect(**nastaveni), ovladac.Error)
+    except ovladac.Error as chyba:
+        raise ChybaMySQL(chyba) from chyba
+
+
+def _adresa_mysql(adresa):
+    """Převede adresu 'host' nebo 'host:port' na parametry připojení."""
+    host, _, port = adresa.strip().partition(":")
+    return {"host": host, "port": int(port)} if port else {"host": host}
+
+
+def _pole_tsv(hodnota):
+    """Zapíše hodnotu jako pole TSV s escapováním, které čte LOAD DATA INFILE."""
+    return (
+        str(hodnota)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+        .replace("\0", "\\0")
+    )
+
+
+class UlozisteMySQL:
+    """
+    Úložiště úkolů v databázi MySQL (výchozí).
+
+    Parametry:
+        nastaveni: přihlašovací údaje, které přepíší hodnoty z NASTAVENI_DATABAZE
+            (např. database="ukoly_db_test").
+    """
+
+    nazev = "mysql"
+    # přípona SELECTu, která zamkne nalezené řádky do konce transakce
+    pro_upravu = " FOR UPDATE"
+    vlozit_nebo_ignorovat = "INSERT IGNORE"
+    # hodnota sloupce {sloupec} je starší než %s sekund
+    podminka_stari = "{sloupec} < NOW() - INTERVAL %s SECOND"
+
+    def __init__(self, **nastaveni):
+        self.nastaveni = {**NASTAVENI_DATABAZE, **nastaveni}
+
+    def pripojit(self, **volby):
+        """Otevře nové spojení, při chybě vypíše hlášení a vrátí None."""
+        try:
+            return _pripojit_mysql(**self.nastaveni, **volby)
+        except ChybaDatabaze as chyba:
+            _nahlasit_chybu("Chyba při připojení k databázi", chyba)
+            return None
+
+    def pripojit_pro_import(self):
+        """Otevře spojení, které smí posílat soubory příkazem LOAD DATA LOCAL INFILE."""
+        return self.pripojit(allow_local_infile=True)
+
+    def replika(self, adresa):
+        """
+        Vrátí úložiště repliky na adrese 'host' nebo 'host:port'. Přihlašovací
+        údaje, databáze i port (není-li v adrese) zůstávají stejné jako zde.
+        """
+        return UlozisteMySQL(**{**self.nastaveni, **_adresa_mysql(adresa)})
+
+    def lze_nacist_soubor(self, kurzor):
+        # klient soubory povoluje v pripojit_pro_import(), server proměnnou local_infile
+        kurzor.execute("SELECT @@GLOBAL.local_infile")
+        return bool(kurzor.fetchone()[0])
+
+    def nacist_soubor(self, kurzor, radky):
+        """
+        Vloží řádky (nazev, popis, stav, verze, verze_vlozeni) do tabulky ukoly
+        příkazem LOAD DATA LOCAL INFILE přes dočasný soubor TSV.
+        """
+        import tempfile
+
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", newline="", suffix=".tsv", delete=False
+        ) as soubor:
+            for radek in radky:
+                soubor.write("\t".join(_pole_tsv(hodnota) for hodnota in radek) + "\n")
+        try:
+            kurzor.execute(
+                "LOAD DATA LOCAL INFILE %s INTO TABLE ukoly CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+                "(nazev, popis, stav, verze, verze_vlozeni)",
+                (soubor.name,),
+            )
+        finally:
+            os.remove(soubor.name)
+
+    def _prikaz_serveru(self, prikaz):
+        # spojení bez zvolené databáze, aby šla databáze založit i odstranit
+        nastaveni = {k: v for k, v in self.nastaveni.items() if k != "database"}
+        try:
+            spojeni = _pripojit_mysql(**nastaveni)
+        except ChybaDatabaze as chyba:
+            _nahlasit_chybu("Chyba při připojení k databázi", chyba)
+            return False
+        try:
+            kurzor = spojeni.cursor()
+            kurzor.execute(prikaz)
+            kurzor.close()
+            return True
+        except ChybaDatabaze as chyba:
+            _nahlasit_chybu("Chyba při správě databáze", chyba)
+            return False
+        finally:
+            spojeni.close()
+
+    def vytvorit_databazi(self):
+        """Založí databázi z nastavení, pokud ještě neexistuje."""
+        return self._prikaz_serveru(f"CREATE DATABASE IF NOT EXISTS `{self.nastaveni['database']}`")
+
+    def odstranit_databazi(self):
+        """Odstraní databázi z nastavení i se všemi tabulkami."""
+        return self._prikaz_serveru(f"DROP DATABASE IF EXISTS `{self.nastaveni['database']}`")
+
+    def vytvorit_tabulku_ukoly(self, kurzor):
+        kurzor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ukoly (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                nazev VARCHAR(255) NOT NULL,
+                popis TEXT,
+                stav ENUM('nezahájeno', 'hotovo', 'probíhá') NOT NULL,
+                datum_vytvoreni TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+
+    def vytvorit_tabulku_verzi(self, kurzor):
+        # AUTO_INCREMENT přiděluje hodnoty bez zámku drženého do konce transakce
+        # (innodb_autoinc_lock_mode = 2, výchozí od MySQL 8.0)
+        kurzor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS verze_zapisu (
+                verze BIGINT AUTO_INCREMENT PRIMARY KEY,
+                zapsano TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+
+    def tabulka_existuje(self, kurzor, tabulka):
+        kurzor.execute(
+            "SELECT COUNT(*) FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = %s",
+            (tabulka,),
+        )
+        return kurzor.fetchone()[0] > 0
+
+    def index_existuje(self, kurzor, tabulka, index):
+        kurzor.execute(
+            "SELECT COUNT(*) FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+            (tabulka, index),
+        )
+        return kurzor.fetchone()[0] > 0
+
+    def sloupec_existuje(self, kurzor, tabulka, sloupec):
+        kurzor.execute(
+            "SELECT COUNT(*) FROM information_schema.columns "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s",
+            (tabulka, sloupec),
+        )
+        return kurzor.fetchone()[0] > 0
+
+    def vytvorit_fulltext(self, kurzor):
+        if not self.index_existuje(kurzor, "ukoly", "idx_ukoly_fulltext"):
+            kurzor.execute("ALTER TABLE ukoly ADD FULLTEXT INDEX idx_ukoly_fulltext (nazev, popis)")
+
+    def dotaz_hledani(self, slova, podminka_stavu):
+        """Vrátí SQL a jeho první parametry pro hledání v indexu FULLTEXT seřazené podle relevance."""
+        shoda = "MATCH (nazev, popis) AGAINST (%s IN NATURAL LANGUAGE MODE)"
+        text = " ".join(slova)
+        return (
+            f"SELECT id, nazev, popis, stav, {shoda} AS skore FROM ukoly "
+            f"WHERE {shoda}{podminka_stavu} ORDER BY skore DESC, id LIMIT %s OFFSET %s",
+            [text, text],
+        )
+
+    def prvni_vlozene_id(self, kurzor, pocet):
+        # víceřádkový INSERT dostane od InnoDB souvislý blok ID a lastrowid
+        # vrací první z nich
+        return kurzor.lastrowid
+
+    def vysvetlit(self, pripojeni, dotaz):
+        """Vrátí plán dotazu jako seznam řádků textu."""
+        kurzor = pripojeni.cursor(dictionary=True)
+        try:
+            kurzor.execute(f"EXPLAIN {dotaz}")
+            return [
+                f"type={radek['type']} key={radek['key']} "
+                f"rows={radek['rows']} extra={radek['Extra']}"
+                for radek in kurzor.fetchall()
+            ]
+        finally:
+            kurzor.close()
+
+
+class _KurzorSQLite(sqlite3.Cursor):
+    """Kurzor SQLite přijímající zástupné znaky '%s' jako MySQL."""
+
+    def execute(self, dotaz, parametry=()):
+        return super().execute(dotaz.replace("%s", "?"), parametry)
+
+    def executemany(self, dotaz, seznam_parametru):
+        return super().executemany(dotaz.replace("%s", "?"), seznam_parametru)
+
+
+def _radek_jako_slovnik(kurzor, radek):
+    return {sloupec[0]: hodnota for sloupec, hodnota in zip(kurzor.description, radek)}
+
+
+class _SpojeniSQLite(sqlite3.Connection):
+    """
+    Spojení SQLite s rozhraním, které funkce modulu používají u MySQL:
+    cursor(dictionary=..., buffered=..., prepared=...), is_connected(), start_transaction()
+    a consume_results().
+    """
+
+    def cursor(self, dictionary=False, buffered=None, prepared=False):
+        # SQLite čte řádky vždy postupně, 'buffered' tedy nemá vliv; přeložené
+        # dotazy si spojení ukládá samo (cached_statements), 'prepared' také ne
+        kurzor = super().cursor(_KurzorSQLite)
+        if dictionary:
+            kurzor.row_factory = _radek_jako_slovnik
+        return kurzor
+
+    def is_connected(self):
+        try:
+            self.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def start_transaction(self):
+        self.execute("BEGIN")
+
+    def consume_results(self):
+        pass
+
+
+class UlozisteSQLite:
+    """
+    Vestavěné úložiště úkolů v SQLite, v souboru nebo jen v paměti.
+    Stav úkolu hlídá omezení CHECK se stejnými hodnotami jako ENUM v MySQL.
+
+    Parametry:
+        soubor (str): cesta k souboru databáze, nebo ':memory:' pro dočasnou
+            databázi sdílenou všemi spojeními tohoto úložiště, která zanikne
+            spolu s úložištěm.
+    """
+
+    nazev = "sqlite"
+    # SQLite zamyká při zápisu celou databázi, zámek řádků nepotřebuje
+    pro_upravu = ""
+    vlozit_nebo_ignorovat = "INSERT OR IGNORE"
+    # CURRENT_TIMESTAMP i datetime('now') jsou v SQLite obojí v UTC
+    podminka_stari = "{sloupec} < datetime('now', '-' || %s || ' seconds')"
+
+    def __init__(self, soubor=":memory:"):
+        self.soubor = soubor
+        # dočasný soubor databáze ':memory:' vzniká až s prvním spojením
+        self._adresa = None if soubor == ":memory:" else soubor
+
+    def pripojit(self):
+        """Otevře nové spojení, při chybě vypíše hlášení a vrátí None."""
+        try:
+            if self._adresa is None:
+                self._adresa = self._docasny_soubor()
+            return self._otevrit()
+        except sqlite3.Error as chyba:
+            _nahlasit_chybu("Chyba při připojení k databázi", chyba)
+            return None
+
+    def pripojit_pro_import(self):
+        return self.pripojit()
+
+    def replika(self, adresa):
+        # SQLite se nereplikuje sama; replikou je jiný soubor databáze, který
+        # plní vnější nástroj (nebo test)
+        return UlozisteSQLite(adresa.strip())
+
+    def lze_nacist_soubor(self, kurzor):
+        # SQLite nemá obdobu LOAD DATA, import vkládá po dávkách přes executemany
+        return False
+
+    def _docasny_soubor(self):
+        # Sdílená cache v paměti zamyká celé tabulky, takže čtení by čekalo
+        # na cizí nepotvrzené transakce nebo je (s read_uncommitted) vidělo.
+        # Databáze ':memory:' je proto dočasný soubor ve WAL jako ostatní:
+        # čtenáři vidí jen potvrzená data a zápis neblokují. Adresář se
+        # smaže, až úložiště zanikne.
+        import shutil
+        import tempfile
+        import weakref
+
+        adresar = tempfile.mkdtemp(prefix="paty_projekt_")
+        weakref.finalize(self, shutil.rmtree, adresar, True)
+        return os.path.join(adresar, "ukoly.db")
+
+    def _otevrit(self):
+        spojeni = sqlite3.connect(
+            self._adresa,
+            timeout=CEKANI_NA_SPOJENI,
+            check_same_thread=False,
+            factory=_SpojeniSQLite,
+        )
+        spojeni.execute("PRAGMA journal_mode = WAL")
+        if self.soubor == ":memory:":
+            # obsah dočasné databáze nepřežije úložiště, zápis na disk se nečeká
+            spojeni.execute("PRAGMA synchronous = OFF")
+        return spojeni
+
+    def vytvorit_tabulku_ukoly(self, kurzor):
+        kurzor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ukoly (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                nazev VARCHAR(255) NOT NULL,
+                popis TEXT,
+                stav TEXT NOT NULL CHECK (stav IN ('nezahájeno', 'hotovo', 'probíhá')),
+                datum_vytvoreni TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+
+    def vytvorit_tabulku_verzi(self, kurzor):
+        # AUTOINCREMENT, aby se verze nepřidělila znovu ani po smazání nejvyššího řádku
+        kurzor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS verze_zapisu (
+                verze INTEGER PRIMARY KEY AUTOINCREMENT,
+                zapsano TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+
+    def tabulka_existuje(self, kurzor, tabulka):
+        kurzor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = %s",
+            (tabulka,),
+        )
+        return kurzor.fetchone()[0] > 0
+
+    def index_existuje(self, kurzor, tabulka, index):
+        kurzor.execute(
+            "SELECT COUNT(*) FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = %s AND name = %s",
+            (tabulka, index),
+        )
+        return kurzor.fetchone()[0] > 0
+
+    def sloupec_existuje(self, kurzor, tabulka, sloupec):
+        kurzor.execute(f"PRAGMA table_info({tabulka})")
+        return any(radek[1] == sloupec for radek in kurzor.fetchall())
+
+    def vytvorit_fulltext(self, kurzor):
+        # invertovaný index FTS5 nad tabulkou ukoly; obsah se nekopíruje,
+        # index drží aktuální spouště při každém zápisu názvu nebo popisu
+        if self.tabulka_existuje(kurzor, "ukoly_fts"):
+            return
+        kurzor.execute(
+            "CREATE VIRTUAL TABLE ukoly_fts USING fts5(nazev, popis, content='ukoly', "
+            "content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+        kurzor.execute(
+            "CREATE TRIGGER ukoly_fts_vlozeni AFTER INSERT ON ukoly BEGIN "
+            "INSERT INTO ukoly_fts (rowid, nazev, popis) VALUES (new.id, new.nazev, new.popis); END"
+        )
+        kurzor.execute(
+            "CREATE TRIGGER ukoly_fts_odstraneni AFTER DELETE ON ukoly BEGIN "
+            "INSERT INTO ukoly_fts (ukoly_fts, rowid, nazev, popis) "
+            "VALUES ('delete', old.id, old.nazev, old.popis); END"
+        )
+        kurzor.execute(
+            "CREATE TRIGGER ukoly_fts_uprava AFTER UPDATE OF nazev, popis ON ukoly BEGIN "
+            "INSERT INTO ukoly_fts (ukoly_fts, rowid, nazev, popis) "
+            "VALUES ('delete', old.id, old.nazev, old.popis); "
+            "INSERT INTO ukoly_fts (rowid, nazev, popis) VALUES (new.id, new.nazev, new.popis); END"
+        )
+        kurzor.execute("INSERT INTO ukoly_fts (ukoly_fts) VALUES ('rebuild')")
+
+    def dotaz_hledani(self, slova, podminka_stavu):
+        """Vrátí SQL a jeho první parametry pro hledání v indexu FTS5 seřazené podle relevance."""
+        # slova v uvozovkách spojená OR odpovídají přirozenému hledání v MySQL
+        vyraz = " OR ".join(f'"{slovo}"' for slovo in slova)
+        return (
+            "SELECT ukoly.id, ukoly.nazev, ukoly.popis, ukoly.stav, -bm25(ukoly_fts) AS skore "
+            "FROM ukoly_fts JOIN ukoly ON ukoly.id = ukoly_fts.rowid "
+            f"WHERE ukoly_fts MATCH %s{podminka_stavu} "
+            "ORDER BY skore DESC, ukoly.id LIMIT %s OFFSET %s",
+            [vyraz],
+        )
+
+    def prvni_vlozene_id(self, kurzor, pocet):
+        # executemany v SQLite lastrowid nenastavuje; během transakce zapisuje
+        # jen toto spojení, takže ID vložených řádků jdou souvisle za sebou
+        kurzor.execute("SELECT last_insert_rowid()")
+        return kurzor.fetchone()[0] - pocet + 1
+
+    def vysvetlit(self, pripojeni, dotaz):
+        """Vrátí plán dotazu jako seznam řádků textu."""
+        kurzor = pripojeni.cursor(dictionary=True)
+        try:
+            kurzor.execute(f"EXPLAIN QUERY PLAN {dotaz}")
+            return [radek["detail"] for radek in kurzor.fetchall()]
+        finally:
+            kurzor.close()
+
+
+def vytvorit_uloziste(druh=None, **parametry):
+    """
+    Vytvoří úložiště podle názvu.
+
+    Parametry:
+        druh (str): 'mysql' nebo 'sqlite'; bez zadání se použije proměnná
+            prostředí PATY_ULOZISTE (výchozí 'mysql').
+        parametry: předají se konstruktoru úložiště. U SQLite se bez zadání
+            souboru použije proměnná PATY_SQLITE_SOUBOR (výchozí ':memory:'),
+            u MySQL adresa serveru z proměnné PATY_MYSQL_ADRESA ('host[:port]').
+
+    Návratová hodnota:
+        UlozisteMySQL nebo UlozisteSQLite.
+    """
+    druh = (druh or os.environ.get("PATY_ULOZISTE", "mysql")).lower()
+    if druh == "mysql":
+        if os.environ.get("PATY_MYSQL_ADRESA"):
+            parametry = {**_adresa_mysql(os.environ["PATY_MYSQL_ADRESA"]), **parametry}
+        return UlozisteMySQL(**parametry)
+    if druh == "sqlite":
+        parametry.setdefault("soubor", os.environ.get("PATY_SQLITE_SOUBOR", ":memory:"))
+        return UlozisteSQLite(**parametry)
+    raise ValueError(f"Neznámé úložiště: {druh}")
+
+
+_uloziste = vytvorit_uloziste()
+
+
+def nastavit_uloziste(uloziste):
+    """
+    Přepne všechny funkce modulu na dané úložiště.
+    Dokončí zápisy na pozadí, vytvoří nový pool spojení, zruší repliky pro
+    čtení (patřily původnímu úložišti) a vyprázdní cache čtení.
+
+    Parametry:
+        uloziste: UlozisteMySQL, UlozisteSQLite nebo název pro vytvorit_uloziste().
+
+    Návratová hodnota:
+        nastavené úložiště.
+    """
+    global _uloziste
+    if isinstance(uloziste, str):
+        uloziste = vytvorit_uloziste(uloziste)
+    # úkoly čekající na zápis na pozadí patří do původního úložiště
+    vyprazdnit_zapisy()
+    _uloziste = uloziste
+    if _pool is None:
+        nastavit_pool()
+    else:
+        nastavit_pool(_pool.velikost, _pool.max_necinnost, _pool.cekani)
+    nastavit_repliky()
+    return _uloziste
+
+
+def ziskat_uloziste():
+    """Vrátí právě používané úložiště."""
+    return _uloziste
+
+
+# vytvoření připojení databáze
+def pripojeni_k_databazi():
+    """
+    Připojí se k databázi 'ukoly_db' v nastaveném úložišti (výchozí je MySQL
+    na lokálním serveru s danými přihlašovacími údaji).
+
+    Návratová hodnota:
+       Pokud je připojení úspěšné, vypíše hlášení o úspěchu a vrátí objekt spojení.
+       Pokud dojde k chybě, vypíše chybové hlášení a vrátí None.
+    """
+
+    pripojeni = _uloziste.pripojit()
+    if pripojeni and pripojeni.is_connected():
+        print("Úspěšně připojeno k databázi\n")
+        return pripojeni
+    return None
+
+
+def _nove_spojeni():
+    """Otevře nové spojení pro pool bez výpisu hlášení o úspěchu.
+
+    Návratová hodnota:
+        Objekt spojení, nebo None pokud se připojení nezdaří.
+    """
+    return _uloziste.pripojit()
+
+
+class _PujceneSpojeni:
+    """Spojení zapůjčené z poolu.
+
+    Chová se jako běžné spojení, ale metoda close() ho místo zavření
+    vrátí zpět do poolu.
+    """
+
+    def __init__(self, pool, spojeni):
+        self._pool = pool
+        self._spojeni = spojeni
+
+    def __getattr__(self, jmeno):
+        return getattr(self._spojeni, jmeno)
+
+    def cursor(self, *args, **kwargs):
+        # dotazy přes spojení z poolu se měří, viz MetrikyDotazu
+        return _MerenyKurzor(self._spojeni.cursor(*args, **kwargs), _aktualni_operace())
+
+    def pripraveny(self, dotaz):
+        """
+        Vrátí kurzor s dotazem připraveným na tomto spojení.
+        Kurzor zůstává spojení i po vrácení do poolu, takže se každý dotaz
+        připraví jen jednou za život spojení (viz _PripravenyKurzor).
+        """
+        pripravene = getattr(self._spojeni, "_pripravene", None)
+        if pripravene is None:
+            pripravene = self._spojeni._pripravene = {}
+        kurzor = pripravene.get(dotaz)
+        if kurzor is None:
+            kurzor = pripravene[dotaz] = self._spojeni.cursor(prepared=True)
+        return _PripravenyKurzor(kurzor, _aktualni_operace(), self._spojeni, dotaz)
+
+    def commit(self):
+        self._spojeni.commit()
+        if self._pool is _pool:
+            # potvrzený zápis do primárního úložiště, viz SmerovacCteni
+            _zaznamenat_zapis()
+
+    def close(self):
+        if self._spojeni is not None:
+            self._pool.vratit(self._spojeni)
+            self._spojeni = None
+
+    def zahodit(self):
+        """Zavře spojení natrvalo místo vrácení do poolu."""
+        if self._spojeni is not None:
+            self._pool.zahodit(self._spojeni)
+            self._spojeni = None
+
+
+class PoolPripojeni:
+    """
+    Pool spojení s databází sdílený celým procesem.
+
+    Při zapůjčení ověří, že je spojení stále živé (jinak ho nahradí novým),
+    a spojení nečinná déle než 'max_necinnost' sekund průběžně zavírá.
+
+    Parametry:
+        tovarna: funkce bez parametrů vracející nové spojení nebo None.
+        velikost (int): maximální počet současně otevřených spojení.
+        max_necinnost (float): po kolika sekundách nečinnosti se spojení zavře.
+        cekani (float): jak dlouho čekat na volné spojení, když je pool vyčerpán.
+    """
+
+    def __init__(
+        self,
+        tovarna,
+        velikost=VELIKOST_POOLU,
+        max_necinnost=MAX_NECINNOST_SPOJENI,
+        cekani=CEKANI_NA_SPOJENI,
+    ):
+        if velikost < 1:
+            raise ValueError("Velikost poolu musí být alespoň 1.")
+        self._tovarna = tovarna
+        self.velikost = velikost
+        self.max_necinnost = max_necinnost
+        self.cekani = cekani
+        self._volna = deque()  # dvojice (spojeni, cas_vraceni), nejstarší vlevo
+        self._pujceno = 0
+        self._podminka = threading.Condition()
+
+    def ziskat(self, cekani=None):
+        """Zapůjčí spojení z poolu, případně otevře nové.
+
+        Parametry:
+            cekani (float): jak dlouho čekat na volné spojení; výchozí je
+                'cekani' poolu, 0 znamená nečekat.
+
+        Návratová hodnota:
+            Zapůjčené spojení, nebo None pokud se nelze připojit
+            nebo se volné spojení neuvolní do 'cekani' sekund.
+        """
+        spojeni, _ = self._zapujcit(self.cekani if cekani is None else cekani)
+        return spojeni
+
+    def _zapujcit(self, cekani):
+        # vrací dvojici (spojení nebo None, True pokud se nepodařilo připojit),
+        # aby volající rozlišil nedostupnou databázi od vyčerpaného poolu
+        konec = time.monotonic() + cekani
+        spojeni = None
+        with self._podminka:
+            while True:
+                necinna = self._odebrat_necinna()
+                if self._volna:
+                    spojeni, _ = self._volna.pop()
+                    self._pujceno += 1
+                    break
+                if self._pujceno < self.velikost:
+                    self._pujceno += 1
+                    break
+                zbyva = konec - time.monotonic()
+                if zbyva <= 0:
+                    self._zavrit(necinna)
+                    return None, False
+                self._podminka.wait(zbyva)
+        self._zavrit(necinna)
+
+        if spojeni is not None and not self._je_zdrave(spojeni):
+            self._zavrit([spojeni])
+            spojeni = None
+        if spojeni is None:
+            spojeni = self._tovarna()
+        if spojeni is None:
+            self._uvolnit_misto()
+            return None, True
+        return _PujceneSpojeni(self, spojeni), False
+
+    def vratit(self, spojeni):
+        """Vrátí spojení do poolu; rozpracovanou transakci odvolá."""
+        try:
+            if getattr(spojeni, "in_transaction", False):
+                spojeni.rollback()
+        except ChybaDatabaze:
+            self.zahodit(spojeni)
+            return
+        with self._podminka:
+            self._volna.append((spojeni, time.monotonic()))
+            self._pujceno -= 1
+            self._podminka.notify()
+
+    def zahodit(self, spojeni):
+        """Zavře zapůjčené spojení, které už nelze vrátit do poolu."""
+        self._zavrit([spojeni])
+        self._uvolnit_misto()
+
+    def zavrit_vse(self):
+        """Zavře všechna nečinná spojení v poolu."""
+        with self._podminka:
+            necinna = [spojeni for spojeni, _ in self._volna]
+            self._volna.clear()
+        self._zavrit(necinna)
+
+    def pocet_volnych(self):
+        """Vrátí počet nečinných spojení čekajících v poolu."""
+        with self._podminka:
+            return len(self._volna)
+
+    def _odebrat_necinna(self):
+        # volá se se získaným zámkem, spojení zavírá až volající mimo zámek
+        hranice = time.monotonic() - self.max_necinnost
+        necinna = []
+        while self._volna and self._volna[0][1] < hranice:
+            necinna.append(self._volna.popleft()[0])
+        return necinna
+
+    def _uvolnit_misto(self):
+        with self._podminka:
+            self._pujceno -= 1
+            self._podminka.notify()
+
+    @staticmethod
+    def _je_zdrave(spojeni):
+        try:
+            return spojeni.is_connected()
+        except ChybaDatabaze:
+            return False
+
+    @staticmethod
+    def _zavrit(spojeni_k_zavreni):
+        for spojeni in spojeni_k_zavreni:
+            try:
+                spojeni.close()
+            except ChybaDatabaze:
+                pass
+
+
+_pool = None
+_zamek_poolu = threading.Lock()
+
+
+def nastavit_pool(
+    velikost=VELIKOST_POOLU,
+    max_necinnost=MAX_NECINNOST_SPOJENI,
+    cekani=CEKANI_NA_SPOJENI,
+    tovarna=None,
+):
+    """
+    Vytvoří nový sdílený pool spojení s danými parametry.
+    Nečinná spojení předchozího poolu zavře.
+
+    Návratová hodnota:
+        PoolPripojeni: nově nastavený pool.
+    """
+    global _pool
+    with _zamek_poolu:
+        stary = _pool
+        _pool = PoolPripojeni(
+            tovarna or _nove_spojeni,
+            velikost=velikost,
+            max_necinnost=max_necinnost,
+            cekani=cekani,
+        )
+    if stary is not None:
+        stary.zavrit_vse()
+    return _pool
+
+
+def ziskat_pool():
+    """Vrátí sdílený pool spojení, při prvním volání ho vytvoří."""
+    global _pool
+    with _zamek_poolu:
+        if _pool is None:
+            _pool = PoolPripojeni(_nove_spojeni)
+        return _pool
+
+
+def ziskat_pripojeni():
+    """
+    Zapůjčí spojení ze sdíleného poolu.
+    Zavoláním close() na vráceném objektu se spojení vrátí do poolu.
+
+    Návratová hodnota:
+        Zapůjčené spojení, nebo None pokud se nelze připojit.
+    """
+    zacatek = time.perf_counter()
+    spojeni = ziskat_pool().ziskat()
+    _metriky.zaznamenat_ziskani(_aktualni_operace(), time.perf_counter() - zacatek)
+    return spojeni
+
+
+# -----------------------------------
+# Repliky pro čtení
+# -----------------------------------
+
+# čas (time.monotonic) posledního potvrzeného zápisu do primárního úložiště
+_posledni_zapis = float("-inf")
+
+
+def _zaznamenat_zapis():
+    global _posledni_zapis
+    _posledni_zapis = time.monotonic()
+
+
+class SmerovacCteni:
+    """
+    Rozděluje čtení mezi repliky primárního úložiště.
+
+    Repliky se střídají dokola a každá má vlastní pool spojení. Do
+    'cteni_po_zapisu' sekund po posledním zápisu se čte z primárního úložiště,
+    aby volající viděl i vlastní zápisy, které replika ještě nemá. Replika,
+    ke které se nelze připojit, se na 'pauza' sekund vynechá. Na volné spojení
+    vyčerpaného poolu repliky se nečeká a replika se kvůli tomu nevynechává,
+    jen se zkusí další. Není-li volná žádná, čte se z primárního úložiště.
+
+    Parametry:
+        repliky: seznam úložišť replik (UlozisteMySQL, UlozisteSQLite).
+        cteni_po_zapisu (float): jak dlouho po zápisu číst z primárního úložiště.
+        pauza (float): na jak dlouho vynechat nedostupnou repliku.
+        pool: PoolPripojeni, podle kterého se nastaví pooly replik.
+    """
+
+    def __init__(self, repliky, cteni_po_zapisu=CTENI_PO_ZAPISU, pauza=PAUZA_REPLIKY, pool=None):
+        if not repliky:
+            raise ValueError("Směrovač čtení potřebuje alespoň jednu repliku.")
+        pool = pool or ziskat_pool()
+        self.repliky = list(repliky)
+        self.cteni_po_zapisu = cteni_po_zapisu
+        self.pauza = pauza
+        self._pooly = [
+            PoolPripojeni(
+                replika.pripojit,
+                velikost=pool.velikost,
+                max_necinnost=pool.max_necinnost,
+                cekani=pool.cekani,
+            )
+            for replika in self.repliky
+        ]
+        self._nedostupna_do = [0.0] * len(self.repliky)
+        self._cteni = [0] * len(self.repliky)
+        self._z_primarniho = 0
+        self._dalsi = 0
+        self._zamek = threading.Lock()
+
+    def ziskat(self):
+        """Zapůjčí spojení s replikou.
+
+        Návratová hodnota:
+            Zapůjčené spojení, nebo None, pokud se má číst z primárního úložiště.
+        """
+        ted = time.monotonic()
+        if ted - _posledni_zapis < self.cteni_po_zapisu:
+            return self._z_primarniho_uloziste()
+        with self._zamek:
+            prvni = self._dalsi
+            self._dalsi = (prvni + 1) % len(self._pooly)
+            nedostupne = [nedostupna_do > ted for nedostupna_do in self._nedostupna_do]
+        for posun in range(len(self._pooly)):
+            index = (prvni + posun) % len(self._pooly)
+            if nedostupne[index]:
+                continue
+            spojeni, chyba_pripojeni = self._pooly[index]._zapujcit(0)
+            if spojeni is not None:
+                with self._zamek:
+                    self._cteni[index] += 1
+                return spojeni
+            if chyba_pripojeni:
+                with self._zamek:
+                    self._nedostupna_do[index] = time.monotonic() + self.pauza
+        return self._z_primarniho_uloziste()
+
+    def _z_primarniho_uloziste(self):
+        with self._zamek:
+            self._z_primarniho += 1
+        return None
+
+    def statistika(self):
+        """Vrátí počty čtení z jednotlivých replik a z primárního úložiště."""
+        ted = time.monotonic()
+        with self._zamek:
+            return {
+                "repliky": [
+                    {"cteni": cteni, "dostupna": nedostupna_do <= ted}
+                    for cteni, nedostupna_do in zip(self._cteni, self._nedostupna_do)
+                ],
+                "z_primarniho": self._z_primarniho,
+            }
+
+    def zavrit_vse(self):
+        """Zavře nečinná spojení všech replik."""
+        for pool in self._pooly:
+            pool.zavrit_vse()
+
+
+_smerovac_cteni = None
+
+
+def nastavit_repliky(repliky=(), cteni_po_zapisu=CTENI_PO_ZAPISU, pauza=PAUZA_REPLIKY):
+    """
+    Nastaví repliky, ze kterých budou číst čtecí funkce modulu.
+    Zápisy jdou vždy do primárního úložiště (viz nastavit_uloziste).
+    Bez replik se čte jen z primárního úložiště.
+
+    Parametry:
+        repliky: úložiště replik, nebo jejich adresy pro metodu replika()
+            primárního úložiště (u MySQL 'host[:port]', u SQLite soubor).
+        cteni_po_zapisu (float): jak dlouho po zápisu číst z primárního úložiště.
+        pauza (float): na jak dlouho vynechat repliku, ke které se nelze připojit.
+
+    Návratová hodnota:
+        SmerovacCteni, nebo None bez replik.
+    """
+    global _smerovac_cteni
+    repliky = [
+        _uloziste.replika(replika) if isinstance(replika, str) else replika
+        for replika in repliky
+    ]
+    stary = _smerovac_cteni
+    _smerovac_cteni = (
+        SmerovacCteni(repliky, cteni_po_zapisu=cteni_po_zapisu, pauza=pauza) if repliky else None
+    )
+    if stary is not None:
+        stary.zavrit_vse()
+    _cache.zneplatnit()
+    return _smerovac_cteni
+
+
+def statistika_replik():
+    """Vrátí počty čtení z replik a z primárního úložiště, nebo None bez replik."""
+    smerovac = _smerovac_cteni
+    return smerovac.statistika() if smerovac is not None else None
+
+
+def ziskat_pripojeni_pro_cteni():
+    """
+    Zapůjčí spojení pro čtecí funkce: s některou z replik, jsou-li nastavené,
+    jinak, krátce po zápisu nebo když žádná replika neodpovídá, s primárním
+    úložištěm (viz SmerovacCteni).
+
+    Návratová hodnota:
+        Zapůjčené spojení, nebo None pokud se nelze připojit.
+    """
+    smerovac = _smerovac_cteni
+    if smerovac is None:
+        return ziskat_pripojeni()
+    zacatek = time.perf_counter()
+    spojeni = smerovac.ziskat()
+    if spojeni is None:
+        return ziskat_pripojeni()
+    _metriky.zaznamenat_ziskani(_aktualni_operace(), time.perf_counter() - zacatek)
+    return spojeni
+
+
+@atexit.register
+def _zavrit_pool():
+    if _pool is not None:
+        _pool.zavrit_vse()
+    if _smerovac_cteni is not None:
+        _smerovac_cteni.zavrit_vse()
+
+
+@atexit.register
+def _ukoncit_zapis_na_pozadi():
+    # atexit volá funkce v opačném pořadí, fronta se tedy zapíše dřív,
+    # než se zavře pool
+    if _fronta_zapisu is not None:
+        nastavit_zapis_na_pozadi(False)
+
+
+class CacheUkolu:
+    """
+    Cache výsledků čtení úkolů s omezenou dobou platnosti (TTL)
+    a omezeným počtem položek (vyřazuje se nejdéle nepoužitá).
+
+    Každá položka si pamatuje rozsah ID, který pokrývá, aby zápis
+    zneplatnil jen položky, kterých se změněné úkoly týkají.
+    Vrácené hodnoty jsou sdílené a volající je nesmí měnit.
+
+    Parametry:
+        ttl (float): doba platnosti položky v sekundách.
+        max_polozek (int): maximální počet uložených výsledků.
+    """
+
+    def __init__(self, ttl=TTL_CACHE, max_polozek=VELIKOST_CACHE):
+        self.ttl = ttl
+        self.max_polozek = max_polozek
+        self.zasahy = 0
+        self.minuti = 0
+        self.generace = 0
+        self._polozky = OrderedDict()  # klic -> (cas_ulozeni, hodnota, rozsah)
+        self._zamek = threading.Lock()
+
+    def ziskat(self, klic):
+        """Vrátí dvojici (nalezeno, hodnota) pro daný klíč."""
+        with self._zamek:
+            polozka = self._polozky.get(klic)
+            if polozka is not None:
+                if time.monotonic() - polozka[0] < self.ttl:
+                    self._polozky.move_to_end(klic)
+                    self.zasahy += 1
+                    return True, polozka[1]
+                del self._polozky[klic]
+            self.minuti += 1
+            return False, None
+
+    def ulozit(self, klic, hodnota, rozsah, generace):
+        """
+        Uloží výsledek čtení.
+
+        Parametry:
+            rozsah: dvojice (od, do) pokrytých ID, kde 'od' je vyloučené a 'do'
+                může být None (bez horní meze); None znamená celou tabulku.
+            generace (int): hodnota atributu 'generace' před zahájením čtení;
+                pokud mezitím proběhl zápis, výsledek se neuloží.
+        """
+        with self._zamek:
+            if generace != self.generace:
+                return
+            self._polozky[klic] = (time.monotonic(), hodnota, rozsah)
+            self._polozky.move_to_end(klic)
+            while len(self._polozky) > self.max_polozek:
+                self._polozky.popitem(last=False)
+
+    def zneplatnit(self, seznam_id=None):
+        """Zahodí položky pokrývající některé z ID, při None zahodí vše."""
+        with self._zamek:
+            self.generace += 1
+            if seznam_id is None:
+                self._polozky.clear()
+                return
+            seznam_id = list(seznam_id)
+            for klic, (_, _, rozsah) in list(self._polozky.items()):
+                if rozsah is None or any(
+                    rozsah[0] < id_ukolu and (rozsah[1] is None or id_ukolu <= rozsah[1])
+                    for id_ukolu in seznam_id
+                ):
+                    del self._polozky[klic]
+
+    def statistika(self):
+        """Vrátí slovník s počtem zásahů, minutí a uložených položek."""
+        with self._zamek:
+            return {
+                "zasahy": self.zasahy,
+                "minuti": self.minuti,
+                "polozky": len(self._polozky),
+            }
+
+
+_cache = CacheUkolu()
+
+
+def nastavit_cache(ttl=TTL_CACHE, max_polozek=VELIKOST_CACHE):
+    """
+    Nahradí sdílenou cache čtení novou s danými parametry.
+    Hodnota ttl=0 cache fakticky vypne.
+
+    Návratová hodnota:
+        CacheUkolu: nově nastavená cache.
+    """
+    global _cache
+    _cache = CacheUkolu(ttl=ttl, max_polozek=max_polozek)
+    return _cache
+
+
+def statistika_cache():
+    """Vrátí počty zásahů a minutí sdílené cache čtení úkolů."""
+    return _cache.statistika()
+
+
+def _trida_chyby(chyba):
+    kod = getattr(chyba, "errno", None)
+    trida = getattr(chyba, "trida", None) or type(chyba).__name__
+    return f"{trida}:{kod}" if kod else trida
+
+
+def _normalizovat_dotaz(dotaz):
+    # seznamy zástupců různé délky (IN (%s, %s, ...)) patří k jednomu dotazu
+    dotaz = " ".join(dotaz.split())
+    return re.sub(r"IN \((%s|\?)(\s*,\s*(%s|\?))*\)", "IN (...)", dotaz)
+
+
+class _Histogram:
+    """Počty hodnot v koších KOSE_LATENCE, součet a počet (jako histogram Prometheus)."""
+
+    __slots__ = ("kose", "soucet", "pocet")
+
+    def __init__(self):
+        self.kose = [0] * (len(KOSE_LATENCE) + 1)
+        self.soucet = 0.0
+        self.pocet = 0
+
+    def pridat(self, hodnota):
+        index = 0
+        while index < len(KOSE_LATENCE) and hodnota > KOSE_LATENCE[index]:
+            index += 1
+        self.kose[index] += 1
+        self.soucet += hodnota
+        self.pocet += 1
+
+    def kumulativne(self):
+        """Vrátí dvojice (horní mez, počet hodnot <= mez), poslední mez je '+Inf'."""
+        vysledek = []
+        celkem = 0
+        for mez, pocet in zip((*KOSE_LATENCE, "+Inf"), self.kose):
+            celkem += pocet
+            vysledek.append((mez, celkem))
+        return vysledek
+
+    def slovnik(self):
+        return {
+            "pocet": self.pocet,
+            "soucet_s": self.soucet,
+            "prumer_ms": self.soucet / self.pocet * 1000 if self.pocet else None,
+            "kose": [[str(mez), pocet] for mez, pocet in self.kumulativne()],
+        }
+
+
+class MetrikyDotazu:
+    """
+    Počítadla a histogramy latence operací modulu a jednotlivých SQL dotazů.
+
+    Operace je veřejná funkce modulu (např. 'uloz_ukol_do_databaze'); dotazy
+    se počítají zvlášť pro každou dvojici (operace, normalizovaný SQL dotaz)
+    včetně počtu vrácených nebo změněných řádků a tříd chyb. Měří se dotazy
+    na spojeních z poolu, tedy u funkcí volaných bez parametru 'pripojeni'.
+    Dotazy delší než 'prah_pomaleho' sekund se ukládají do logu pomalých
+    dotazů o nejvýše 'max_pomalych' položkách.
+    """
+
+    def __init__(self, prah_pomaleho=PRAH_POMALEHO_DOTAZU, max_pomalych=VELIKOST_LOGU_POMALYCH):
+        self.prah_pomaleho = prah_pomaleho
+        self._zamek = threading.Lock()
+        self._operace = {}  # operace -> {"latence", "ziskani", "chyby"}
+        self._dotazy = {}  # (operace, dotaz) -> {"latence", "radky", "chyby"}
+        self._pomale = deque(maxlen=max_pomalych)
+
+    def _operace_zaznam(self, operace):
+        zaznam = self._operace.get(operace)
+        if zaznam is None:
+            zaznam = {"latence": _Histogram(), "ziskani": _Histogram(), "chyby": {}}
+            self._operace[operace] = zaznam
+        return zaznam
+
+    def _dotaz_zaznam(self, operace, dotaz):
+        zaznam = self._dotazy.get((operace, dotaz))
+        if zaznam is None:
+            zaznam = {"latence": _Histogram(), "radky": 0, "chyby": {}}
+            self._dotazy[(operace, dotaz)] = zaznam
+        return zaznam
+
+    def zaznamenat_operaci(self, operace, trvani):
+        with self._zamek:
+            self._operace_zaznam(operace)["latence"].pridat(trvani)
+
+    def zaznamenat_ziskani(self, operace, trvani):
+        """Započítá dobu zapůjčení spojení z poolu."""
+        with self._zamek:
+            self._operace_zaznam(operace)["ziskani"].pridat(trvani)
+
+    def zaznamenat_chybu_operace(self, operace, chyba):
+        with self._zamek:
+            chyby = self._operace_zaznam(operace)["chyby"]
+            trida = _trida_chyby(chyba)
+            chyby[trida] = chyby.get(trida, 0) + 1
+
+    def zaznamenat_dotaz(self, operace, dotaz, trvani, radky=0, chyba=None):
+        """Započítá provedení dotazu; pomalé dotazy zapíše i do logu."""
+        dotaz = _normalizovat_dotaz(dotaz)
+        with self._zamek:
+            zaznam = self._dotaz_zaznam(operace, dotaz)
+            zaznam["latence"].pridat(trvani)
+            zaznam["radky"] += max(radky, 0)
+            if chyba is not None:
+                trida = _trida_chyby(chyba)
+                zaznam["chyby"][trida] = zaznam["chyby"].get(trida, 0) + 1
+            if trvani >= self.prah_pomaleho:
+                self._pomale.append(
+                    {
+                        "cas": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                        "operace": operace,
+                        "dotaz": dotaz,
+                        "trvani_ms": trvani * 1000,
+                        "radky": radky,
+                    }
+                )
+
+    def pridat_radky(self, operace, dotaz, radky):
+        """Připočte řádky přečtené fetch*() k poslednímu provedenému dotazu."""
+        with self._zamek:
+            self._dotaz_zaznam(operace, _normalizovat_dotaz(dotaz))["radky"] += radky
+
+    def snimek(self):
+        """Vrátí všechny metriky jako slovník, který jde převést do JSON."""
+        with self._zamek:
+            return {
+                "operace": {
+                    operace: {
+                        "latence": zaznam["latence"].slovnik(),
+                        "ziskani_spojeni": zaznam["ziskani"].slovnik(),
+                        "chyby": dict(zaznam["chyby"]),
+                    }
+                    for operace, zaznam in self._operace.items()
+                },
+                "dotazy": [
+                    {
+                        "operace": operace,
+                        "dotaz": dotaz,
+                        "latence": zaznam["latence"].slovnik(),
+                        "radky": zaznam["radky"],
+                        "chyby": dict(zaznam["chyby"]),
+                    }
+                    for (operace, dotaz), zaznam in self._dotazy.items()
+                ],
+                "pomale_dotazy": list(self._pomale),
+                "prah_pomaleho_ms": self.prah_pomaleho * 1000,
+            }
+
+    def prometheus(self):
+        """Vrátí metriky v textovém formátu Prometheus."""
+        radky = []
+
+        def histogram(nazev, stitky, hist):
+            for mez, pocet in hist.kumulativne():
+                radky.append(f'{nazev}_bucket{{{stitky},le="{mez}"}} {pocet}')
+            radky.append(f"{nazev}_sum{{{stitky}}} {hist.soucet}")
+            radky.append(f"{nazev}_count{{{stitky}}} {hist.pocet}")
+
+        with self._zamek:
+            radky.append("# HELP paty_operace_sekundy Doba trvání operací modulu.")
+            radky.append("# TYPE paty_operace_sekundy histogram")
+            for operace, zaznam in self._operace.items():
+                histogram("paty_operace_sekundy", f'operace="{_stitek(operace)}"', zaznam["latence"])
+            radky.append("# HELP paty_ziskani_spojeni_sekundy Doba zapůjčení spojení z poolu.")
+            radky.append("# TYPE paty_ziskani_spojeni_sekundy histogram")
+            for operace, zaznam in self._operace.items():
+                histogram(
+                    "paty_ziskani_spojeni_sekundy", f'operace="{_stitek(operace)}"', zaznam["ziskani"]
+                )
+            radky.append("# HELP paty_operace_chyby_celkem Chyby databáze podle operace a třídy.")
+            radky.append("# TYPE paty_operace_chyby_celkem counter")
+            for operace, zaznam in self._operace.items():
+                for trida, pocet in zaznam["chyby"].items():
+                    radky.append(
+                        f'paty_operace_chyby_celkem{{operace="{_stitek(operace)}",'
+                        f'trida="{_stitek(trida)}"}} {pocet}'
+                    )
+            radky.append("# HELP paty_dotaz_sekundy Doba provedení SQL dotazů.")
+            radky.append("# TYPE paty_dotaz_sekundy histogram")
+            for (operace, dotaz), zaznam in self._dotazy.items():
+                stitky = f'operace="{_stitek(operace)}",dotaz="{_stitek(dotaz)}"'
+                histogram("paty_dotaz_sekundy", stitky, zaznam["latence"])
+            radky.append("# HELP paty_dotaz_radky_celkem Řádky vrácené nebo změněné dotazy.")
+            radky.append("# TYPE paty_dotaz_radky_celkem counter")
+            for (operace, dotaz), zaznam in self._dotazy.items():
+                stitky = f'operace="{_stitek(operace)}",dotaz="{_stitek(dotaz)}"'
+                radky.append(f"paty_dotaz_radky_celkem{{{stitky}}} {zaznam['radky']}")
+            radky.append("# HELP paty_dotaz_chyby_celkem Chyby SQL dotazů podle třídy.")
+            radky.append("# TYPE paty_dotaz_chyby_celkem counter")
+            for (operace, dotaz), zaznam in self._dotazy.items():
+                for trida, pocet in zaznam["chyby"].items():
+                    radky.append(
+                        f'paty_dotaz_chyby_celkem{{operace="{_stitek(operace)}",'
+                        f'dotaz="{_stitek(dotaz)}",trida="{_stitek(trida)}"}} {pocet}'
+                    )
+        return "\n".join(radky) + "\n"
+
+
+def _stitek(hodnota):
+    return str(hodnota).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _MerenyKurzor:
+    """Kurzor, který každý dotaz započítá do sdílených metrik."""
+
+    def __init__(self, kurzor, operace):
+        self._kurzor = kurzor
+        self._operace = operace
+        self._dotaz = None
+        # rowcount po execute neznámý (-1): SELECT v SQLite, nebufferovaný
+        # a připravený kurzor MySQL; řádky se pak počítají při čtení
+        self._pocitat_pri_cteni = False
+
+    def __getattr__(self, jmeno):
+        return getattr(self._kurzor, jmeno)
+
+    def __iter__(self):
+        return iter(self._kurzor)
+
+    def _provest(self, metoda, dotaz, parametry):
+        self._dotaz = dotaz
+        self._pocitat_pri_cteni = False
+        zacatek = time.perf_counter()
+        try:
+            vysledek = metoda(dotaz, parametry)
+        except ChybaDatabaze as chyba:
+            _metriky.zaznamenat_dotaz(
+                self._operace, dotaz, time.perf_counter() - zacatek, chyba=chyba
+            )
+            raise
+        radky = self._kurzor.rowcount
+        self._pocitat_pri_cteni = radky < 0
+        _metriky.zaznamenat_dotaz(self._operace, dotaz, time.perf_counter() - zacatek, radky)
+        return vysledek
+
+    def execute(self, dotaz, parametry=()):
+        return self._provest(self._kurzor.execute, dotaz, parametry)
+
+    def executemany(self, dotaz, seznam_parametru):
+        return self._provest(self._kurzor.executemany, dotaz, seznam_parametru)
+
+    def _precteno(self, radky):
+        # rowcount kurzoru MySQL při čtení roste, rozhoduje proto stav po execute
+        if self._pocitat_pri_cteni:
+            _metriky.pridat_radky(self._operace, self._dotaz, radky)
+
+    def fetchone(self):
+        radek = self._kurzor.fetchone()
+        if radek is not None:
+            self._precteno(1)
+        return radek
+
+    def fetchmany(self, *args, **kwargs):
+        radky = self._kurzor.fetchmany(*args, **kwargs)
+        self._precteno(len(radky))
+        return radky
+
+    def fetchall(self):
+        radky = self._kurzor.fetchall()
+        self._precteno(len(radky))
+        return radky
+
+
+class _PripravenyKurzor(_MerenyKurzor):
+    """
+    Měřený kurzor s dotazem připraveným na spojení z poolu.
+
+    Kurzor patří spojení a slouží i dalším voláním, close() ho proto nezavře,
+    jen dočte případný nepřečtený výsledek. Po chybě dotazu se kurzor zahodí
+    a dotaz se při dalším použití připraví znovu.
+    """
+
+    def __init__(self, kurzor, operace, spojeni, dotaz):
+        super().__init__(kurzor, operace)
+        self._spojeni = spojeni
+        self._pripraveny_dotaz = dotaz
+
+    def _provest(self, metoda, dotaz, parametry):
+        try:
+            return super()._provest(metoda, dotaz, parametry)
+        except ChybaDatabaze:
+            self._spojeni._pripravene.pop(self._pripraveny_dotaz, None)
+            try:
+                self._kurzor.close()
+            except ChybaDatabaze:
+                pass
+            raise
+
+    def close(self):
+        # nedočtený výsledek by na MySQL zablokoval další dotaz spojení
+        if getattr(self._spojeni, "unread_result", False):
+            self._kurzor.fetchall()
+
+
+_metriky = MetrikyDotazu()
+
+
+def _aktualni_operace():
+    return getattr(_stav_vlakna, "operace", None) or "-"
+
+
+def _merena_operace(funkce):
+    """Dekorátor, který měří dobu volání veřejné funkce a označí jejím názvem její dotazy."""
+
+    @functools.wraps(funkce)
+    def obal(*args, **kwargs):
+        if getattr(_stav_vlakna, "operace", None):
+            # vnořené volání se počítá do vnější operace
+            return funkce(*args, **kwargs)
+        _stav_vlakna.operace = funkce.__name__
+        zacatek = time.perf_counter()
+        try:
+            return funkce(*args, **kwargs)
+        finally:
+            _stav_vlakna.operace = None
+            _metriky.zaznamenat_operaci(funkce.__name__, time.perf_counter() - zacatek)
+
+    return obal
+
+
+def nastavit_metriky(prah_pomaleho=PRAH_POMALEHO_DOTAZU, max_pomalych=VELIKOST_LOGU_POMALYCH):
+    """
+    Vynuluje metriky dotazů a nastaví log pomalých dotazů.
+
+    Návratová hodnota:
+        MetrikyDotazu: nově nastavené metriky.
+    """
+    global _metriky
+    _metriky = MetrikyDotazu(prah_pomaleho=prah_pomaleho, max_pomalych=max_pomalych)
+    return _metriky
+
+
+def metriky_prometheus():
+    """Vrátí metriky dotazů v textovém formátu Prometheus."""
+    return _metriky.prometheus()
+
+
+def metriky_json():
+    """Vrátí snímek metrik dotazů jako JSON text."""
+    return json.dumps(_metriky.snimek(), ensure_ascii=False, indent=2)
+
+
+def popis_metrik(max_dotazu=10):
+    """
+    Vrátí přehled metrik jako seznam řádků textu pro CLI a GUI: operace
+    s počtem volání, průměrnou dobou a chybami, dotazy s největším celkovým
+    časem (sečtené přes operace) a poslední pomalé dotazy.
+    """
+    snimek = _metriky.snimek()
+    radky = [f"{'operace':<34}{'volání':>8}{'průměr ms':>11}{'spojení ms':>12}  chyby"]
+    for operace, zaznam in sorted(snimek["operace"].items()):
+        latence = zaznam["latence"]
+        ziskani = zaznam["ziskani_spojeni"]
+        chyby = ", ".join(f"{trida}={pocet}" for trida, pocet in zaznam["chyby"].items())
+        radky.append(
+            f"{operace:<34}{latence['pocet']:>8}{_ms(latence['prumer_ms']):>11}"
+            f"{_ms(ziskani['prumer_ms']):>12}  {chyby or '-'}"
+        )
+
+    souhrn = {}  # dotaz -> [počet, součet sekund, řádky, chyby]
+    for dotaz in snimek["dotazy"]:
+        hodnoty = souhrn.setdefault(dotaz["dotaz"], [0, 0.0, 0, 0])
+        hodnoty[0] += dotaz["latence"]["pocet"]
+        hodnoty[1] += dotaz["latence"]["soucet_s"]
+        hodnoty[2] += dotaz["radky"]
+        hodnoty[3] += sum(dotaz["chyby"].values())
+    radky.append("")
+    radky.append(
+        f"{'dotaz (nejvíc celkového času)':<60}{'počet':>7}{'průměr ms':>11}{'řádků':>9}{'chyb':>6}"
+    )
+    for text, (pocet, soucet, radku, chyb) in sorted(
+        souhrn.items(), key=lambda polozka: polozka[1][1], reverse=True
+    )[:max_dotazu]:
+        if len(text) > 58:
+            text = text[:55] + "..."
+        radky.append(f"{text:<60}{pocet:>7}{_ms(soucet / pocet * 1000):>11}{radku:>9}{chyb:>6}")
+
+    radky.append("")
+    radky.append(f"Pomalé dotazy (nad {snimek['prah_pomaleho_ms']:.0f} ms):")
+    for zaznam in snimek["pomale_dotazy"][-max_dotazu:]:
+        radky.append(
+            f"  {zaznam['cas']}  {zaznam['trvani_ms']:.1f} ms  {zaznam['operace']}: {zaznam['dotaz']}"
+        )
+    if not snimek["pomale_dotazy"]:
+        radky.append("  žádné")
+    return radky
+
+
+def _ms(hodnota):
+    return "-" if hodnota is None else f"{hodnota:.2f}"
+
+
+# vytvoření tabulky pokud neexistuje
+def vytvoreni_tabulky_v_databazi(pripojeni):
+    """
+    Připraví v předaném spojení databáze tabulku 'ukoly' provedením všech
+    dosud neprovedených migrací schématu.
+    Pokud dojde k chybě během vytváření, vypíše chybové hlášení.
+    Po úspěšném nebo selhávajícím pokusu zavře spojení.
+
+    Parametry:
+        pripojeni: aktivní spojení s databází
+    """
+
+    try:
+        provest_migrace(pripojeni)
+        print("Tabulka 'ukoly' je připravena.\n")
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při vytváření tabulky", chyba)
+    finally:
+        pripojeni.close()
+
+
+# -----------------------------------
+# Připravené dotazy
+# -----------------------------------
+
+# Nejčastější dotazy CRUD funkcí. Spojení z poolu si každý z nich připraví
+# jen jednou a při dalších voláních posílá serveru už jen parametry; výsledky
+# pak MySQL vrací binárním protokolem. Prepared cursor MySQL pozná opakovaný
+# dotaz podle identity řetězce, proto se vždy předává jedna z těchto konstant.
+DOTAZ_VLOZENI = (
+    "INSERT INTO ukoly (nazev, popis, stav, verze, verze_vlozeni) VALUES (%s, %s, %s, %s, %s)"
+)
+DOTAZ_AKTIVNI = "SELECT id, nazev, popis, stav FROM ukoly WHERE stav IN ('nezahájeno', 'probíhá')"
+DOTAZ_VSECHNY = "SELECT id, nazev, popis, stav FROM ukoly"
+DOTAZ_VSECHNY_S_ARCHIVEM = (
+    "SELECT id, nazev, popis, stav FROM ukoly "
+    "UNION ALL SELECT id, nazev, popis, stav FROM ukoly_archiv"
+)
+DOTAZ_ZMENA_STAVU = "UPDATE ukoly SET stav=%s, verze=%s WHERE id=%s AND stav<>%s"
+DOTAZ_ODSTRANENI = "DELETE FROM ukoly WHERE id=%s"
+DOTAZ_ZAZNAM_SMAZANI = "REPLACE INTO ukoly_smazane (id, verze) VALUES (%s, %s)"
+DOTAZ_NOVA_VERZE = "INSERT INTO verze_zapisu (zapsano) VALUES (CURRENT_TIMESTAMP)"
+
+PRIPRAVENE_DOTAZY = (
+    DOTAZ_VLOZENI,
+    DOTAZ_AKTIVNI,
+    DOTAZ_VSECHNY,
+    DOTAZ_VSECHNY_S_ARCHIVEM,
+    DOTAZ_ZMENA_STAVU,
+    DOTAZ_ODSTRANENI,
+    DOTAZ_ZAZNAM_SMAZANI,
+    DOTAZ_NOVA_VERZE,
+)
+
+
+def _kurzor_dotazu(pripojeni, dotaz):
+    """
+    Vrátí kurzor pro jeden z PRIPRAVENE_DOTAZY.
+
+    Spojení z poolu vrátí kurzor s dotazem připraveným na serveru, jiné
+    spojení (předané volajícím) obyčejný kurzor. Oba se zavírají close().
+    """
+    if isinstance(pripojeni, _PujceneSpojeni):
+        return pripojeni.pripraveny(dotaz)
+    return pripojeni.cursor()
+
+
+# -----------------------------------
+# Migrace schématu
+# -----------------------------------
+
+# dotazy čtecích funkcí, jejichž plán se vypisuje před a po migraci
+SLEDOVANE_DOTAZY = {
+    "aktivní úkoly": DOTAZ_AKTIVNI,
+    "stránka aktivních úkolů": (
+        "SELECT id, nazev, popis, stav FROM ukoly "
+        "WHERE stav IN ('nezahájeno', 'probíhá') AND id > 0 ORDER BY id LIMIT 51"
+    ),
+    "stránka všech úkolů": (
+        "SELECT id, nazev, popis, stav FROM ukoly WHERE id > 0 ORDER BY id LIMIT 51"
+    ),
+}
+
+
+def _migrace_tabulka_ukoly(kurzor, uloziste):
+    uloziste.vytvorit_tabulku_ukoly(kurzor)
+
+
+def _migrace_index_stav_id(kurzor, uloziste):
+    # složený index obslouží filtr na stav i řazení/stránkování podle ID
+    if not uloziste.index_existuje(kurzor, "ukoly", "idx_ukoly_stav_id"):
+        kurzor.execute("CREATE INDEX idx_ukoly_stav_id ON ukoly (stav, id)")
+
+
+def _migrace_verze_zmen(kurzor, uloziste):
+    # čítač verzí s jediným řádkem; jeho zvýšení zamkne řádek do konce
+    # transakce, takže zápisy potvrzují verze ve vzestupném pořadí
+    # (migrace 7 ho nahrazuje tabulkou verze_zapisu)
+    kurzor.execute(
+        "CREATE TABLE IF NOT EXISTS citac_zmen (id INT PRIMARY KEY, hodnota BIGINT NOT NULL)"
+    )
+    kurzor.execute(
+        f"{uloziste.vlozit_nebo_ignorovat} INTO citac_zmen (id, hodnota) VALUES (1, 0)"
+    )
+    for sloupec in ("verze", "verze_vlozeni"):
+        if not uloziste.sloupec_existuje(kurzor, "ukoly", sloupec):
+            kurzor.execute(
+                f"ALTER TABLE ukoly ADD COLUMN {sloupec} BIGINT NOT NULL DEFAULT 0"
+            )
+    if not uloziste.index_existuje(kurzor, "ukoly", "idx_ukoly_verze"):
+        kurzor.execute("CREATE INDEX idx_ukoly_verze ON ukoly (verze)")
+    kurzor.execute(
+        "CREATE TABLE IF NOT EXISTS ukoly_smazane (id INT PRIMARY KEY, verze BIGINT NOT NULL)"
+    )
+    if not uloziste.index_existuje(kurzor, "ukoly_smazane", "idx_ukoly_smazane_verze"):
+        kurzor.execute("CREATE INDEX idx_ukoly_smazane_verze ON ukoly_smazane (verze)")
+
+
+def _migrace_fulltext(kurzor, uloziste):
+    uloziste.vytvorit_fulltext(kurzor)
+
+
+def _migrace_importy(kurzor, uloziste):
+    # postup importů ze souborů, viz importovat_ukoly(); klíč určuje soubor
+    kurzor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS importy (
+            klic CHAR(40) PRIMARY KEY,
+            soubor VARCHAR(1024) NOT NULL,
+            zpracovano BIGINT NOT NULL,
+            dokonceno INT NOT NULL DEFAULT 0,
+            zmeneno TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+    )
+
+
+def _migrace_verze_zapisu(kurzor, uloziste):
+    # Verze přiděluje AUTO_INCREMENT tabulky verze_zapisu místo jediného řádku
+    # citac_zmen, jehož zámek řadil všechny zápisy za sebe. Číslování pokračuje
+    # za poslední verzí čítače; její záznam je datovaný do minulosti, aby se
+    # na verze pod ní nečekalo (viz _bezpecna_verze).
+    uloziste.vytvorit_tabulku_verzi(kurzor)
+    if not uloziste.index_existuje(kurzor, "verze_zapisu", "idx_verze_zapisu_zapsano"):
+        kurzor.execute("CREATE INDEX idx_verze_zapisu_zapsano ON verze_zapisu (zapsano)")
+    if uloziste.tabulka_existuje(kurzor, "citac_zmen"):
+        kurzor.execute(
+            f"{uloziste.vlozit_nebo_ignorovat} INTO verze_zapisu (verze, zapsano) "
+            "SELECT hodnota, '1970-01-02 00:00:00' FROM citac_zmen WHERE id = 1 AND hodnota > 0"
+        )
+        kurzor.execute("DROP TABLE citac_zmen")
+
+
+def _migrace_archiv(kurzor, uloziste):
+    # archiv hotových úkolů, viz archivovat_ukoly(); úkoly si ponechávají své ID
+    kurzor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ukoly_archiv (
+            id INT PRIMARY KEY,
+            nazev VARCHAR(255) NOT NULL,
+            popis TEXT,
+            stav VARCHAR(20) NOT NULL,
+            datum_vytvoreni TIMESTAMP NULL,
+            verze BIGINT NOT NULL DEFAULT 0,
+            verze_vlozeni BIGINT NOT NULL DEFAULT 0,
+            archivovano TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+    )
+    # archivace hledá hotové úkoly podle stáří bez procházení celé tabulky
+    if not uloziste.index_existuje(kurzor, "ukoly", "idx_ukoly_stav_datum"):
+        kurzor.execute("CREATE INDEX idx_ukoly_stav_datum ON ukoly (stav, datum_vytvoreni)")
+
+
+# seřazené kroky migrací; každý krok musí jít bezpečně spustit opakovaně
+MIGRACE = [
+    (1, "tabulka ukoly", _migrace_tabulka_ukoly),
+    (2, "index ukoly (stav, id)", _migrace_index_stav_id),
+    (3, "verze změn a záznamy smazaných úkolů", _migrace_verze_zmen),
+    (4, "fulltextový index názvu a popisu", _migrace_fulltext),
+    (5, "postup importů ze souborů", _migrace_importy),
+    (6, "archiv hotových úkolů", _migrace_archiv),
+    (7, "verze zápisů bez sdíleného čítače", _migrace_verze_zapisu),
+]
+
+
+def plany_dotazu(pripojeni):
+    """
+    Vrátí plány (EXPLAIN) sledovaných čtecích dotazů.
+
+    Parametry:
+        pripojeni: aktivní spojení s databází.
+
+    Návratová hodnota:
+        dict: název dotazu -> seznam řádků plánu jako text;
+        prázdný slovník, pokud tabulka 'ukoly' ještě neexistuje.
+    """
+    kurzor = pripojeni.cursor()
+    try:
+        if not _uloziste.tabulka_existuje(kurzor, "ukoly"):
+            return {}
+    finally:
+        kurzor.close()
+    return {
+        nazev: _uloziste.vysvetlit(pripojeni, dotaz)
+        for nazev, dotaz in SLEDOVANE_DOTAZY.items()
+    }
+
+
+def vypsat_plany_dotazu(plany):
+    """Vypíše plány dotazů vrácené funkcí plany_dotazu()."""
+    for nazev, radky in plany.items():
+        print(f"{nazev}:")
+        for radek in radky:
+            print(f"    {radek}")
+    print()
+
+
+def provest_migrace(pripojeni, vypsat_plany=False):
+    """
+    Provede v předaném spojení všechny dosud neprovedené migrace schématu.
+    Provedené verze si pamatuje v tabulce 'schema_verze', takže opakované
+    spuštění už nic nezmění. Spojení nezavírá.
+
+    Parametry:
+        pripojeni: aktivní spojení s databází.
+        vypsat_plany (bool): vypsat plány sledovaných dotazů před a po migraci.
+
+    Návratová hodnota:
+        list: čísla verzí, které byly provedeny.
+    """
+    if vypsat_plany:
+        print("Plány dotazů před migrací:\n")
+        vypsat_plany_dotazu(plany_dotazu(pripojeni))
+
+    kurzor = pripojeni.cursor()
+    try:
+        kurzor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_verze (
+                verze INT PRIMARY KEY,
+                popis VARCHAR(255) NOT NULL,
+                provedeno TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+        kurzor.execute("SELECT verze FROM schema_verze")
+        provedene = {radek[0] for radek in kurzor.fetchall()}
+
+        nove = []
+        for verze, popis, krok in MIGRACE:
+            if verze in provedene:
+                continue
+            krok(kurzor, _uloziste)
+            kurzor.execute(
+                f"{_uloziste.vlozit_nebo_ignorovat} INTO schema_verze (verze, popis) "
+                "VALUES (%s, %s)",
+                (verze, popis),
+            )
+            pripojeni.commit()
+            nove.append(verze)
+    finally:
+        kurzor.close()
+
+    if vypsat_plany:
+        print("Plány dotazů po migraci:\n")
+        vypsat_plany_dotazu(plany_dotazu(pripojeni))
+    return nove
+
+
+
+def _dalsi_verze(pripojeni):
+    """
+    Přidělí v rámci právě probíhající transakce novou verzi zápisu a vrátí ji.
+    Verze se přidělují vzestupně, potvrzují se ale v libovolném pořadí;
+    čtení změn proto končí pod nejstarším nepotvrzeným zápisem (viz _bezpecna_verze).
+    """
+    with closing(_kurzor_dotazu(pripojeni, DOTAZ_NOVA_VERZE)) as kurzor:
+        kurzor.execute(DOTAZ_NOVA_VERZE)
+        verze = kurzor.lastrowid
+    if verze % PROCISTIT_PO_VERZICH == 0:
+        with closing(pripojeni.cursor()) as kurzor:
+            _procistit_verze(kurzor)
+    return verze
+
+
+def _procistit_verze(kurzor):
+    """
+    Odstraní z tabulky verze_zapisu řádky pod bezpečnou verzí (viz _bezpecna_verze).
+    Řádek bezpečné verze zůstane, aby AUTO_INCREMENT nezačal číslovat znovu, a stejně
+    jako záznam z migrace 7 se datuje do minulosti, takže od něj _bezpecna_verze
+    dál vychází. Běží v transakci zápisu; při jejím zrušení se vrátí i pročištění.
+    """
+    verze = _bezpecna_verze(kurzor)
+    kurzor.execute("DELETE FROM verze_zapisu WHERE verze < %s", (verze,))
+    kurzor.execute(
+        "UPDATE verze_zapisu SET zapsano = '1970-01-02 00:00:00' WHERE verze = %s", (verze,)
+    )
+
+
+def _bezpecna_verze(kurzor, od_verze=0):
+    """
+    Vrátí nejvyšší verzi, do které jsou ve snímku databáze vidět všechny zápisy.
+
+    Verze nepotvrzeného zápisu není v tabulce verze_zapisu vidět, takže od
+    značky 'od_verze' se postupuje po souvislé řadě verzí a končí se před
+    první mezerou. Mezera starší než MAX_TRVANI_ZAPISU patří zrušenému nebo
+    přerušenému zápisu (MySQL přidělené hodnoty AUTO_INCREMENT nevrací)
+    a přeskočí se.
+    """
+    kurzor.execute(
+        "SELECT verze FROM verze_zapisu WHERE "
+        f"{_uloziste.podminka_stari.format(sloupec='zapsano')} "
+        "ORDER BY zapsano DESC, verze DESC LIMIT 1",
+        (MAX_TRVANI_ZAPISU,),
+    )
+    radky = kurzor.fetchall()
+    verze = max(od_verze, radky[0][0] if radky else 0)
+    kurzor.execute("SELECT COUNT(*) FROM verze_zapisu WHERE verze = %s", (verze + 1,))
+    if not kurzor.fetchall()[0][0]:
+        return verze
+    # poslední verze souvislé řady je první, za kterou nenásleduje další
+    kurzor.execute(
+        "SELECT verze FROM verze_zapisu z WHERE verze > %s AND NOT EXISTS "
+        "(SELECT 1 FROM verze_zapisu n WHERE n.verze = z.verze + 1) ORDER BY verze LIMIT 1",
+        (verze,),
+    )
+    return kurzor.fetchall()[0][0]
+
+
+def _duvod_odmitnuti(nazev, popis):
+    """Vrátí důvod, proč úkol nelze uložit, nebo None pokud je v pořádku."""
+    if not isinstance(nazev, str) or not nazev.strip():
+        return "Název úkolu nesmí být prázdný."
+    if not isinstance(popis, str) or not popis.strip():
+        return "Popis úkolu nesmí být prázdný."
+    return None
+
+
+@_merena_operace
+def uloz_ukol_do_databaze(nazev, popis, pripojeni=None):
+    """
+        Uloží nový úkol do databáze s výchozím stavem 'nezahájeno'.
+    Ověří, že 'nazev' a 'popis' nejsou prázdné nebo obsahující pouze mezery.
+
+        Parametry:
+            nazev (str): název úkolu; nesmí být prázdný.
+            popis (str): popis úkolu; nesmí být prázdný.
+            pripojeni: Pokud není parametr zadán, bude použito defaultní připojení.
+
+        Návratová hodnota:
+            bool: úspěšnost operace. Je-li zapnutý zápis na pozadí (viz
+            nastavit_zapis_na_pozadi) a parametr pripojeni není zadán, zapíše
+            se úkol se skupinou fronty a funkce počká na její potvrzení;
+            bez čekání vrací Future uloz_ukol_na_pozadi().
+    """
+    # Kontrola platnosti vstupních dat
+    if _duvod_odmitnuti(nazev, popis) is not None:
+        return False
+
+    if pripojeni is None and _fronta_zapisu is not None:
+        return _fronta_zapisu.vlozit(nazev, popis).result() is not None
+
+    if pripojeni is None:
+        pripojeni = ziskat_pripojeni()
+        je_samostatne_spojeni = True
+    else:
+        je_samostatne_spojeni = False
+
+    if not pripojeni:
+        print("Nelze se připojit k databázi.\n")
+        return False
+
+    try:
+        verze = _dalsi_verze(pripojeni)
+        kurzor = _kurzor_dotazu(pripojeni, DOTAZ_VLOZENI)
+        kurzor.execute(DOTAZ_VLOZENI, (nazev, popis, "nezahájeno", verze, verze))
+        pripojeni.commit()
+        if kurzor.rowcount == 0:
+            return False
+        _cache.zneplatnit([kurzor.lastrowid])
+        kurzor.fetchall()
+        return True
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při ukládání úkolu do databáze", chyba)
+        return False
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
+            pripojeni.close()
+
+
+def uloz_ukol_na_pozadi(nazev, popis):
+    """
+    Zařadí nový úkol do fronty zápisu na pozadí a hned vrátí, aniž čeká na potvrzení.
+
+    Parametry:
+        nazev (str): název úkolu; nesmí být prázdný.
+        popis (str): popis úkolu; nesmí být prázdný.
+
+    Návratová hodnota:
+        concurrent.futures.Future: po potvrzení skupiny ID nového úkolu, None
+        pro neplatný úkol nebo při chybě databáze.
+
+    Vyvolá RuntimeError, pokud zápis na pozadí není zapnutý (viz nastavit_zapis_na_pozadi).
+    """
+    fronta = _fronta_zapisu
+    if fronta is None:
+        raise RuntimeError("Zápis na pozadí není zapnutý, viz nastavit_zapis_na_pozadi().")
+    if _duvod_odmitnuti(nazev, popis) is not None:
+        budouci = fronta._Future()
+        budouci.set_result(None)
+        return budouci
+    return fronta.vlozit(nazev, popis)
+
+
+@_merena_operace
+def uloz_ukoly_hromadne(ukoly, velikost_davky=VELIKOST_DAVKY, pripojeni=None):
+    """
+    Hromadně uloží úkoly do databáze s výchozím stavem 'nezahájeno'.
+    Každý úkol ověří stejně jako uloz_ukol_do_databaze a platné úkoly zapíše
+    po dávkách víceřádkovým INSERTem, každou dávku v jedné transakci.
+
+    Parametry:
+        ukoly: iterovatelný objekt dvojic (nazev, popis); čte se postupně.
+        velikost_davky (int): počet řádků zapsaných v jedné transakci.
+        pripojeni: Pokud není parametr zadán, bude použito defaultní připojení.
+
+    Návratová hodnota:
+        tuple: (seznam ID vložených úkolů, seznam dvojic (pořadí, důvod))
+        pro odmítnuté úkoly; pořadí odpovídá pozici úkolu ve vstupu.
+    """
+    if velikost_davky < 1:
+        raise ValueError("Velikost dávky musí být alespoň 1.")
+
+    vlozena_id = []
+    odmitnute = []
+
+    if pripojeni is None:
+        pripojeni = ziskat_pripojeni()
+        je_samostatne_spojeni = True
+    else:
+        je_samostatne_spojeni = False
+
+    if not pripojeni:
+        print("Nelze se připojit k databázi.\n")
+        return vlozena_id, [
+            (poradi, "Nelze se připojit k databázi.")
+            for poradi, _ in enumerate(ukoly)
+        ]
+
+    try:
+        kurzor = pripojeni.cursor()
+        davka = []
+        for poradi, ukol in enumerate(ukoly):
+            try:
+                nazev, popis = ukol
+            except (TypeError, ValueError):
+                odmitnute.append((poradi, "Úkol musí být dvojice (nazev, popis)."))
+                continue
+            duvod = _duvod_odmitnuti(nazev, popis)
+            if duvod is not None:
+                odmitnute.append((poradi, duvod))
+                continue
+            davka.append((poradi, nazev, popis))
+            if len(davka) >= velikost_davky:
+                _zapsat_davku(pripojeni, kurzor, davka, vlozena_id, odmitnute)
+                davka = []
+        if davka:
+            _zapsat_davku(pripojeni, kurzor, davka, vlozena_id, odmitnute)
+        return vlozena_id, sorted(odmitnute)
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if je_samostatne_spojeni:
+            pripojeni.close()
+
+
+def _zapsat_davku(pripojeni, kurzor, davka, vlozena_id, odmitnute):
+    # executemany přepíše v MySQL INSERT na jeden víceřádkový příkaz
+    try:
+        verze = _dalsi_verze(pripojeni)
+        kurzor.executemany(
+            "INSERT INTO ukoly (nazev, popis, stav, verze, verze_vlozeni) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            [(nazev, popis, "nezahájeno", verze, verze) for _, nazev, popis in davka],
+        )
+        prvni_id = _uloziste.prvni_vlozene_id(kurzor, len(davka))
+        pripojeni.commit()
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při hromadném ukládání úkolů", chyba)
+        pripojeni.rollback()
+        odmitnute.extend((poradi, str(chyba)) for poradi, _, _ in davka)
+        return
+    nova_id = range(prvni_id, prvni_id + len(davka))
+    _cache.zneplatnit(nova_id)
+    vlozena_id.extend(nova_id)
+
+
+# -----------------------------------
+# Zápis na pozadí
+# -----------------------------------
+
+
+class FrontaZapisu:
+    """
+    Zápis nových úkolů na pozadí se skupinovým potvrzováním. Úkoly se řadí
+    do fronty v paměti a vlákno na pozadí je zapisuje funkcí
+    uloz_ukoly_hromadne(), vždy celou skupinu v jedné transakci, jakmile je
+    skupina plná, nejstarší úkol čeká déle než 'interval', nebo si to
+    vyžádá vyprazdnit(). Jedno potvrzení tak obslouží mnoho zápisů.
+
+    Zapsané úkoly nejsou vidět, dokud je vlákno nepotvrdí; kdo potřebuje
+    číst vlastní zápisy, zavolá vyprazdnit() nebo počká na výsledek Future.
+
+    Parametry:
+        velikost_skupiny (int): nejvýše tolik úkolů v jednom potvrzení.
+        interval (float): nejdelší doba čekání úkolu ve frontě v sekundách.
+        max_fronta (int): při plné frontě vlozit() čeká na uvolnění místa.
+        pripojeni: spojení, které bude používat jen vlákno fronty; bez zadání
+            si každá skupina půjčí spojení z poolu.
+    """
+
+    def __init__(
+        self,
+        velikost_skupiny=VELIKOST_SKUPINY_ZAPISU,
+        interval=INTERVAL_ZAPISU,
+        max_fronta=MAX_FRONTA_ZAPISU,
+        pripojeni=None,
+    ):
+        if velikost_skupiny < 1 or max_fronta < velikost_skupiny:
+            raise ValueError("Skupina musí mít alespoň 1 úkol a vejít se do fronty.")
+        # concurrent.futures načítá logging, do importu jádra ho netaháme
+        from concurrent.futures import Future
+
+        self._Future = Future
+        self.velikost_skupiny = velikost_skupiny
+        self.interval = interval
+        self.max_fronta = max_fronta
+        self._pripojeni = pripojeni
+        self._fronta = deque()  # n-tice (cas_vlozeni, nazev, popis, future)
+        self._podminka = threading.Condition()
+        self._vlozeno = 0
+        self._vyrizeno = 0
+        self._vyzadano = 0
+        self._konec = False
+        self._vlakno = threading.Thread(target=self._bezet, name="zapis-na-pozadi", daemon=True)
+        self._vlakno.start()
+
+    def vlozit(self, nazev, popis):
+        """
+        Zařadí úkol do fronty (bez kontroly platnosti, tu dělá volající).
+
+        Návratová hodnota:
+            concurrent.futures.Future: po potvrzení ID nového úkolu,
+            při chybě databáze None (chyba se vypíše jako u ostatních funkcí).
+        """
+        budouci = self._Future()
+        with self._podminka:
+            while len(self._fronta) >= self.max_fronta and not self._konec:
+                self._podminka.wait()
+            if self._konec:
+                raise RuntimeError("Fronta zápisů je ukončená.")
+            self._fronta.append((time.monotonic(), nazev, popis, budouci))
+            self._vlozeno += 1
+            if len(self._fronta) == 1 or len(self._fronta) >= self.velikost_skupiny:
+                self._podminka.notify_all()
+        return budouci
+
+    def vyprazdnit(self, cekani=None):
+        """
+        Zapíše hned všechny úkoly ve frontě a počká na jejich potvrzení.
+
+        Parametry:
+            cekani (float): nejdéle tolik sekund čekání, None = bez omezení.
+
+        Návratová hodnota:
+            bool: True, pokud jsou vyřízené všechny úkoly vložené před voláním.
+        """
+        with self._podminka:
+            cil = self._vlozeno
+            self._vyzadano = max(self._vyzadano, cil)
+            self._podminka.notify_all()
+            return self._podminka.wait_for(lambda: self._vyrizeno >= cil, cekani)
+
+    def ukoncit(self):
+        """Zapíše zbytek fronty a ukončí vlákno; další vlozit() vyvolá RuntimeError."""
+        with self._podminka:
+            self._konec = True
+            self._podminka.notify_all()
+        self._vlakno.join()
+
+    def delka(self):
+        """Vrátí počet úkolů vložených, ale ještě nepotvrzených."""
+        with self._podminka:
+            return self._vlozeno - self._vyrizeno
+
+    def _dalsi_skupina(self):
+        # čeká na plnou skupinu, vypršení intervalu nejstaršího úkolu,
+        # vyžádané vyprázdnění nebo ukončení; prázdná skupina znamená konec
+        with self._podminka:
+            while True:
+                if self._fronta:
+                    if (
+                        len(self._fronta) >= self.velikost_skupiny
+                        or self._vyzadano > self._vyrizeno
+                        or self._konec
+                    ):
+                        break
+                    zbyva = self._fronta[0][0] + self.interval - time.monotonic()
+                    if zbyva <= 0:
+                        break
+                    self._podminka.wait(zbyva)
+                elif self._konec:
+                    return []
+                else:
+                    self._podminka.wait()
+            skupina = [
+                self._fronta.popleft()
+                for _ in range(min(len(self._fronta), self.velikost_skupiny))
+            ]
+            # místo ve frontě se uvolnilo pro vlozit(), které čeká
+            self._podminka.notify_all()
+            return skupina
+
+    def _bezet(self):
+        while True:
+            skupina = self._dalsi_skupina()
+            if not skupina:
+                return
+            try:
+                vlozena_id, odmitnute = uloz_ukoly_hromadne(
+                    [(nazev, popis) for _, nazev, popis, _ in skupina],
+                    velikost_davky=len(skupina),
+                    pripojeni=self._pripojeni,
+                )
+                odmitnute = {poradi for poradi, _ in odmitnute}
+                nova_id = iter(vlozena_id)
+                for poradi, (_, _, _, budouci) in enumerate(skupina):
+                    budouci.set_result(None if poradi in odmitnute else next(nova_id))
+            except Exception as chyba:
+                for _, _, _, budouci in skupina:
+                    if not budouci.done():
+                        budouci.set_exception(chyba)
+            with self._podminka:
+                self._vyrizeno += len(skupina)
+                self._podminka.notify_all()
+
+
+_fronta_zapisu = None
+
+
+def nastavit_zapis_na_pozadi(
+    zapnout=True,
+    velikost_skupiny=VELIKOST_SKUPINY_ZAPISU,
+    interval=INTERVAL_ZAPISU,
+    max_fronta=MAX_FRONTA_ZAPISU,
+):
+    """
+    Zapne nebo vypne zápis na pozadí pro uloz_ukol_na_pozadi() a pro
+    uloz_ukol_do_databaze() volanou bez parametru pripojeni. Předchozí frontu vždy nejdřív vyprázdní
+    a ukončí. Zapnout ho lze i proměnnou prostředí PATY_ZAPIS_NA_POZADI=1.
+
+    Návratová hodnota:
+        FrontaZapisu, nebo None pokud je zápis na pozadí vypnutý.
+    """
+    global _fronta_zapisu
+    stara, _fronta_zapisu = _fronta_zapisu, None
+    if stara is not None:
+        stara.ukoncit()
+    if zapnout:
+        _fronta_zapisu = FrontaZapisu(velikost_skupiny, interval, max_fronta)
+    return _fronta_zapisu
+
+
+def vyprazdnit_zapisy(cekani=None):
+    """
+    Počká, až budou potvrzené všechny úkoly zapisované na pozadí.
+    Bez zapnutého zápisu na pozadí hned vrátí True.
+
+    Návratová hodnota:
+        bool: True, pokud se vše stihlo potvrdit do 'cekani' sekund.
+    """
+    fronta = _fronta_zapisu
+    return True if fronta is None else fronta.vyprazdnit(cekani)
+
+
+@_merena_operace
+def nacist_ukoly_z_databaze(pripojeni=None):
+    """Načte a vrátí všechny úkoly se stavem 'nezahájeno' nebo 'probíhá' z databáze.
+
+    Parametry:
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+
+    Návratová hodnota:
+        list: seznam záznamů Ukol nebo prázdný seznam při chybě či nepoužitelných datech
+    """
+    if pripojeni is None:
+        nalezeno, ukoly = _cache.ziskat(("aktivni",))
+        if nalezeno:
+            return ukoly
+    generace = _cache.generace
+    try:
+        if pripojeni is None:
+            pripojeni = ziskat_pripojeni_pro_cteni()
+            je_samostatne_spojeni = True
+        else:
+            je_samostatne_spojeni = False
+
+        if not pripojeni:
+            print("Nelze se připojit k databázi.\n")
+            return []
+
+        kurzor = _kurzor_dotazu(pripojeni, DOTAZ_AKTIVNI)
+        kurzor.execute(DOTAZ_AKTIVNI)
+        ukoly = list(map(Ukol, kurzor.fetchall()))
+        if je_samostatne_spojeni:
+            _cache.ulozit(("aktivni",), ukoly, None, generace)
+        return ukoly
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při načítání úkolů", chyba)
+        return []
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
+            pripojeni.close()
+
+@_merena_operace
+def nacist_vsechny_ukoly_z_databaze(pripojeni=None, vcetne_archivu=False):
+    """Načte a vrátí všechny úkoly bez ohledu na stav z databáze.
+    
+    Parametry:
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+        vcetne_archivu (bool): přidat i úkoly přesunuté do archivu (viz archivovat_ukoly).
+
+    Návratová hodnota:
+        list: seznam záznamů Ukol nebo prázdný seznam při chybě či nepoužitelných datech.
+    """
+    klic, dotaz = (
+        (("vsechny_s_archivem",), DOTAZ_VSECHNY_S_ARCHIVEM)
+        if vcetne_archivu
+        else (("vsechny",), DOTAZ_VSECHNY)
+    )
+    if pripojeni is None:
+        nalezeno, ukoly = _cache.ziskat(klic)
+        if nalezeno:
+            return ukoly
+    generace = _cache.generace
+    try:
+        if pripojeni is None:
+            pripojeni = ziskat_pripojeni_pro_cteni()
+            je_samostatne_spojeni = True
+        else:
+            je_samostatne_spojeni = False
+
+        if not pripojeni:
+            print("Nelze se připojit k databázi.")
+            return []
+
+        kurzor = _kurzor_dotazu(pripojeni, dotaz)
+        kurzor.execute(dotaz)
+        ukoly = list(map(Ukol, kurzor.fetchall()))
+        if je_samostatne_spojeni:
+            _cache.ulozit(klic, ukoly, None, generace)
+        return ukoly
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při načítání úkolů", chyba)
+        return []
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
+            pripojeni.close()
+
+
+def prochazet_vsechny_ukoly(velikost_davky=VELIKOST_DAVKY_CTENI, pripojeni=None, vcetne_archivu=False):
+    """
+    Postupně vrací všechny úkoly bez ohledu na stav, aniž by načítal celou tabulku.
+    Čte nebufferovaným kurzorem, takže řádky zůstávají na serveru a vyzvedávají
+    se po dávkách pomocí fetchmany(); paměť nezávisí na velikosti tabulky.
+
+    Pokud volající procházení ukončí předčasně, má generátor zavřít
+    (např. pomocí contextlib.closing), aby se spojení hned uvolnilo.
+
+    Parametry:
+        velikost_davky (int): počet řádků vyzvednutých ze serveru najednou.
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+        vcetne_archivu (bool): po úkolech z tabulky ukoly vrátit i archivované.
+
+    Návratová hodnota:
+        generátor záznamů Ukol seřazených podle ID; archivované úkoly následují
+        až za ostatními, opět podle ID. Úkol archivovaný během procházení se
+        tak může objevit dvakrát, žádný ale nechybí.
+    """
+    if velikost_davky < 1:
+        raise ValueError("Velikost dávky musí být alespoň 1.")
+
+    if pripojeni is None:
+        pripojeni = ziskat_pripojeni_pro_cteni()
+        je_samostatne_spojeni = True
+    else:
+        je_samostatne_spojeni = False
+
+    if not pripojeni:
+        print("Nelze se připojit k databázi.\n")
+        return
+
+    dokonceno = False
+    try:
+        kurzor = pripojeni.cursor(buffered=False)
+        tabulky = ("ukoly", "ukoly_archiv") if vcetne_archivu else ("ukoly",)
+        for tabulka in tabulky:
+            kurzor.execute(f"SELECT id, nazev, popis, stav FROM {tabulka} ORDER BY id")
+            while True:
+                davka = kurzor.fetchmany(velikost_davky)
+                if not davka:
+                    break
+                yield from map(Ukol, davka)
+        dokonceno = True
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při načítání úkolů", chyba)
+    finally:
+        if dokonceno:
+            kurzor.close()
+            if je_samostatne_spojeni:
+                pripojeni.close()
+        elif je_samostatne_spojeni:
+            # nepřečtené řádky by se musely celé stáhnout ze serveru,
+            # levnější je spojení zahodit a pool otevře nové
+            pripojeni.zahodit()
+        elif "kurzor" in locals():
+            pripojeni.consume_results()
+            kurzor.close()
+
+
+@_merena_operace
+def nacist_stranku_aktivnich_ukolu(po_id=None, limit=VELIKOST_STRANKY, pripojeni=None):
+    """Načte jednu stránku úkolů se stavem 'nezahájeno' nebo 'probíhá' seřazenou podle ID.
+
+    Parametry:
+        po_id: pokračovací token z předchozí stránky; None pro první stránku.
+        limit (int): maximální počet úkolů na stránce.
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+
+    Návratová hodnota:
+        tuple: (seznam záznamů Ukol, pokračovací token pro další stránku nebo None,
+        pokud další stránka neexistuje).
+    """
+    return _nacist_stranku(
+        "aktivni",
+        "WHERE stav IN ('nezahájeno', 'probíhá') AND id > %s",
+        po_id,
+        limit,
+        pripojeni,
+    )
+
+
+@_merena_operace
+def nacist_stranku_vsech_ukolu(po_id=None, limit=VELIKOST_STRANKY, pripojeni=None):
+    """Načte jednu stránku všech úkolů bez ohledu na stav seřazenou podle ID.
+
+    Parametry:
+        po_id: pokračovací token z předchozí stránky; None pro první stránku.
+        limit (int): maximální počet úkolů na stránce.
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+
+    Návratová hodnota:
+        tuple: (seznam záznamů Ukol, pokračovací token pro další stránku nebo None,
+        pokud další stránka neexistuje).
+    """
+    return _nacist_stranku("vsechny", "WHERE id > %s", po_id, limit, pripojeni)
+
+
+def _nacist_stranku(druh, podminka, po_id, limit, pripojeni):
+    # stránkování podle klíče: místo OFFSET se pokračuje od posledního ID,
+    # takže každá stránka je jen krátký rozsah primárního klíče;
+    # načte se o řádek víc, aby bylo poznat, zda existuje další stránka
+    if limit < 1:
+        raise ValueError("Velikost stránky musí být alespoň 1.")
+    po_id = po_id or 0
+    klic = ("stranka", druh, po_id, limit)
+    if pripojeni is None:
+        nalezeno, stranka = _cache.ziskat(klic)
+        if nalezeno:
+            return stranka
+    generace = _cache.generace
+    try:
+        if pripojeni is None:
+            pripojeni = ziskat_pripojeni_pro_cteni()
+            je_samostatne_spojeni = True
+        else:
+            je_samostatne_spojeni = False
+
+        if not pripojeni:
+            print("Nelze se připojit k databázi.\n")
+            return [], None
+
+        kurzor = pripojeni.cursor()
+        kurzor.execute(
+            f"SELECT id, nazev, popis, stav FROM ukoly {podminka} ORDER BY id LIMIT %s",
+            (po_id, limit + 1),
+        )
+        ukoly = list(map(Ukol, kurzor.fetchall()))
+        if len(ukoly) > limit:
+            del ukoly[limit:]
+            stranka = ukoly, ukoly[-1].id
+        else:
+            stranka = ukoly, None
+        if je_samostatne_spojeni:
+            _cache.ulozit(klic, stranka, (po_id, stranka[1]), generace)
+        return stranka
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při načítání úkolů", chyba)
+        return [], None
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
+            pripojeni.close()
+
+
+@_merena_operace
+def nacist_ukoly_v_rozsahu(od_id, do_id, pripojeni=None):
+    """Načte všechny úkoly s ID od 'od_id' (včetně) do 'do_id' (bez něj) seřazené podle ID.
+
+    Parametry:
+        od_id (int): nejmenší ID úkolu v rozsahu.
+        do_id (int): první ID, které už do rozsahu nepatří.
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+
+    Návratová hodnota:
+        list: seznam záznamů Ukol nebo prázdný seznam při chybě.
+    """
+    klic = ("rozsah", od_id, do_id)
+    if pripojeni is None:
+        nalezeno, ukoly = _cache.ziskat(klic)
+        if nalezeno:
+            return ukoly
+    generace = _cache.generace
+    try:
+        if pripojeni is None:
+            pripojeni = ziskat_pripojeni_pro_cteni()
+            je_samostatne_spojeni = True
+        else:
+            je_samostatne_spojeni = False
+
+        if not pripojeni:
+            print("Nelze se připojit k databázi.\n")
+            return []
+
+        kurzor = pripojeni.cursor()
+        kurzor.execute(
+            "SELECT id, nazev, popis, stav FROM ukoly WHERE id >= %s AND id < %s ORDER BY id",
+            (od_id, do_id),
+        )
+        ukoly = list(map(Ukol, kurzor.fetchall()))
+        if je_samostatne_spojeni:
+            _cache.ulozit(klic, ukoly, (od_id - 1, do_id - 1), generace)
+        return ukoly
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při načítání úkolů", chyba)
+        return []
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
+            pripojeni.close()
+
+
+@_merena_operace
+def rozsah_id_ukolu(pripojeni=None):
+    """Vrátí nejmenší a největší ID úkolu v databázi.
+
+    Parametry:
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+
+    Návratová hodnota:
+        tuple: (nejmenší ID, největší ID), nebo (None, None) pro prázdnou
+        tabulku či při chybě.
+    """
+    if pripojeni is None:
+        nalezeno, rozsah = _cache.ziskat(("rozsah_id",))
+        if nalezeno:
+            return rozsah
+    generace = _cache.generace
+    try:
+        if pripojeni is None:
+            pripojeni = ziskat_pripojeni_pro_cteni()
+            je_samostatne_spojeni = True
+        else:
+            je_samostatne_spojeni = False
+
+        if not pripojeni:
+            print("Nelze se připojit k databázi.\n")
+            return None, None
+
+        kurzor = pripojeni.cursor()
+        kurzor.execute("SELECT MIN(id), MAX(id) FROM ukoly")
+        rozsah = tuple(kurzor.fetchone())
+        if je_samostatne_spojeni:
+            _cache.ulozit(("rozsah_id",), rozsah, None, generace)
+        return rozsah
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při načítání úkolů", chyba)
+        return None, None
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
+            pripojeni.close()
+
+
+@_merena_operace
+def pocet_ukolu(pripojeni=None):
+    """Vrátí počet úkolů v databázi.
+
+    Parametry:
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+
+    Návratová hodnota:
+        int: počet úkolů, nebo None při chybě.
+    """
+    if pripojeni is None:
+        nalezeno, pocet = _cache.ziskat(("pocet",))
+        if nalezeno:
+            return pocet
+    generace = _cache.generace
+    try:
+        if pripojeni is None:
+            pripojeni = ziskat_pripojeni_pro_cteni()
+            je_samostatne_spojeni = True
+        else:
+            je_samostatne_spojeni = False
+
+        if not pripojeni:
+            print("Nelze se připojit k databázi.\n")
+            return None
+
+        kurzor = pripojeni.cursor()
+        kurzor.execute("SELECT COUNT(*) FROM ukoly")
+        (pocet,) = kurzor.fetchone()
+        if je_samostatne_spojeni:
+            _cache.ulozit(("pocet",), pocet, None, generace)
+        return pocet
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při načítání úkolů", chyba)
+        return None
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
+            pripojeni.close()
+
+
+@_merena_operace
+def id_ukolu_na_pozici(pozice, pripojeni=None):
+    """Vrátí ID úkolu na dané pozici (od nuly) v seznamu úkolů seřazeném podle ID.
+
+    Slouží ke skoku na vzdálenou stránku, od jejíhož výsledku už lze
+    pokračovat stránkováním podle klíče; cena roste s pozicí.
+
+    Parametry:
+        pozice (int): pořadí úkolu od nuly.
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+
+    Návratová hodnota:
+        int: ID úkolu, nebo None, pokud pozice leží za koncem seznamu či při chybě.
+    """
+    klic = ("pozice", pozice)
+    if pripojeni is None:
+        nalezeno, id_ukolu = _cache.ziskat(klic)
+        if nalezeno:
+            return id_ukolu
+    generace = _cache.generace
+    try:
+        if pripojeni is None:
+            pripojeni = ziskat_pripojeni_pro_cteni()
+            je_samostatne_spojeni = True
+        else:
+            je_samostatne_spojeni = False
+
+        if not pripojeni:
+            print("Nelze se připojit k databázi.\n")
+            return None
+
+        kurzor = pripojeni.cursor()
+        kurzor.execute("SELECT id FROM ukoly ORDER BY id LIMIT 1 OFFSET %s", (pozice,))
+        radek = kurzor.fetchone()
+        id_ukolu = None if radek is None else radek[0]
+        if je_samostatne_spojeni:
+            _cache.ulozit(klic, id_ukolu, None, generace)
+        return id_ukolu
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při načítání úkolů", chyba)
+        return None
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
+            pripojeni.close()
+
+
+@_merena_operace
+def zmenit_stav_ukolu_v_databazi(id_ukolu, novy_stav, pripojeni=None):
+    """Aktualizuje stav úkolu v databázi podle ID.
+
+    Parametry:
+        id_ukolu (int): ID úkolu v databázi.
+        novy_stav (str): Nový stav ('nezahájeno', 'hotovo', 'probíhá').
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+
+    Návratová hodnota:
+        bool: úspěšnost operace.
+    """
+    try:
+        if pripojeni is None:
+            pripojeni = ziskat_pripojeni()
+            je_samostatne_spojeni = True
+        else:
+            je_samostatne_spojeni = False
+
+        if not pripojeni:
+            print("Nelze se připojit k databázi.\n")
+            return False
+        verze = _dalsi_verze(pripojeni)
+        kurzor = _kurzor_dotazu(pripojeni, DOTAZ_ZMENA_STAVU)
+        kurzor.execute(DOTAZ_ZMENA_STAVU, (novy_stav, verze, id_ukolu, novy_stav))
+        pripojeni.commit()
+        if kurzor.rowcount == 0:
+            return False
+        _cache.zneplatnit([int(id_ukolu)])
+        return True
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při aktualizaci stavu", chyba)
+        return False
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
+            pripojeni.close()
+
+
+@_merena_operace
+def odstranit_ukol_z_databaze(id_ukolu, pripojeni=None):
+    """Odstraní úkol s daným ID z databáze.
+
+    Parametry:
+        id_ukolu (int): ID úkolu v databázi.
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+
+    Návratová hodnota:
+        bool: úspěšnost operace.
+    """
+    try:
+        if pripojeni is None:
+            pripojeni = ziskat_pripojeni()
+            je_samostatne_spojeni = True
+        else:
+            je_samostatne_spojeni = False
+
+        if not pripojeni:
+            print("Nelze se připojit k databázi.\n")
+            return False
+        kurzor = _kurzor_dotazu(pripojeni, DOTAZ_ODSTRANENI)
+        kurzor.execute(DOTAZ_ODSTRANENI, (id_ukolu,))
+        if kurzor.rowcount == 0:
+            pripojeni.rollback()
+            return False
+        # verze se přidělí až s jistotou, že bude co zapsat; zrušená verze
+        # by sledování změn zdržela (viz _bezpecna_verze)
+        verze = _dalsi_verze(pripojeni)
+        with closing(_kurzor_dotazu(pripojeni, DOTAZ_ZAZNAM_SMAZANI)) as zaznam:
+            zaznam.execute(DOTAZ_ZAZNAM_SMAZANI, (id_ukolu, verze))
+        pripojeni.commit()
+        _cache.zneplatnit([int(id_ukolu)])
+        return True
+
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při odstraňování", chyba)
+        return False
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
+            pripojeni.close()
+
+
+@_merena_operace
+def zmenit_stav_ukolu_hromadne(
+    id_ukolu, novy_stav, velikost_davky=VELIKOST_DAVKY, pripojeni=None
+):
+    """Aktualizuje stav všech úkolů se zadanými ID v jedné transakci.
+
+    Parametry:
+        id_ukolu (iterable): ID úkolů v databázi.
+        novy_stav (str): Nový stav ('nezahájeno', 'hotovo', 'probíhá').
+        velikost_davky (int): maximální počet ID v jednom příkazu WHERE id IN (...).
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+
+    Návratová hodnota:
+        list: seřazená ID úkolů, které v databázi existovaly a byly aktualizovány;
+        při chybě prázdný seznam a žádná změna se neuloží.
+    """
+
+    def zmenit(kurzor, nalezena, zastupci, verze):
+        kurzor.execute(
+            f"UPDATE ukoly SET stav=%s, verze=%s WHERE id IN ({zastupci}) AND stav<>%s",
+            (novy_stav, verze, *nalezena, novy_stav),
+        )
+
+    return _zmenit_po_davkach(
+        id_ukolu, zmenit, velikost_davky, pripojeni, "Chyba při hromadné aktualizaci stavu"
+    )
+
+
+@_merena_operace
+def odstranit_ukoly_hromadne(id_ukolu, velikost_davky=VELIKOST_DAVKY, pripojeni=None):
+    """Odstraní všechny úkoly se zadanými ID v jedné transakci.
+
+    Parametry:
+        id_ukolu (iterable): ID úkolů v databázi.
+        velikost_davky (int): maximální počet ID v jednom příkazu WHERE id IN (...).
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+
+    Návratová hodnota:
+        list: seřazená ID úkolů, které v databázi existovaly a byly odstraněny;
+        při chybě prázdný seznam a nic se neodstraní.
+    """
+
+    def odstranit(kurzor, nalezena, zastupci, verze):
+        kurzor.execute(f"DELETE FROM ukoly WHERE id IN ({zastupci})", nalezena)
+        kurzor.executemany(
+            "REPLACE INTO ukoly_smazane (id, verze) VALUES (%s, %s)",
+            [(id_ukolu, verze) for id_ukolu in nalezena],
+        )
+
+    return _zmenit_po_davkach(
+        id_ukolu, odstranit, velikost_davky, pripojeni, "Chyba při hromadném odstraňování"
+    )
+
+
+def _zmenit_po_davkach(id_ukolu, zmena, velikost_davky, pripojeni, chyba_text):
+    # nalezená ID se zjistí (v MySQL i zamknou) samostatným SELECTem, protože
+    # rowcount u UPDATE nepočítá řádky, jejichž stav se nezměnil;
+    # zmena(kurzor, nalezena, zastupci, verze) pak upraví jen nalezené řádky
+    if velikost_davky < 1:
+        raise ValueError("Velikost dávky musí být alespoň 1.")
+    seznam_id = sorted({int(id_) for id_ in id_ukolu})
+    if not seznam_id:
+        return []
+
+    if pripojeni is None:
+        pripojeni = ziskat_pripojeni()
+        je_samostatne_spojeni = True
+    else:
+        je_samostatne_spojeni = False
+
+    if not pripojeni:
+        print("Nelze se připojit k databázi.\n")
+        return []
+
+    try:
+        kurzor = pripojeni.cursor()
+        verze = _dalsi_verze(pripojeni)
+        nalezena = []
+        for zacatek in range(0, len(seznam_id), velikost_davky):
+            davka = seznam_id[zacatek : zacatek + velikost_davky]
+            zastupci = ", ".join(["%s"] * len(davka))
+            kurzor.execute(
+                f"SELECT id FROM ukoly WHERE id IN ({zastupci}){_uloziste.pro_upravu}",
+                davka,
+            )
+            nalezena_v_davce = [radek[0] for radek in kurzor.fetchall()]
+            if nalezena_v_davce:
+                zastupci = ", ".join(["%s"] * len(nalezena_v_davce))
+                zmena(kurzor, nalezena_v_davce, zastupci, verze)
+                nalezena.extend(nalezena_v_davce)
+        pripojeni.commit()
+        _cache.zneplatnit(nalezena)
+        return sorted(nalezena)
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu(chyba_text, chyba)
+        pripojeni.rollback()
+        return []
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if je_samostatne_spojeni:
+            pripojeni.close()
+
+
+@_merena_operace
+def hledat_ukoly(text, stavy=None, po=0, limit=VELIKOST_STRANKY, pripojeni=None):
+    """
+    Vyhledá úkoly podle slov v názvu a popisu pomocí fulltextového indexu
+    a seřadí je od nejrelevantnějších.
+
+    Parametry:
+        text (str): hledaná slova.
+        stavy: stav nebo seznam stavů, na které se výsledky omezí (None = všechny).
+        po (int): kolik výsledků přeskočit, tedy značka z předchozí stránky.
+        limit (int): nejvýše tolik úkolů na stránce.
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+
+    Návratová hodnota:
+        tuple: (seznam záznamů NalezenyUkol s relevancí 'skore', značka další stránky
+        nebo None, pokud další stránka není).
+    """
+    if limit < 1:
+        raise ValueError("Velikost stránky musí být alespoň 1.")
+    if isinstance(stavy, str):
+        stavy = [stavy]
+    stavy = list(stavy or [])
+    for stav in stavy:
+        if stav not in STAVY:
+            raise ValueError(f"Neplatný stav '{stav}'.")
+    slova = re.findall(r"\w+", text)
+    if not slova:
+        return [], None
+
+    try:
+        if pripojeni is None:
+            pripojeni = ziskat_pripojeni_pro_cteni()
+            je_samostatne_spojeni = True
+        else:
+            je_samostatne_spojeni = False
+
+        if not pripojeni:
+            print("Nelze se připojit k databázi.\n")
+            return [], None
+
+        podminka_stavu = ""
+        if stavy:
+            podminka_stavu = f" AND ukoly.stav IN ({', '.join(['%s'] * len(stavy))})"
+        dotaz, parametry = _uloziste.dotaz_hledani(slova, podminka_stavu)
+        kurzor = pripojeni.cursor()
+        kurzor.execute(dotaz, (*parametry, *stavy, limit + 1, po))
+        ukoly = list(map(NalezenyUkol, kurzor.fetchall()))
+        if len(ukoly) > limit:
+            del ukoly[limit:]
+            return ukoly, po + limit
+        return ukoly, None
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při vyhledávání úkolů", chyba)
+        return [], None
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
+            pripojeni.close()
+
+
+@_merena_operace
+def aktualni_verze_zmen(pripojeni=None):
+    """Vrátí verzi, do které jsou potvrzené všechny zápisy, vhodnou jako výchozí značka pro nacist_zmeny().
+
+    Parametry:
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+
+    Návratová hodnota:
+        int: aktuální verze, nebo None při chybě.
+    """
+    try:
+        if pripojeni is None:
+            pripojeni = ziskat_pripojeni_pro_cteni()
+            je_samostatne_spojeni = True
+        else:
+            je_samostatne_spojeni = False
+
+        if not pripojeni:
+            print("Nelze se připojit k databázi.\n")
+            return None
+
+        kurzor = pripojeni.cursor()
+        return _bezpecna_verze(kurzor)
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při načítání verze změn", chyba)
+        return None
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
+            pripojeni.close()
+
+
+@_merena_operace
+def nacist_zmeny(od_verze=0, pripojeni=None):
+    """
+    Vrátí úkoly vložené, upravené nebo odstraněné po dané verzi.
+    Všechno se čte z jednoho snímku databáze a vrácená verze nepřeskočí žádný
+    dosud nepotvrzený zápis, takže je bezpečnou značkou pro další volání.
+    Úkoly změněné po značce se zároveň zneplatní v cache čtení.
+
+    Parametry:
+        od_verze (int): značka z předchozího volání (0 = od začátku).
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+
+    Návratová hodnota:
+        dict: 'vlozene' a 'upravene' (seznamy záznamů ZmenenyUkol), 'smazane' (seznam ID)
+        a 'verze' (nová značka); při chybě None.
+    """
+    try:
+        if pripojeni is None:
+            pripojeni = ziskat_pripojeni_pro_cteni()
+            je_samostatne_spojeni = True
+        else:
+            je_samostatne_spojeni = False
+
+        if not pripojeni:
+            print("Nelze se připojit k databázi.\n")
+            return None
+
+        zahajena_transakce = not pripojeni.in_transaction
+        if zahajena_transakce:
+            pripojeni.start_transaction()
+        kurzor = pripojeni.cursor()
+        do_verze = _bezpecna_verze(kurzor, od_verze)
+        kurzor.execute(
+            "SELECT id, nazev, popis, stav, verze, verze_vlozeni FROM ukoly "
+            "WHERE verze > %s AND verze <= %s ORDER BY verze, id",
+            (od_verze, do_verze),
+        )
+        zmenene = list(map(ZmenenyUkol, kurzor.fetchall()))
+        kurzor.execute(
+            "SELECT id FROM ukoly_smazane WHERE verze > %s AND verze <= %s ORDER BY verze, id",
+            (od_verze, do_verze),
+        )
+        smazane = [radek[0] for radek in kurzor.fetchall()]
+        if zahajena_transakce:
+            pripojeni.rollback()
+
+        if je_samostatne_spojeni:
+            _cache.zneplatnit([ukol.id for ukol in zmenene] + smazane)
+        return {
+            "vlozene": [ukol for ukol in zmenene if ukol.verze_vlozeni > od_verze],
+            "upravene": [ukol for ukol in zmenene if ukol.verze_vlozeni <= od_verze],
+            "smazane": smazane,
+            "verze": max(do_verze, od_verze),
+        }
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při načítání změn", chyba)
+        return None
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
+            pripojeni.close()
+
+
+# -----------------------------------
+# Import a export
+# -----------------------------------
+
+# sloupce exportu; import čte nazev, popis a nepovinný stav, ostatní ignoruje
+SLOUPCE_EXPORTU = Ukol.SLOUPCE
+
+
+def _format_souboru(soubor, format):
+    """Vrátí 'csv' nebo 'jsonl' podle parametru, bez něj podle přípony souboru."""
+    if format is None:
+        pripona = os.path.splitext(soubor)[1].lower()
+        format = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(pripona)
+    if format not in ("csv", "jsonl"):
+        raise ValueError(f"Neznámý formát souboru '{soubor}', použijte CSV nebo JSON Lines.")
+    return format
+
+
+@_merena_operace
+def exportovat_ukoly(
+    soubor, format=None, velikost_davky=VELIKOST_DAVKY_CTENI, prubeh=None, pripojeni=None,
+    vcetne_archivu=False,
+):
+    """
+    Zapíše všechny úkoly do souboru CSV nebo JSON Lines. Úkoly čte postupně
+    pomocí prochazet_vsechny_ukoly(), paměť tedy nezávisí na velikosti tabulky.
+    Zapisuje do dočasného souboru vedle cílového a přejmenuje ho až po
+    úspěšném dokončení, takže přerušený export nepřepíše starší soubor.
+
+    Parametry:
+        soubor (str): cesta k výstupnímu souboru.
+        format (str): 'csv' nebo 'jsonl'; bez zadání podle přípony souboru.
+        velikost_davky (int): počet řádků vyzvednutých najednou; po každé
+            dávce se zavolá 'prubeh'.
+        prubeh: funkce (pocet_zapsanych), nebo None.
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+        vcetne_archivu (bool): zapsat i úkoly z archivu.
+
+    Návratová hodnota:
+        int: počet zapsaných úkolů, nebo None při chybě.
+    """
+    format = _format_souboru(soubor, format)
+
+    if pripojeni is None:
+        pripojeni = ziskat_pripojeni_pro_cteni()
+        je_samostatne_spojeni = True
+    else:
+        je_samostatne_spojeni = False
+
+    if not pripojeni:
+        print("Nelze se připojit k databázi.\n")
+        return None
+
+    # prochazet_vsechny_ukoly() chybu jen zaznamená a skončí, pozná se podle
+    # nové chyby zachycené v tomto vlákně
+    predchozi_chyba = getattr(_stav_vlakna, "posledni_chyba", None)
+    docasny = f"{soubor}.castecny"
+    zapsano = 0
+    try:
+        with open(docasny, "w", encoding="utf-8", newline="") as vystup, closing(
+            prochazet_vsechny_ukoly(velikost_davky, pripojeni, vcetne_archivu)
+        ) as radky:
+            if format == "csv":
+                zapisovac = csv.writer(vystup)
+                zapisovac.writerow(SLOUPCE_EXPORTU)
+                zapsat = zapisovac.writerow
+            else:
+                def zapsat(ukol):
+                    vystup.write(json.dumps(ukol.jako_slovnik(), ensure_ascii=False) + "\n")
+
+            for ukol in radky:
+                zapsat(ukol)
+                zapsano += 1
+                if prubeh is not None and zapsano % velikost_davky == 0:
+                    prubeh(zapsano)
+        if getattr(_stav_vlakna, "posledni_chyba", None) is not predchozi_chyba:
+            os.remove(docasny)
+            return None
+        os.replace(docasny, soubor)
+        if prubeh is not None and zapsano % velikost_davky:
+            prubeh(zapsano)
+        return zapsano
+    except OSError as chyba:
+        print(f"Chyba při zápisu souboru: {chyba}\n")
+        if os.path.exists(docasny):
+            os.remove(docasny)
+        return None
+    finally:
+        if je_samostatne_spojeni:
+            pripojeni.close()
+
+
+def _klic_importu(soubor):
+    """Určí soubor importu podle cesty, velikosti a času změny."""
+    info = os.stat(soubor)
+    popis = f"{os.path.abspath(soubor)}|{info.st_size}|{info.st_mtime_ns}"
+    return hashlib.sha1(popis.encode("utf-8")).hexdigest()
+
+
+def _cist_radky_importu(vstup, format):
+    """Postupně vrací řádky vstupu jako slovníky; neplatný řádek JSON jako None."""
+    if format == "csv":
+        yield from csv.DictReader(vstup)
+        return
+    for radek in vstup:
+        if not radek.strip():
+            continue
+        try:
+            ukol = json.loads(radek)
+        except ValueError:
+            yield None
+            continue
+        yield ukol if isinstance(ukol, dict) else None
+
+
+def _ukol_z_radku(radek):
+    """
+    Vrátí dvojici (úkol, důvod): úkol jako trojici (nazev, popis, stav)
+    a důvod odmítnutí None, nebo úkol None a důvod odmítnutí řádku.
+    """
+    if radek is None:
+        return None, "Řádek není platný objekt JSON."
+    nazev = radek.get("nazev")
+    popis = radek.get("popis")
+    duvod = _duvod_odmitnuti(nazev, popis)
+    if duvod is not None:
+        return None, duvod
+    stav = radek.get("stav") or "nezahájeno"
+    if stav not in STAVY:
+        return None, f"Neplatný stav '{stav}'."
+    return (nazev, popis, stav), None
+
+
+def _zapsat_davku_importu(pripojeni, kurzor, davka, hromadne, postup):
+    """
+    Vloží dávku importu a v téže transakci uloží postup (klic, soubor,
+    zpracovano, dokonceno). Vrátí False, pokud se dávku nepodařilo zapsat.
+    """
+    try:
+        if davka:
+            verze = _dalsi_verze(pripojeni)
+            radky = [(nazev, popis, stav, verze, verze) for nazev, popis, stav in davka]
+            if hromadne:
+                _uloziste.nacist_soubor(kurzor, radky)
+            else:
+                kurzor.executemany(
+                    "INSERT INTO ukoly (nazev, popis, stav, verze, verze_vlozeni) "
+                    "VALUES (%s, %s, %s, %s, %s)",
+                    radky,
+                )
+        kurzor.execute(
+            "REPLACE INTO importy (klic, soubor, zpracovano, dokonceno) VALUES (%s, %s, %s, %s)",
+            postup,
+        )
+        pripojeni.commit()
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při importu úkolů", chyba)
+        pripojeni.rollback()
+        return False
+    if davka:
+        # import zapisuje přes vlastní spojení mimo pool
+        _zaznamenat_zapis()
+        _cache.zneplatnit()
+    return True
+
+
+@_merena_operace
+def importovat_ukoly(
+    soubor, format=None, velikost_davky=VELIKOST_DAVKY, pokracovat=True, prubeh=None,
+    pripojeni=None,
+):
+    """
+    Vloží úkoly ze souboru CSV nebo JSON Lines (např. z exportovat_ukoly())
+    jako nové úkoly. Soubor čte postupně a zapisuje po dávkách, každou
+    dávku v jedné transakci spolu se záznamem postupu v tabulce 'importy'.
+    Přerušený import proto při dalším volání pokračuje za poslední
+    potvrzenou dávkou. Dovoluje-li to server MySQL, posílá dávky příkazem
+    LOAD DATA LOCAL INFILE.
+
+    Řádek musí mít neprázdný 'nazev' a 'popis'; 'stav' je nepovinný
+    (výchozí 'nezahájeno'), ostatní sloupce včetně 'id' se ignorují.
+
+    Parametry:
+        soubor (str): cesta ke vstupnímu souboru.
+        format (str): 'csv' nebo 'jsonl'; bez zadání podle přípony souboru.
+        velikost_davky (int): počet řádků vstupu zpracovaných v jedné transakci.
+        pokracovat (bool): navázat na dřívější import téhož (nezměněného)
+            souboru; False začne od začátku.
+        prubeh: funkce (zpracovano, vlozeno) volaná po každé potvrzené dávce, nebo None.
+        pripojeni: Pokud není parametr zadán, otevře se vlastní spojení
+            (v MySQL s povoleným LOAD DATA LOCAL INFILE).
+
+    Návratová hodnota:
+        dict: 'vlozeno' (úkoly vložené tímto voláním), 'preskoceno' (řádky
+        zpracované dřívějším importem), 'odmitnute' (seznam dvojic (pořadí
+        řádku, důvod)) a 'dokonceno' (False, pokud import přerušila chyba
+        databáze); None, pokud se nelze připojit.
+    """
+    if velikost_davky < 1:
+        raise ValueError("Velikost dávky musí být alespoň 1.")
+    format = _format_souboru(soubor, format)
+    klic = _klic_importu(soubor)
+
+    if pripojeni is None:
+        pripojeni = _uloziste.pripojit_pro_import()
+        je_samostatne_spojeni = True
+    else:
+        je_samostatne_spojeni = False
+
+    if not pripojeni:
+        print("Nelze se připojit k databázi.\n")
+        return None
+
+    vysledek = {"vlozeno": 0, "preskoceno": 0, "odmitnute": [], "dokonceno": False}
+    try:
+        kurzor = pripojeni.cursor()
+        if pokracovat:
+            kurzor.execute("SELECT zpracovano FROM importy WHERE klic = %s", (klic,))
+            radek = kurzor.fetchone()
+            vysledek["preskoceno"] = radek[0] if radek else 0
+        # LOAD DATA jen přes spojení otevřené pro import, pool ho nepovoluje
+        hromadne = je_samostatne_spojeni and _uloziste.lze_nacist_soubor(kurzor)
+
+        potvrzeno = zpracovano = vysledek["preskoceno"]
+        davka = []
+        with open(soubor, encoding="utf-8-sig", newline="") as vstup:
+            for poradi, radek in enumerate(_cist_radky_importu(vstup, format)):
+                if poradi < potvrzeno:
+                    continue
+                zpracovano = poradi + 1
+                ukol, duvod = _ukol_z_radku(radek)
+                if duvod is not None:
+                    vysledek["odmitnute"].append((poradi, duvod))
+                else:
+                    davka.append(ukol)
+                if zpracovano - potvrzeno >= velikost_davky:
+                    if not _zapsat_davku_importu(
+                        pripojeni, kurzor, davka, hromadne, (klic, soubor, zpracovano, 0)
+                    ):
+                        return vysledek
+                    vysledek["vlozeno"] += len(davka)
+                    potvrzeno = zpracovano
+                    davka = []
+                    if prubeh is not None:
+                        prubeh(zpracovano, vysledek["vlozeno"])
+
+        if not _zapsat_davku_importu(
+            pripojeni, kurzor, davka, hromadne, (klic, soubor, zpracovano, 1)
+        ):
+            return vysledek
+        vysledek["vlozeno"] += len(davka)
+        vysledek["dokonceno"] = True
+        if prubeh is not None and zpracovano > potvrzeno:
+            prubeh(zpracovano, vysledek["vlozeno"])
+        return vysledek
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při importu úkolů", chyba)
+        return vysledek
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if je_samostatne_spojeni:
+            pripojeni.close()
+
+
+# -----------------------------------
+# Archivace
+# -----------------------------------
+
+SLOUPCE_ARCHIVU = "id, nazev, popis, stav, datum_vytvoreni, verze, verze_vlozeni"
+
+
+def _archivovat_davku(pripojeni, kurzor, sekund, velikost_davky):
+    """
+    V jedné transakci přesune do archivu nejvýše 'velikost_davky' hotových úkolů
+    vytvořených před více než 'sekund' sekundami. Vrátí seznam přesunutých ID,
+    nebo None při chybě.
+    """
+    try:
+        podminka_stari = _uloziste.podminka_stari.format(sloupec="datum_vytvoreni")
+        kurzor.execute(
+            f"SELECT id FROM ukoly WHERE stav = 'hotovo' AND {podminka_stari} "
+            f"ORDER BY datum_vytvoreni, id LIMIT %s{_uloziste.pro_upravu}",
+            (sekund, velikost_davky),
+        )
+        seznam_id = [radek[0] for radek in kurzor.fetchall()]
+        if not seznam_id:
+            pripojeni.rollback()
+            return []
+        verze = _dalsi_verze(pripojeni)
+        zastupci = ", ".join(["%s"] * len(seznam_id))
+        kurzor.execute(
+            f"INSERT INTO ukoly_archiv ({SLOUPCE_ARCHIVU}) "
+            f"SELECT {SLOUPCE_ARCHIVU} FROM ukoly WHERE id IN ({zastupci})",
+            seznam_id,
+        )
+        kurzor.execute(f"DELETE FROM ukoly WHERE id IN ({zastupci})", seznam_id)
+        # pro sledování změn úkol z tabulky ukoly zmizel stejně jako odstraněný
+        kurzor.executemany(
+            "REPLACE INTO ukoly_smazane (id, verze) VALUES (%s, %s)",
+            [(id_ukolu, verze) for id_ukolu in seznam_id],
+        )
+        pripojeni.commit()
+    except ChybaDatabaze as chyba:
+        _nahlasit_chybu("Chyba při archivaci úkolů", chyba)
+        pripojeni.rollback()
+        return None
+    _cache.zneplatnit(seznam_id)
+    return seznam_id
+
+
+@_merena_operace
+def archivovat_ukoly(
+    starsi_nez_dnu=STARI_ARCHIVACE_DNU, velikost_davky=VELIKOST_DAVKY_ARCHIVACE, pauza=0.0,
+    prubeh=None, pripojeni=None,
+):
+    """
+    Přesune hotové úkoly vytvořené před více než 'starsi_nez_dnu' dny z tabulky
+    ukoly do tabulky ukoly_archiv, aby čtení aktivních i všech úkolů zůstalo
+    rychlé. Přesouvá po dávkách, každou v samostatné krátké transakci, takže
+    zámky drží vždy jen na řádcích jedné dávky. Archivované úkoly se ve
+    sledování změn hlásí jako odstraněné; číst je lze s parametrem
+    vcetne_archivu u nacist_vsechny_ukoly_z_databaze(), prochazet_vsechny_ukoly()
+    a exportovat_ukoly().
+
+    Parametry:
+        starsi_nez_dnu (float): minimální stáří úkolu podle sloupce datum_vytvoreni.
+        velikost_davky (int): počet úkolů přesunutých jednou transakcí.
+        pauza (float): kolik sekund počkat mezi dávkami, aby se vystřídaly jiné zápisy.
+        prubeh: funkce (pocet_presunutych) volaná po každé dávce, nebo None.
+        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
+
+    Návratová hodnota:
+        int: počet přesunutých úkolů, nebo None při chybě; dávky potvrzené
+        před chybou zůstávají v archivu.
+    """
+    if velikost_davky < 1:
+        raise ValueError("Velikost dávky musí být alespoň 1.")
+
+    if pripojeni is None:
+        pripojeni = ziskat_pripojeni()
+        je_samostatne_spojeni = True
+    else:
+        je_samostatne_spojeni = False
+
+    if not pripojeni:
+        print("Nelze se připojit k databázi.\n")
+        return None
+
+    sekund = int(starsi_nez_dnu * 24 * 3600)
+    presunuto = 0
+    try:
+        kurzor = pripojeni.cursor()
+        while True:
+            presunuta = _archivovat_davku(pripojeni, kurzor, sekund, velikost_davky)
+            if presunuta is None:
+                return None
+            presunuto += len(presunuta)
+            if presunuta and prubeh is not None:
+                prubeh(presunuto)
+            if len(presunuta) < velikost_davky:
+                return presunuto
+            if pauza:
+                time.sleep(pauza)
+    finally:
+        if "kurzor" in locals():
+            kurzor.close()
+        if je_samostatne_spojeni:
+            pripojeni.close()
+
+
+if os.environ.get("PATY_REPLIKY"):
+    nastavit_repliky(os.environ["PATY_REPLIKY"].split(","))
+
+if os.environ.get("PATY_ZAPIS_NA_POZADI") == "1":
+    nastavit_zapis_na_pozadi()
@@ -1,247 +1,12 @@
 import os
-import mysql.connector
-from mysql.connector import Error
-import tkinter.messagebox as msgbox
 
-ukoly = []
-
-# vytvoření připojení databáze
-def pripojeni_k_databazi():
-    """
-    Připojí se k databázi 'ukoly_db' na lokálním serveru MySQL s danými přihlašovacími údaji.
-
-    Návratová hodnota:
-       Pokud je připojení úspěšné, vypíše hlášení o úspěchu a vrátí objekt spojení.
-       Pokud dojde k chybě, vypíše chybové hlášení a vrátí None.
-    """
-
-    try:
-        pripojeni = mysql.connector.connect(
-            host="127.0.0.1", user="root", password="1234", database="ukoly_db"
-        )
-        if pripojeni.is_connected():
-            print("Úspěšně připojeno k databázi\n")
-            return pripojeni
-    except Error as chyba:
-        print(f"Chyba při připojení k databázi: {chyba}\n")
-        return None
-
-
-# vytvoření tabulky pokud neexistuje
-def vytvoreni_tabulky_v_databazi(pripojeni):
-    """
-    Vytvoří v předaném spojení databáze tabulku 'ukoly', pokud ještě neexistuje.
-    Pokud dojde k chybě během vytváření, vypíše chybové hlášení.
-    Po úspěšném nebo selhávajícím pokusu zavře spojení.
-
-    Parametry:
-        pripojeni: aktivní spojení s databází
-    """
-
-    try:
-        kurzor = pripojeni.cursor()
-        kurzor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS ukoly (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                nazev VARCHAR(255) NOT NULL,
-                popis TEXT,
-                stav ENUM('nezahájeno', 'hotovo', 'probíhá') NOT NULL,
-                datum_vytvoreni TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """
-        )
-        pripojeni.commit()
-        print("Tabulka 'ukoly' je připravena.\n")
-    except Error as chyba:
-        print(f"Chyba při vytváření tabulky: {chyba}\n")
-    finally:
-        kurzor.close()
-        pripojeni.close()
-
-
-def uloz_ukol_do_databaze(nazev, popis, pripojeni=None):
-    """
-        Uloží nový úkol do databáze s výchozím stavem 'nezahájeno'.
-    Ověří, že 'nazev' a 'popis' nejsou prázdné nebo obsahující pouze mezery.
-
-        Parametry:
-            nazev (str): název úkolu; nesmí být prázdný.
-            popis (str): popis úkolu; nesmí být prázdný.
-            pripojeni: Pokud není parametr zadán, bude použito defaultní připojení.
-
-        Návratová hodnota:
-            bool: úspěšnost operace.
-    """
-    # Kontrola platnosti vstupních dat
-    if not nazev or not nazev.strip():
-        return False
-    if not popis or not popis.strip():
-        return False
-
-    if pripojeni is None:
-        pripojeni = pripojeni_k_databazi()
-        je_samostatne_spojeni = True
-    else:
-        je_samostatne_spojeni = False
-
-    if not pripojeni:
-        print("Nelze se připojit k databázi.\n")
-        return False
-
-    try:
-        kurzor = pripojeni.cursor()
-        kurzor.execute(
-            "INSERT INTO ukoly (nazev, popis, stav) VALUES (%s, %s, %s)",
-            (nazev, popis, "nezahájeno"),
-        )
-        pripojeni.commit()
-        if kurzor.rowcount == 0:
-            return False
-        kurzor.fetchall()
-        return True
-    except Error as chyba:
-        print(f"Chyba při ukládání úkolu do databáze: {chyba}\n")
-        return False
-    finally:
-        if "kurzor" in locals():
-            kurzor.close()
-        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
-            pripojeni.close()
-
-
-def nacist_ukoly_z_databaze(pripojeni=None):
-    """Načte a vrátí všechny úkoly se stavem 'nezahájeno' nebo 'probíhá' z databáze.
-
-    Parametry:
-        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
-
-    Návratová hodnota:
-        list: seznam úkolů nebo prázdný seznam při chybě či nepoužitelných datech
-    """
-    try:
-        if pripojeni is None:
-            pripojeni = pripojeni_k_databazi()
-            je_samostatne_spojeni = True
-        else:
-            je_samostatne_spojeni = False
-
-        if not pripojeni:
-            print("Nelze se připojit k databázi.\n")
-            return []
-
-        kurzor = pripojeni.cursor(dictionary=True)
-        kurzor.execute(
-            "SELECT id, nazev, popis, stav FROM ukoly WHERE stav IN ('nezahájeno', 'probíhá')"
-        )
-        ukoly = kurzor.fetchall()
-        return ukoly
-    except Error as chyba:
-        print(f"Chyba při načítání úkolů: {chyba}\n")
-        return []
-    finally:
-        if "kurzor" in locals():
-            kurzor.close()
-        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
-            pripojeni.close()
-
-def nacist_vsechny_ukoly_z_databaze(pripojeni=None):
-    """Načte a vrátí všechny úkoly bez ohledu na stav z databáze.
-    
-    Parametry:
-        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
-
-    Návratová hodnota:
-        list: seznam úkolů nebo prázdný seznam při chybě či nepoužitelných datech.
-    """
-    try:
-        pripojeni = pripojeni_k_databazi()
-        if not pripojeni:
-            print("Nelze se připojit k databázi.")
-            return []
-
-        kurzor = pripojeni.cursor(dictionary=True)
-        kurzor.execute("SELECT id, nazev, popis, stav FROM ukoly")
-        ukoly = kurzor.fetchall()
-        kurzor.close()
-        pripojeni.close()
-        return ukoly
-    except Error:
-        return []
-
-
-def zmenit_stav_ukolu_v_databazi(id_ukolu, novy_stav, pripojeni=None):
-    """Aktualizuje stav úkolu v databázi podle ID.
-
-    Parametry:
-        id_ukolu (int): ID úkolu v databázi.
-        novy_stav (str): Nový stav ('nezahájeno', 'hotovo', 'probíhá').
-        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
-
-    Návratová hodnota:
-        bool: úspěšnost operace.
-    """
-    try:
-        if pripojeni is None:
-            pripojeni = pripojeni_k_databazi()
-            je_samostatne_spojeni = True
-        else:
-            je_samostatne_spojeni = False
-
-        if not pripojeni:
-            print("Nelze se připojit k databázi.\n")
-            return False
-        kurzor = pripojeni.cursor()
-        kurzor.execute("UPDATE ukoly SET stav=%s WHERE id=%s", (novy_stav, id_ukolu))
-        pripojeni.commit()
-        if kurzor.rowcount == 0:
-            return False
-        return True
-    except Error as chyba:
-        print(f"Chyba při aktualizaci stavu: {chyba}\n")
-        return False
-    finally:
-        if "kurzor" in locals():
-            kurzor.close()
-        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
-            pripojeni.close()
-
-
-def odstranit_ukol_z_databaze(id_ukolu, pripojeni=None):
-    """Odstraní úkol s daným ID z databáze.
-
-    Parametry:
-        id_ukolu (int): ID úkolu v databázi.
-        pripojeni: Pokud není předán parametr připojení, použije defaultní připojení.
-
-    Návratová hodnota:
-        bool: úspěšnost operace.
-    """
-    try:
-        if pripojeni is None:
-            pripojeni = pripojeni_k_databazi()
-            je_samostatne_spojeni = True
-        else:
-            je_samostatne_spojeni = False
-
-        if not pripojeni:
-            print("Nelze se připojit k databázi.\n")
-            return False
-        kurzor = pripojeni.cursor()
-        kurzor.execute("DELETE FROM ukoly WHERE id=%s", (id_ukolu,))
-        pripojeni.commit()
-        if kurzor.rowcount == 0:
-            return False
-        return True
-
-    except Error as chyba:
-        print(f"Chyba při odstraňování: {chyba}\n")
-        return False
-    finally:
-        if "kurzor" in locals():
-            kurzor.close()
-        if "je_samostatne_spojeni" in locals() and je_samostatne_spojeni:
-            pripojeni.close()
+# Textové menu správce úkolů. Funkce pro práci s úkoly jsou v modulu jadro;
+# zde se importují všechny, aby je šlo dál používat i přes paty_projekt.
+try:
+    from .jadro import *
+except ImportError:
+    # spuštění jako skript ze složky src
+    from jadro import *
 
 
 # hlavní menu programu
@@ -256,9 +21,14 @@ def hlavni_menu():
         print("2. Zobrazit úkoly")
         print("3. Aktualizovat úkol")
         print("4. Odstranit úkol")
-        print("5. Konec programu\n")
-
-        volba = input("Vyberte možnost (1-5): ")
+        print("5. Hledat úkoly")
+        print("6. Statistiky dotazů")
+        print("7. Export úkolů do souboru")
+        print("8. Import úkolů ze souboru")
+        print("9. Archivace hotových úkolů")
+        print("10. Konec programu\n")
+
+        volba = input("Vyberte možnost (1-10): ")
         print()
 
         if volba == "1":
@@ -274,12 +44,123 @@ def hlavni_menu():
             odstranit_ukol()
             print()
         elif volba == "5":
+            hledat_ukol()
+            print()
+        elif volba == "6":
+            zobrazit_statistiky_dotazu()
+            print()
+        elif volba == "7":
+            export_ukolu()
+            print()
+        elif volba == "8":
+            import_ukolu()
+            print()
+        elif volba == "9":
+            archivace_ukolu()
+            print()
+        elif volba == "10":
             print("Konec programu.")
             break
         else:
             print("Neplatná volba, zkuste to znovu.\n")
 
 
+# výpis metrik dotazů v programu
+def zobrazit_statistiky_dotazu():
+    """Vypíše počty a doby operací, nejdražší dotazy a log pomalých dotazů."""
+    print("Statistiky dotazů:\n")
+    for radek in popis_metrik():
+        print(radek)
+
+
+# export úkolů v programu
+def export_ukolu():
+    """
+    Zapíše všechny úkoly včetně archivovaných do zadaného souboru CSV nebo
+    JSON Lines a průběžně hlásí počet.
+    """
+
+    soubor = input("Zadejte cílový soubor (.csv nebo .jsonl): ").strip()
+    try:
+        zapsano = exportovat_ukoly(
+            soubor,
+            prubeh=lambda pocet: print(f"\rZapsáno {pocet} úkolů", end="", flush=True),
+            vcetne_archivu=True,
+        )
+    except ValueError as chyba:
+        print(f"{chyba}\n")
+        return
+    print()
+    if zapsano is None:
+        print("Export se nezdařil.\n")
+    else:
+        print(f"Do souboru {soubor} bylo zapsáno {zapsano} úkolů.\n")
+
+
+# archivace hotových úkolů v programu
+def archivace_ukolu():
+    """
+    Přesune hotové úkoly starší než zadaný počet dní (výchozí STARI_ARCHIVACE_DNU)
+    do archivu a průběžně hlásí jejich počet.
+    """
+
+    zadano = input(f"Archivovat hotové úkoly starší než kolik dní? [{STARI_ARCHIVACE_DNU}]: ")
+    try:
+        dnu = float(zadano) if zadano.strip() else STARI_ARCHIVACE_DNU
+    except ValueError:
+        print("Zadejte počet dní jako číslo.\n")
+        return
+    if dnu < 0:
+        print("Počet dní nesmí být záporný.\n")
+        return
+    presunuto = archivovat_ukoly(
+        dnu, prubeh=lambda pocet: print(f"\rArchivováno {pocet} úkolů", end="", flush=True)
+    )
+    print()
+    if presunuto is None:
+        print("Archivace se nezdařila.\n")
+    else:
+        print(f"Do archivu bylo přesunuto {presunuto} úkolů.\n")
+
+
+# import úkolů v programu
+def import_ukolu():
+    """
+    Vloží úkoly ze zadaného souboru CSV nebo JSON Lines a průběžně hlásí postup.
+    Přerušený import téhož souboru pokračuje od poslední potvrzené dávky.
+    """
+
+    soubor = input("Zadejte soubor k importu (.csv nebo .jsonl): ").strip()
+    if not os.path.isfile(soubor):
+        print("Soubor neexistuje.\n")
+        return
+
+    try:
+        vysledek = importovat_ukoly(
+            soubor,
+            prubeh=lambda zpracovano, vlozeno: print(
+                f"\rZpracováno {zpracovano} řádků, vloženo {vlozeno} úkolů", end="", flush=True
+            ),
+        )
+    except ValueError as chyba:
+        print(f"{chyba}\n")
+        return
+    print()
+    if vysledek is None:
+        print("Import se nezdařil.\n")
+        return
+    if vysledek["preskoceno"]:
+        print(f"Přeskočeno {vysledek['preskoceno']} řádků z dřívějšího importu.")
+    print(f"Vloženo {vysledek['vlozeno']} úkolů.")
+    for poradi, duvod in vysledek["odmitnute"][:10]:
+        print(f"  řádek {poradi + 1}: {duvod}")
+    if len(vysledek["odmitnute"]) > 10:
+        print(f"  ... a dalších {len(vysledek['odmitnute']) - 10} odmítnutých řádků")
+    if not vysledek["dokonceno"]:
+        print("Import byl přerušen, dalším spuštěním bude pokračovat.")
+    print()
+
+
 # přidání úkolu v programu
 def pridat_ukol():
     """
@@ -290,7 +171,7 @@ def pridat_ukol():
     Název nesmí být prázdný nebo obsahovat pouze mezery a délka nesmí přesáhnout 50 znaků.
     Popis nesmí být prázdný nebo obsahovat pouze mezery a délka nesmí přesáhnout 200 znaků.
 
-    Pokud jsou data platná, uloží je a případně přidá do seznamu úkolů.
+    Pokud jsou data platná, uloží je a přidá do seznamu naposledy přidaných úkolů.
     """
 
     while True:
@@ -306,9 +187,8 @@ def pridat_ukol():
         else:
             uspesne = uloz_ukol_do_databaze(nazev, popis)
             if uspesne:
-                # Přidat do seznamu, pokud existuje
-                if "ukoly" in globals():
-                    ukoly.append({"nazev": nazev, "popis": popis})
+                # Přidat do seznamu naposledy přidaných úkolů (nejstarší vypadne)
+                ukoly.append(Ukol((None, nazev, popis, "nezahájeno")))
                 print(f'\nÚkol "{nazev}" byl úspěšně uložen.')
             break
 
@@ -319,57 +199,145 @@ def zobrazit_aktivni_ukoly():
     Načte a zobrazí všechny úkoly se stavem 'nezahájeno' nebo 'probíhá' z databáze.
     Pokud žádné takové úkoly nejsou, vypíše informaci, že seznam je prázdný.
     Jinak vypíše ID, název, popis a stav každého aktivního úkolu.
+    Úkoly vypisuje po stránkách a před každou další stránkou se zeptá,
+    zda ji má zobrazit.
     """
 
-    ukoly = nacist_ukoly_z_databaze()
+    ukoly, po_id = nacist_stranku_aktivnich_ukolu()
 
     if not ukoly:
         print("Žádné úkoly se stavem 'nezahájeno' nebo 'probíhá'.\n")
-    else:
-        print("Aktivní úkoly:\n")
+        return
+
+    print("Aktivní úkoly:\n")
+    while True:
         for ukol in ukoly:
-            print(f"ID: {ukol['id']}")
-            print(f"Název: {ukol['nazev']}")
-            print(f"Popis: {ukol['popis']}")
-            print(f"Stav: {ukol['stav']}\n")
+            print(f"ID: {ukol.id}")
+            print(f"Název: {ukol.nazev}")
+            print(f"Popis: {ukol.popis}")
+            print(f"Stav: {ukol.stav}\n")
+
+        if po_id is None:
+            break
+        pokracovat = input("Zobrazit další stránku? (ano/ne): ").strip().lower()
+        print()
+        if pokracovat != "ano":
+            break
+        ukoly, po_id = nacist_stranku_aktivnich_ukolu(po_id)
 
 
-# aktualizace stavu úkolu v programu
-def aktualizovat_ukol():
+def hledat_ukol():
     """
-    Načte všechny úkoly, vybere podle ID a umožní změnit jejich stav.
-
-    Zobrazí seznam úkolů.
-    Uživatel zadá ID úkolu pro aktualizaci.
-    Zvolí nový stav ('probíhá' nebo 'hotovo') a potvrdí změnu.
-    Pokud je operace potvrzena, stav úkolu se aktualizuje v databázi.
-    Pokud je zadané ID neexistující nebo operace není potvrzena, operace se neprovede.
+    Zeptá se na hledaná slova a volitelně na stav, pak vypíše nalezené úkoly
+    od nejrelevantnějších po stránkách stejně jako zobrazit_aktivni_ukoly().
     """
 
-    ukoly = nacist_ukoly_z_databaze()
+    text = input("Zadejte hledaná slova: ").strip()
+    stav = input(f"Omezit na stav ({', '.join(STAVY)}, Enter = všechny): ").strip()
+    print()
+    if stav and stav not in STAVY:
+        print("Neplatný stav.\n")
+        return
+
+    ukoly, dalsi = hledat_ukoly(text, stavy=stav or None)
 
     if not ukoly:
-        print("Žádné úkoly k aktualizaci.\n")
+        print("Žádné úkoly neodpovídají hledání.\n")
         return
 
-    print("Seznam úkolů:\n")
-    for ukol in ukoly:
-        print(f"ID: {ukol['id']} | Název: {ukol['nazev']} | Stav: {ukol['stav']}")
+    print("Nalezené úkoly:\n")
+    while True:
+        for ukol in ukoly:
+            print(f"ID: {ukol.id}")
+            print(f"Název: {ukol.nazev}")
+            print(f"Popis: {ukol.popis}")
+            print(f"Stav: {ukol.stav}\n")
 
+        if dalsi is None:
+            break
+        pokracovat = input("Zobrazit další stránku? (ano/ne): ").strip().lower()
+        print()
+        if pokracovat != "ano":
+            break
+        ukoly, dalsi = hledat_ukoly(text, stavy=stav or None, po=dalsi)
+
+
+def _vybrat_ukoly(vyzva, ukoly):
+    """
+    Opakovaně se ptá na ID úkolů oddělená čárkou, dokud všechna nejsou platná
+    a neexistují v předaném seznamu (vypsaných) úkolů.
+
+    Návratová hodnota:
+        list: vybrané úkoly v pořadí zadání.
+    """
+    podle_id = {ukol.id: ukol for ukol in ukoly}
     while True:
         try:
-            volba = input("Zadejte ID úkolu, který chcete upravit: ").strip()
-            id_ukolu = int(volba)
+            volba = input(vyzva).strip()
+            seznam_id = [int(cast) for cast in volba.split(",") if cast.strip()]
         except ValueError:
             print("Neplatné ID. Zkuste znovu.\n")
             continue
 
-        shoda_ukolu = next((_ for _ in ukoly if _["id"] == id_ukolu), None)
-        if not shoda_ukolu:
+        if not seznam_id:
+            print("Neplatné ID. Zkuste znovu.\n")
+            continue
+        if any(id_ukolu not in podle_id for id_ukolu in seznam_id):
             print("ID neexistuje, zkuste znovu.\n")
             continue
-        else:
+        return [podle_id[id_ukolu] for id_ukolu in dict.fromkeys(seznam_id)]
+
+
+def _vybrat_ukoly_ze_stranek(nacist_stranku, vyzva):
+    """
+    Vypisuje úkoly po stránkách funkcí nacist_stranku(po_id) a před každou
+    další stránkou se zeptá, zda ji má zobrazit; pak nechá vybrat úkoly
+    podle ID z vypsaných stránek (viz _vybrat_ukoly).
+
+    Návratová hodnota:
+        list: vybrané úkoly, nebo prázdný seznam, pokud žádné úkoly nejsou.
+    """
+    ukoly, po_id = nacist_stranku(None)
+    if not ukoly:
+        return []
+
+    vypsane = []
+    print("Seznam úkolů:\n")
+    while True:
+        for ukol in ukoly:
+            print(f"ID: {ukol.id} | Název: {ukol.nazev} | Stav: {ukol.stav}")
+        vypsane.extend(ukoly)
+
+        if po_id is None:
+            break
+        pokracovat = input("Zobrazit další stránku? (ano/ne): ").strip().lower()
+        print()
+        if pokracovat != "ano":
             break
+        ukoly, po_id = nacist_stranku(po_id)
+
+    return _vybrat_ukoly(vyzva, vypsane)
+
+
+# aktualizace stavu úkolu v programu
+def aktualizovat_ukol():
+    """
+    Vypíše aktivní úkoly po stránkách, vybere podle ID a umožní změnit jejich stav.
+
+    Zobrazí seznam úkolů (stránku po stránce).
+    Uživatel zadá ID úkolu pro aktualizaci, případně více ID oddělených čárkou.
+    Zvolí nový stav ('probíhá' nebo 'hotovo') a potvrdí změnu.
+    Pokud je operace potvrzena, stav úkolu se aktualizuje v databázi.
+    Pokud je zadané ID neexistující nebo operace není potvrzena, operace se neprovede.
+    """
+
+    vybrane = _vybrat_ukoly_ze_stranek(
+        nacist_stranku_aktivnich_ukolu,
+        "Zadejte ID úkolu, který chcete upravit (více ID oddělte čárkou): ",
+    )
+    if not vybrane:
+        print("Žádné úkoly k aktualizaci.\n")
+        return
 
     while True:
         stav_volba = (
@@ -380,18 +348,26 @@ def aktualizovat_ukol():
         else:
             print("Neplatná volba. Zvolte 'probíhá' nebo 'hotovo'.\n")
 
+    if len(vybrane) == 1:
+        popis_vyberu = f"úkolu '{vybrane[0].nazev}'"
+    else:
+        popis_vyberu = f"{len(vybrane)} vybraných úkolů"
+
     # Smyčka potvrzení operace
     while True:
         potvrdit = (
-            input(
-                f"Chcete změnit stav úkolu '{shoda_ukolu['nazev']}' na '{stav_volba}'? (ano/ne): "
-            )
+            input(f"Chcete změnit stav {popis_vyberu} na '{stav_volba}'? (ano/ne): ")
             .strip()
             .lower()
         )
         if potvrdit == "ano":
             # provedeme aktualizaci
-            potvrzeni = zmenit_stav_ukolu_v_databazi(id_ukolu, stav_volba)
+            if len(vybrane) == 1:
+                potvrzeni = zmenit_stav_ukolu_v_databazi(vybrane[0].id, stav_volba)
+            else:
+                potvrzeni = zmenit_stav_ukolu_hromadne(
+                    [ukol.id for ukol in vybrane], stav_volba
+                )
             if potvrzeni:
                 print("Stav úkolu byl úspěšně aktualizován.\n")
             else:
@@ -406,49 +382,40 @@ def aktualizovat_ukol():
 
 def odstranit_ukol():
     """
-    Načte všechny úkoly, zobrazí je, a podle zadaného ID umožní smazání.
+    Vypíše všechny úkoly po stránkách a podle zadaného ID umožní smazání.
 
     Není zde filtr na stav, zobrazí se všechny úkoly.
-    Uživatel zadá ID úkolu k odstranění.
+    Uživatel zadá ID úkolu k odstranění, případně více ID oddělených čárkou.
     Potvrdí operaci ('ano'/'ne').
     Pokud je operace potvrzena, úkol se odstraní z databáze.
     Pokud ID neexistuje nebo není potvrzeno, operace není provedena.
     """
-    ukoly = nacist_vsechny_ukoly_z_databaze()
-
-    if not ukoly:
+    vybrane = _vybrat_ukoly_ze_stranek(
+        nacist_stranku_vsech_ukolu,
+        "Zadejte ID úkolu, který chcete odstranit (více ID oddělte čárkou): ",
+    )
+    if not vybrane:
         print("Žádné úkoly k odstranění.\n")
         return
 
-    print("Seznam úkolů:\n")
-    for ukol in ukoly:
-        print(f"ID: {ukol['id']} | Název: {ukol['nazev']} | Stav: {ukol['stav']}")
-
-    while True:
-        try:
-            volba = input("Zadejte ID úkolu, který chcete odstranit: ").strip()
-            id_ukolu = int(volba)
-        except ValueError:
-            print("Neplatné ID. Zkuste znovu.\n")
-            continue
-
-        shoda_ukolu = next((_ for _ in ukoly if _["id"] == id_ukolu), None)
-        if not shoda_ukolu:
-            print("ID neexistuje, zkuste znovu.\n")
-            continue
-        else:
-            break
+    if len(vybrane) == 1:
+        popis_vyberu = f"úkol '{vybrane[0].nazev}'"
+    else:
+        popis_vyberu = f"vybrané úkoly (počet: {len(vybrane)})"
 
     # Potvrzení s opakováním, dokud nezadá správně
     while True:
         potvrdit = (
-            input(f"Opravdu chcete odstranit úkol '{shoda_ukolu['nazev']}'? (ano/ne): ")
+            input(f"Opravdu chcete odstranit {popis_vyberu}? (ano/ne): ")
             .strip()
             .lower()
         )
         if potvrdit == "ano":
             # provedeme odstranění
-            potvrzeni = odstranit_ukol_z_databaze(id_ukolu)
+            if len(vybrane) == 1:
+                potvrzeni = odstranit_ukol_z_databaze(vybrane[0].id)
+            else:
+                potvrzeni = odstranit_ukoly_hromadne([ukol.id for ukol in vybrane])
             if potvrzeni:
                 print("Úkol byl úspěšně odstraněn.\n")
             else:
@@ -1,62 +1,108 @@
+import os
+import json
+import sqlite3
+import time
 import pytest
 import mysql.connector
-from mysql.connector import Error
-from src.paty_projekt import (
+from src.jadro import (
+    ChybaDatabaze,
+    ChybaMySQL,
+    MIGRACE,
+    UlozisteMySQL,
+    UlozisteSQLite,
+    nastavit_uloziste,
+    CacheUkolu,
+    PoolPripojeni,
+    provest_migrace,
     uloz_ukol_do_databaze,
+    uloz_ukoly_hromadne,
     zmenit_stav_ukolu_v_databazi,
     odstranit_ukol_z_databaze,
+    zmenit_stav_ukolu_hromadne,
+    odstranit_ukoly_hromadne,
+    nacist_stranku_aktivnich_ukolu,
+    prochazet_vsechny_ukoly,
+    nacist_ukoly_v_rozsahu,
+    rozsah_id_ukolu,
+    pocet_ukolu,
+    id_ukolu_na_pozici,
+    aktualni_verze_zmen,
+    nacist_zmeny,
+    posledni_chyba,
+    je_cekani_na_zamek,
+    MetrikyDotazu,
+    _MerenyKurzor,
+    nastavit_metriky,
+    hledat_ukoly,
+    exportovat_ukoly,
+    importovat_ukoly,
+    Ukol,
+    ukoly,
+    POCET_NEDAVNYCH_UKOLU,
+    FrontaZapisu,
+    nastavit_zapis_na_pozadi,
+    uloz_ukol_na_pozadi,
+    vyprazdnit_zapisy,
+    ziskat_pripojeni,
+    nacist_vsechny_ukoly_z_databaze,
+    DOTAZ_VLOZENI,
+    DOTAZ_ZMENA_STAVU,
+    DOTAZ_ODSTRANENI,
+    DOTAZ_AKTIVNI,
+    nastavit_repliky,
+    archivovat_ukoly,
+    nacist_ukoly_z_databaze,
+    statistika_replik,
+    SmerovacCteni,
 )
+from benchmarks.cas_importu import zmerit_import
+
+# Testy běží proti vestavěné databázi SQLite (':memory:'), s proměnnou prostředí
+# PATY_ULOZISTE=mysql proti MySQL databázi 'ukoly_db_test'.
+# Pod pytest-xdist (pytest -n auto) má každý pracovní proces vlastní databázi
+# 'ukoly_db_test_gw0', 'ukoly_db_test_gw1', ...; SQLite je v každém procesu
+# oddělená sama.
+PRACOVNIK = os.environ.get("PYTEST_XDIST_WORKER")
+TESTOVACI_DATABAZE = f"ukoly_db_test_{PRACOVNIK}" if PRACOVNIK else "ukoly_db_test"
+
+if os.environ.get("PATY_ULOZISTE", "sqlite").lower() == "mysql":
+    testovaci_uloziste = UlozisteMySQL(database=TESTOVACI_DATABAZE)
+else:
+    testovaci_uloziste = UlozisteSQLite()
+
 
 # Funkce pro připojení k databazi
 def pripojeni_k_testovaci_databazi():
     """
-    Připojí se k testovací databázi 'ukoly_db_test'
-    na lokálním serveru MySQL s danými přihlašovacími údaji.
+    Připojí se k testovací databázi v testovacím úložišti
+    ('ukoly_db_test' na lokálním serveru MySQL nebo SQLite v paměti).
 
     Návratova hodnota:
         Pokud je připojení úspěšné, vrátí objekt spojení.
         Pokud dojde k chybě, vypíše chybové hlášení a vrátí None.
     """
-    try:
-        pripojeni = mysql.connector.connect(
-            host="127.0.0.1", user="root", password="1234", database="ukoly_db_test"
-        )
-        if pripojeni.is_connected():
-            return pripojeni
-    except Error as chyba:
-        print(f"Chyba při připojení k databázi: {chyba}\n")
-        return None
+    pripojeni = testovaci_uloziste.pripojit()
+    if pripojeni and pripojeni.is_connected():
+        return pripojeni
+    return None
 
 
 # vytvoření tabulky pokud neexistuje
 def vytvoreni_testovaci_tabulky_v_databazi(pripojeni):
     """
-    Vytvoří v předaném spojení databáze tabulku 'ukoly', pokud ještě neexistuje.
+    Vytvoří v předaném spojení databáze tabulku 'ukoly' stejnými migracemi
+    schématu, jaké používá aplikace.
     Pokud dojde k chybě, vypíše chybové hlášení
 
     Parametry:
         pripojeni: aktivní spojení s databází.
     """
     try:
-        kurzor = pripojeni.cursor()
-        kurzor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS ukoly (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                nazev VARCHAR(255) NOT NULL,
-                popis TEXT,
-                stav ENUM('nezahájeno', 'hotovo', 'probíhá') NOT NULL,
-                datum_vytvoreni TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """
-        )
-        pripojeni.commit()
+        provest_migrace(pripojeni)
         print("\nTabulka 'ukoly' je připravena.\n")
-    except Error as chyba:
+    except ChybaDatabaze as chyba:
         print(f"Chyba při vytváření tabulky: {chyba}\n")
     finally:
-        if "kurzor" in locals():
-            kurzor.close()
         if "pripojeni" in locals():
             pripojeni.close()
 
@@ -65,11 +111,17 @@ def vytvoreni_testovaci_tabulky_v_databazi(pripojeni):
 def pripravit_testovaci_databazi():
     """
     Fixture, která při startu testovací relace:
-    - Připraví testovací databázi (vytvoří tabulku, pokud neexistuje)
-    - Po ukončení všech testů tabulku odstraní
+    - Přepne funkce aplikace na testovací úložiště
+    - Připraví testovací databázi (pracovní proces xdist si ji v MySQL založí)
+      a v ní tabulky migracemi
+    - Po ukončení všech testů tabulky, případně databázi pracovního procesu, odstraní
     - Spouští se automaticky (autouse=True, scope='session')
     """
 
+    nastavit_uloziste(testovaci_uloziste)
+    if PRACOVNIK and testovaci_uloziste.nazev == "mysql":
+        testovaci_uloziste.vytvorit_databazi()
+
     # při startu testů vytvoření tabulky
     pripojeni = pripojeni_k_testovaci_databazi()
     if pripojeni:
@@ -78,31 +130,141 @@ def pripravit_testovaci_databazi():
 
     yield  # běh testů
 
+    if PRACOVNIK and testovaci_uloziste.nazev == "mysql":
+        testovaci_uloziste.odstranit_databazi()
+        return
+
     # po všech testech smazání tabulky
     pripojeni = pripojeni_k_testovaci_databazi()
     if pripojeni:
         kurzor = pripojeni.cursor()
+        kurzor.execute("DROP TABLE IF EXISTS ukoly_fts")
         kurzor.execute("DROP TABLE IF EXISTS ukoly")
+        kurzor.execute("DROP TABLE IF EXISTS schema_verze")
+        kurzor.execute("DROP TABLE IF EXISTS citac_zmen")
+        kurzor.execute("DROP TABLE IF EXISTS verze_zapisu")
+        kurzor.execute("DROP TABLE IF EXISTS ukoly_smazane")
+        kurzor.execute("DROP TABLE IF EXISTS importy")
+        kurzor.execute("DROP TABLE IF EXISTS ukoly_archiv")
         pripojeni.commit()
         print("\nTabulka 'ukoly' je odstraněna.\n")
         kurzor.close()
         pripojeni.close()
 
 
+class SpojeniVTransakci:
+    """
+    Spojení pro jeden test. Celý test běží v jedné transakci, kterou fixture
+    na konci vrátí zpět. Funkce aplikace ale volají commit() a rollback(),
+    proto commit() jen založí nový savepoint a rollback() se vrátí
+    k poslednímu z nich; nic se tak nepotvrdí a testy se neovlivňují.
+    """
+
+    def __init__(self, spojeni):
+        self._spojeni = spojeni
+        spojeni.start_transaction()
+        self._savepoint("SAVEPOINT test")
+
+    def __getattr__(self, jmeno):
+        return getattr(self._spojeni, jmeno)
+
+    def _savepoint(self, prikaz):
+        kurzor = self._spojeni.cursor()
+        kurzor.execute(prikaz)
+        kurzor.close()
+
+    def commit(self):
+        self._savepoint("SAVEPOINT test")
+
+    def rollback(self):
+        self._savepoint("ROLLBACK TO SAVEPOINT test")
+
+    def vratit_vse(self):
+        """Vrátí zpět celou transakci testu a zavře spojení."""
+        self._spojeni.rollback()
+        self._spojeni.close()
+
+
 @pytest.fixture
 def transakce():
     """
     Fixture, která před každým testem:
     - Připojí se k testovací databázi a zahájí transakci.
-    - Po skončení testu provede rollback všech změn.
+    - Po skončení testu provede rollback všech změn, i těch, které
+      testovaná funkce "potvrdila" (viz SpojeniVTransakci).
     - Zabezpečuje izolaci testů
     """
     pripojeni = pripojeni_k_testovaci_databazi()
     if not pripojeni:
         pytest.skip("Nelze připojit k testovací databázi")
-    pripojeni.start_transaction()
-    yield pripojeni
-    pripojeni.rollback()
+    spojeni = SpojeniVTransakci(pripojeni)
+    yield spojeni
+    spojeni.vratit_vse()
+
+
+def nove_uloziste(pripona):
+    """
+    Vrátí nové úložiště stejného druhu jako testovací s tabulkami z migrací
+    (MySQL: databáze '<testovací databáze>_<pripona>', SQLite: nová databáze
+    v paměti), nebo None, pokud se k němu nelze připojit.
+    """
+    if testovaci_uloziste.nazev == "mysql":
+        uloziste = UlozisteMySQL(database=f"{TESTOVACI_DATABAZE}_{pripona}")
+        if not uloziste.vytvorit_databazi():
+            return None
+    else:
+        uloziste = UlozisteSQLite()
+    pripojeni = uloziste.pripojit()
+    if not pripojeni:
+        return None
+    provest_migrace(pripojeni)
+    pripojeni.close()
+    return uloziste
+
+
+def odstranit_uloziste(uloziste):
+    """Odstraní úložiště z nove_uloziste(); SQLite v paměti zanikne samo."""
+    if uloziste.nazev == "mysql":
+        uloziste.odstranit_databazi()
+
+
+@pytest.fixture
+def izolovane_uloziste():
+    """
+    Fixture pro testy, které zapisují přes pool spojení a skutečně potvrzují
+    (zápis na pozadí, připravené dotazy, repliky), takže je transakce testu
+    neobalí:
+    - Přepne funkce aplikace na nové prázdné úložiště (viz nove_uloziste).
+    - Po skončení testu přepne zpět na testovací úložiště a nové odstraní,
+      i když test selže.
+    """
+    uloziste = nove_uloziste("izolace")
+    if uloziste is None:
+        pytest.skip("Nelze připojit k testovací databázi")
+    nastavit_uloziste(uloziste)
+    yield uloziste
+    nastavit_uloziste(testovaci_uloziste)
+    odstranit_uloziste(uloziste)
+
+
+def test_transakce_vrati_i_potvrzene_zmeny():
+    """
+    Ověřuje, že spojení testu vrátí na konci zpět i změny, které testovaná
+    funkce potvrdila voláním commit(), takže se do dalších testů nepřenesou.
+    """
+
+    pripojeni = pripojeni_k_testovaci_databazi()
+    if not pripojeni:
+        pytest.skip("Nelze připojit k testovací databázi")
+    spojeni = SpojeniVTransakci(pripojeni)
+    assert uloz_ukol_do_databaze("Izolace testu", "Popis", pripojeni=spojeni)
+    spojeni.vratit_vse()
+
+    pripojeni = pripojeni_k_testovaci_databazi()
+    kurzor = pripojeni.cursor()
+    kurzor.execute("SELECT COUNT(*) FROM ukoly WHERE nazev = 'Izolace testu'")
+    assert kurzor.fetchone()[0] == 0
+    kurzor.close()
     pripojeni.close()
 
 
@@ -224,3 +386,913 @@ def test_odstranit_ukol_negativni(transakce):
 
     uspesne = odstranit_ukol_z_databaze(999999, pripojeni=transakce)  # ID neexistuje
     assert not uspesne
+
+
+# Test hromadného přidání úkolů
+def test_pridat_ukoly_hromadne(transakce):
+    """
+    Ověřuje, že hromadné uložení zapíše platné úkoly po dávkách,
+    vrátí jejich ID a u neplatných úkolů vrátí pořadí a důvod odmítnutí.
+    """
+
+    ukoly = [
+        ("Hromadný 1", "Popis"),
+        ("", "Bez názvu"),
+        ("Hromadný 2", "Popis"),
+        ("Hromadný 3", "   "),
+        ("Hromadný 4", "Popis"),
+    ]
+    vlozena_id, odmitnute = uloz_ukoly_hromadne(
+        ukoly, velikost_davky=2, pripojeni=transakce
+    )
+    assert len(vlozena_id) == 3
+    assert [poradi for poradi, _ in odmitnute] == [1, 3]
+
+    kurzor = transakce.cursor()
+    kurzor.execute(
+        "SELECT id FROM ukoly WHERE nazev LIKE 'Hromadný %' ORDER BY id"
+    )
+    ulozena_id = [radek[0] for radek in kurzor.fetchall()]
+    kurzor.close()
+    assert ulozena_id == vlozena_id
+
+
+# Test hromadné změny stavu a odstranění
+def test_hromadna_zmena_stavu_a_odstraneni(transakce):
+    """
+    Ověřuje, že hromadné operace podle seznamu ID zpracují všechny existující
+    úkoly po dávkách a vrátí jen ID, která v databázi skutečně existovala.
+    """
+
+    vlozena_id, _ = uloz_ukoly_hromadne(
+        [(f"Sprint {i}", "Popis") for i in range(5)], pripojeni=transakce
+    )
+    neexistujici_id = 999999
+
+    zmenena = zmenit_stav_ukolu_hromadne(
+        vlozena_id + [neexistujici_id], "hotovo", velikost_davky=2, pripojeni=transakce
+    )
+    assert zmenena == vlozena_id
+
+    kurzor = transakce.cursor()
+    kurzor.execute("SELECT COUNT(*) FROM ukoly WHERE nazev LIKE 'Sprint %' AND stav='hotovo'")
+    assert kurzor.fetchone()[0] == 5
+    kurzor.close()
+
+    odstranena = odstranit_ukoly_hromadne(
+        vlozena_id[:3] + [neexistujici_id], velikost_davky=2, pripojeni=transakce
+    )
+    assert odstranena == vlozena_id[:3]
+
+
+# Test zápisu na pozadí se skupinovým potvrzováním
+def test_zapis_na_pozadi(transakce):
+    """
+    Ověřuje, že fronta zápisů potvrzuje úkoly po skupinách, vrací jejich ID
+    přes Future, na požádání zapíše i neúplnou skupinu a po ukončení
+    další zápisy odmítne.
+    """
+
+    fronta = FrontaZapisu(velikost_skupiny=3, interval=60, pripojeni=transakce)
+    budouci = [fronta.vlozit(f"Pozadí {i}", "Popis") for i in range(7)]
+    assert fronta.vyprazdnit(cekani=10)
+    assert fronta.delka() == 0
+    vlozena_id = [vysledek.result(timeout=0) for vysledek in budouci]
+    assert vlozena_id == sorted(set(vlozena_id)) and None not in vlozena_id
+
+    kurzor = transakce.cursor()
+    kurzor.execute("SELECT COUNT(*) FROM ukoly WHERE nazev LIKE 'Pozadí %'")
+    assert kurzor.fetchone()[0] == 7
+    kurzor.close()
+
+    fronta.ukoncit()
+    with pytest.raises(RuntimeError):
+        fronta.vlozit("Pozdě", "Popis")
+
+
+def test_uloz_ukol_v_rezimu_zapisu_na_pozadi(izolovane_uloziste):
+    """
+    Ověřuje, že se zapnutým zápisem na pozadí vrací uloz_ukol_na_pozadi()
+    Future s ID úkolu (neplatný úkol s None), uloz_ukol_do_databaze() dál
+    vrací bool až po potvrzení a bez fronty uloz_ukol_na_pozadi() selže.
+    """
+
+    nastavit_zapis_na_pozadi(interval=60)
+    try:
+        budouci = uloz_ukol_na_pozadi("Na pozadí", "Popis")
+        assert uloz_ukol_na_pozadi("", "Popis").result(timeout=0) is None
+        assert vyprazdnit_zapisy(cekani=10)
+        id_ukolu = budouci.result(timeout=0)
+
+        nastavit_zapis_na_pozadi(interval=0.01)
+        assert uloz_ukol_do_databaze("Synchronně", "Popis") is True
+        assert uloz_ukol_do_databaze("", "Popis") is False
+    finally:
+        nastavit_zapis_na_pozadi(False)
+    ukoly_v_databazi = nacist_vsechny_ukoly_z_databaze()
+    assert [ukol.nazev for ukol in ukoly_v_databazi] == ["Na pozadí", "Synchronně"]
+    assert ukoly_v_databazi[0].id == id_ukolu
+    assert vyprazdnit_zapisy() is True
+    with pytest.raises(RuntimeError):
+        uloz_ukol_na_pozadi("Bez fronty", "Popis")
+
+
+def test_pridat_ukol_v_menu_se_zapisem_na_pozadi(izolovane_uloziste, monkeypatch, capsys):
+    """
+    Ověřuje, že menu se zapnutým zápisem na pozadí ohlásí uložení úkolu,
+    který už je po návratu potvrzený v databázi.
+    """
+
+    from src import paty_projekt
+
+    monkeypatch.setattr(paty_projekt, "ukoly", [])
+    vstupy = iter(["Název", "Popis"])
+    monkeypatch.setattr("builtins.input", lambda _: next(vstupy))
+    nastavit_zapis_na_pozadi(interval=0.01)
+    try:
+        paty_projekt.pridat_ukol()
+        assert [ukol.nazev for ukol in nacist_vsechny_ukoly_z_databaze()] == ["Název"]
+    finally:
+        nastavit_zapis_na_pozadi(False)
+    assert "byl úspěšně uložen" in capsys.readouterr().out
+    assert len(paty_projekt.ukoly) == 1
+
+
+def test_aktualizace_v_menu_vybira_ze_stranek(izolovane_uloziste, monkeypatch):
+    """
+    Ověřuje, že menu vypisuje úkoly ke změně stavu po stránkách a dovolí
+    vybrat úkol z další stránky.
+    """
+
+    from src import paty_projekt
+
+    vlozena_id, _ = uloz_ukoly_hromadne([(f"Stránka menu {i}", "Popis") for i in range(3)])
+    nacteno = []
+
+    def stranka(po_id):
+        ukoly, dalsi = nacist_stranku_aktivnich_ukolu(po_id, limit=2)
+        nacteno.append(len(ukoly))
+        return ukoly, dalsi
+
+    monkeypatch.setattr(paty_projekt, "nacist_stranku_aktivnich_ukolu", stranka)
+    vstupy = iter(["ano", str(vlozena_id[2]), "hotovo", "ano"])
+    monkeypatch.setattr("builtins.input", lambda _: next(vstupy))
+    paty_projekt.aktualizovat_ukol()
+    assert nacteno == [2, 1]
+    stavy = {ukol.id: ukol.stav for ukol in nacist_vsechny_ukoly_z_databaze()}
+    assert [stavy[id_ukolu] for id_ukolu in vlozena_id] == ["nezahájeno", "nezahájeno", "hotovo"]
+
+
+def test_pripravene_dotazy_na_spojeni_z_poolu(izolovane_uloziste):
+    """
+    Ověřuje, že spojení z poolu připraví každý hlavní dotaz jen jednou
+    a při dalších voláních použije stejný kurzor; po chybě dotazu ho zahodí.
+    """
+
+    assert uloz_ukol_do_databaze("Připravený dotaz", "Popis")
+    pripojeni = ziskat_pripojeni()
+    pripraveny = pripojeni._pripravene[DOTAZ_VLOZENI]
+    pripojeni.close()
+
+    assert uloz_ukol_do_databaze("Připravený dotaz", "Popis")
+    id_ukolu = [
+        ukol.id for ukol in nacist_vsechny_ukoly_z_databaze() if ukol.nazev == "Připravený dotaz"
+    ]
+    assert len(id_ukolu) == 2
+    assert zmenit_stav_ukolu_v_databazi(id_ukolu[0], "hotovo")
+    assert all(odstranit_ukol_z_databaze(id) for id in id_ukolu)
+
+    pripojeni = ziskat_pripojeni()
+    try:
+        assert pripojeni._pripravene[DOTAZ_VLOZENI] is pripraveny
+        assert {DOTAZ_ZMENA_STAVU, DOTAZ_ODSTRANENI} <= pripojeni._pripravene.keys()
+        kurzor = pripojeni.pripraveny(DOTAZ_AKTIVNI)
+        # ChybaDatabaze zahrnuje chyby obou ovladačů (MySQL jako ChybaMySQL)
+        with pytest.raises(ChybaDatabaze) as chyba:
+            kurzor.execute("SELECT * FROM neexistujici_tabulka")
+        assert isinstance(chyba.value, (sqlite3.Error, ChybaMySQL))
+        assert DOTAZ_AKTIVNI not in pripojeni._pripravene
+        novy = pripojeni.pripraveny(DOTAZ_AKTIVNI)
+        assert novy is not kurzor
+        novy.execute(DOTAZ_AKTIVNI)
+        novy.fetchall()
+    finally:
+        pripojeni.close()
+
+
+def test_cteni_z_repliky_a_z_primarniho_uloziste(izolovane_uloziste, tmp_path):
+    """
+    Ověřuje směrování čtení s replikou, kterou nahrazuje druhé úložiště
+    (jiná databáze MySQL, případně SQLite):
+    - Bez nedávného zápisu se čte z repliky.
+    - Po zápisu se čte z primárního úložiště a zápis je vidět.
+    - Když se k replice nelze připojit, čte se z primárního úložiště.
+    """
+
+    assert uloz_ukol_do_databaze("Z primárního", "Popis")
+    replika = nove_uloziste("replika")
+    assert replika is not None
+    spojeni = replika.pripojit()
+    assert uloz_ukol_do_databaze("Z repliky", "Popis", pripojeni=spojeni)
+    spojeni.close()
+    if replika.nazev == "mysql":
+        nedostupna = UlozisteMySQL(host="127.0.0.1", port=1, connection_timeout=2)
+    else:
+        nedostupna = UlozisteSQLite(str(tmp_path / "chybi" / "replika.db"))
+
+    try:
+        nastavit_repliky([replika], cteni_po_zapisu=0)
+        nazvy = {ukol.nazev for ukol in nacist_vsechny_ukoly_z_databaze()}
+        assert "Z repliky" in nazvy and "Z primárního" not in nazvy
+        assert statistika_replik()["repliky"][0]["cteni"] == 1
+
+        nastavit_repliky([replika], cteni_po_zapisu=60)
+        assert uloz_ukol_do_databaze("Po zápisu", "Popis")
+        nazvy = {ukol.nazev for ukol in nacist_vsechny_ukoly_z_databaze()}
+        assert {"Z primárního", "Po zápisu"} <= nazvy
+        assert statistika_replik() == {"repliky": [{"cteni": 0, "dostupna": True}], "z_primarniho": 1}
+
+        nastavit_repliky([nedostupna], cteni_po_zapisu=0)
+        nazvy = {ukol.nazev for ukol in nacist_ukoly_z_databaze()}
+        assert "Z primárního" in nazvy
+        assert statistika_replik() == {"repliky": [{"cteni": 0, "dostupna": False}], "z_primarniho": 1}
+    finally:
+        nastavit_repliky()
+        odstranit_uloziste(replika)
+    assert statistika_replik() is None
+
+
+# Test stránkování aktivních úkolů
+def test_strankovani_aktivnich_ukolu(transakce):
+    """
+    Ověřuje stránkování podle ID:
+    - Stránky na sebe navazují bez překryvu a jsou seřazené podle ID.
+    - Poslední stránka vrací pokračovací token None.
+    - Hotové úkoly se ve výpisu aktivních úkolů neobjeví.
+    """
+
+    vlozena_id, _ = uloz_ukoly_hromadne(
+        [(f"Stránka {i}", "Popis") for i in range(5)], pripojeni=transakce
+    )
+    zmenit_stav_ukolu_hromadne(vlozena_id[:1], "hotovo", pripojeni=transakce)
+
+    nactena_id = []
+    po_id = vlozena_id[0] - 1
+    while True:
+        ukoly, po_id = nacist_stranku_aktivnich_ukolu(
+            po_id, limit=2, pripojeni=transakce
+        )
+        assert len(ukoly) <= 2
+        nactena_id.extend(ukol["id"] for ukol in ukoly)
+        if po_id is None:
+            break
+
+    assert nactena_id == vlozena_id[1:]
+
+
+# Test streamovaného čtení úkolů
+def test_prochazet_vsechny_ukoly(transakce):
+    """
+    Ověřuje, že generátor vrátí všechny úkoly po dávkách a že po předčasném
+    ukončení procházení zůstane předané spojení použitelné.
+    """
+
+    vlozena_id, _ = uloz_ukoly_hromadne(
+        [(f"Stream {i}", "Popis") for i in range(5)], pripojeni=transakce
+    )
+    nactena_id = [
+        ukol["id"]
+        for ukol in prochazet_vsechny_ukoly(velikost_davky=2, pripojeni=transakce)
+    ]
+    assert set(vlozena_id) <= set(nactena_id)
+    assert nactena_id == sorted(nactena_id)
+
+    generator = prochazet_vsechny_ukoly(velikost_davky=2, pripojeni=transakce)
+    next(generator)
+    generator.close()
+
+    kurzor = transakce.cursor()
+    kurzor.execute("SELECT COUNT(*) FROM ukoly WHERE nazev LIKE 'Stream %'")
+    assert kurzor.fetchone()[0] == 5
+    kurzor.close()
+
+
+# Test migrací schématu
+def test_migrace_jsou_idempotentni(transakce):
+    """
+    Ověřuje, že po přípravě databáze jsou provedeny všechny migrace,
+    opakované spuštění už žádnou neprovede a index (stav, id) existuje.
+    """
+
+    assert provest_migrace(transakce) == []
+
+    kurzor = transakce.cursor()
+    kurzor.execute("SELECT MAX(verze) FROM schema_verze")
+    assert kurzor.fetchone()[0] == MIGRACE[-1][0]
+    assert testovaci_uloziste.index_existuje(kurzor, "ukoly", "idx_ukoly_stav_id")
+    kurzor.close()
+
+
+# Test načtení úkolů podle rozsahu ID
+def test_nacist_ukoly_v_rozsahu(transakce):
+    """
+    Ověřuje, že rozsah ID vrací jen úkoly s ID v polootevřeném intervalu
+    a že nejmenší a největší ID odpovídá vloženým úkolům.
+    """
+
+    vlozena_id, _ = uloz_ukoly_hromadne(
+        [(f"Rozsah {i}", "Popis") for i in range(5)], pripojeni=transakce
+    )
+    ukoly = nacist_ukoly_v_rozsahu(
+        vlozena_id[1], vlozena_id[4], pripojeni=transakce
+    )
+    assert [ukol["id"] for ukol in ukoly] == vlozena_id[1:4]
+
+    nejmensi, nejvetsi = rozsah_id_ukolu(pripojeni=transakce)
+    assert nejmensi <= vlozena_id[0]
+    assert nejvetsi == vlozena_id[-1]
+
+
+# Test pozice úkolu v seznamu seřazeném podle ID
+def test_id_ukolu_na_pozici(transakce):
+    """
+    Ověřuje, že počet úkolů a ID na pozici odpovídají seznamu seřazenému
+    podle ID i s mezerami v ID a že pozice za koncem vrací None.
+    """
+
+    vlozena_id, _ = uloz_ukoly_hromadne(
+        [(f"Pozice {i}", "Popis") for i in range(5)], pripojeni=transakce
+    )
+    odstranit_ukoly_hromadne(vlozena_id[1:3], pripojeni=transakce)
+    pocet = pocet_ukolu(pripojeni=transakce)
+    assert pocet >= 3
+
+    assert id_ukolu_na_pozici(pocet - 3, pripojeni=transakce) == vlozena_id[0]
+    assert id_ukolu_na_pozici(pocet - 2, pripojeni=transakce) == vlozena_id[3]
+    assert id_ukolu_na_pozici(pocet, pripojeni=transakce) is None
+
+
+def test_zaznam_ukolu(transakce):
+    """
+    Ověřuje, že čtení vrací kompaktní neměnné záznamy Ukol dostupné přes
+    atributy i klíče a že seznam naposledy přidaných úkolů je omezený.
+    """
+
+    vlozena_id, _ = uloz_ukoly_hromadne([("Záznam", "Popis")], pripojeni=transakce)
+    (ukol,) = nacist_ukoly_v_rozsahu(vlozena_id[0], vlozena_id[0] + 1, pripojeni=transakce)
+
+    assert isinstance(ukol, Ukol) and not hasattr(ukol, "__dict__")
+    assert ukol.id == ukol["id"] == ukol[0] == vlozena_id[0]
+    assert dict(ukol) == {"id": ukol.id, "nazev": "Záznam", "popis": "Popis", "stav": "nezahájeno"}
+    assert ukol.get("skore") is None
+    with pytest.raises(KeyError):
+        ukol["skore"]
+    with pytest.raises(AttributeError):
+        ukol.stav = "hotovo"
+
+    assert ukoly.maxlen == POCET_NEDAVNYCH_UKOLU
+
+
+def test_archivace_hotovych_ukolu(transakce):
+    """
+    Ověřuje, že archivace po dávkách přesune jen hotové úkoly starší než zadané
+    stáří, čtení je vrátí jen s vcetne_archivu a změny je hlásí jako odstraněné.
+    """
+
+    vlozena_id, _ = uloz_ukoly_hromadne(
+        [("Starý hotový 1", "Popis"), ("Starý hotový 2", "Popis"),
+         ("Nový hotový", "Popis"), ("Starý rozpracovaný", "Popis")],
+        pripojeni=transakce,
+    )
+    assert zmenit_stav_ukolu_hromadne(vlozena_id[:3], "hotovo", pripojeni=transakce)
+    kurzor = transakce.cursor()
+    kurzor.execute(
+        "UPDATE ukoly SET datum_vytvoreni = '2000-01-01 00:00:00' WHERE id IN (%s, %s, %s)",
+        (vlozena_id[0], vlozena_id[1], vlozena_id[3]),
+    )
+    kurzor.close()
+    znacka = aktualni_verze_zmen(pripojeni=transakce)
+
+    prubeh = []
+    assert archivovat_ukoly(30, velikost_davky=1, prubeh=prubeh.append, pripojeni=transakce) == 2
+    assert prubeh == [1, 2]
+
+    zbyla_id = {ukol.id for ukol in nacist_vsechny_ukoly_z_databaze(pripojeni=transakce)}
+    assert zbyla_id & set(vlozena_id) == {vlozena_id[2], vlozena_id[3]}
+    vsechna = nacist_vsechny_ukoly_z_databaze(pripojeni=transakce, vcetne_archivu=True)
+    assert {ukol.id for ukol in vsechna} >= set(vlozena_id)
+    archivovane = [
+        ukol for ukol in prochazet_vsechny_ukoly(pripojeni=transakce, vcetne_archivu=True)
+        if ukol.id in vlozena_id[:2]
+    ]
+    assert [(ukol.nazev, ukol.stav) for ukol in archivovane] == [
+        ("Starý hotový 1", "hotovo"), ("Starý hotový 2", "hotovo")
+    ]
+    assert sorted(nacist_zmeny(znacka, pripojeni=transakce)["smazane"]) == vlozena_id[:2]
+    assert archivovat_ukoly(30, pripojeni=transakce) == 0
+
+
+def test_nacist_zmeny(transakce):
+    """
+    Ověřuje, že změny po značce obsahují nově vložený úkol, úkol se změněným
+    stavem i ID odstraněného úkolu a že nová značka už žádné změny nevrací.
+    """
+
+    vlozena_id, _ = uloz_ukoly_hromadne(
+        [("Změna 1", "Popis"), ("Změna 2", "Popis")], pripojeni=transakce
+    )
+    znacka = aktualni_verze_zmen(pripojeni=transakce)
+
+    assert zmenit_stav_ukolu_v_databazi(vlozena_id[0], "hotovo", pripojeni=transakce)
+    assert odstranit_ukol_z_databaze(vlozena_id[1], pripojeni=transakce)
+    assert uloz_ukol_do_databaze("Změna 3", "Popis", pripojeni=transakce)
+
+    zmeny = nacist_zmeny(znacka, pripojeni=transakce)
+    assert [ukol["id"] for ukol in zmeny["upravene"]] == [vlozena_id[0]]
+    assert zmeny["upravene"][0]["stav"] == "hotovo"
+    assert [ukol["nazev"] for ukol in zmeny["vlozene"]] == ["Změna 3"]
+    assert zmeny["smazane"] == [vlozena_id[1]]
+    assert zmeny["verze"] > znacka
+
+    zadne = nacist_zmeny(zmeny["verze"], pripojeni=transakce)
+    assert zadne["vlozene"] == zadne["upravene"] == zadne["smazane"] == []
+
+
+def test_znacka_zmen_neprekroci_nepotvrzeny_zapis(transakce):
+    """
+    Ověřuje, že značka změn skončí pod mezerou ve verzích (zápis, který se
+    dosud nepotvrdil) a že mezeru starší než MAX_TRVANI_ZAPISU přeskočí.
+    """
+
+    assert uloz_ukol_do_databaze("Před mezerou", "Popis", pripojeni=transakce)
+    znacka = aktualni_verze_zmen(pripojeni=transakce)
+    kurzor = transakce.cursor()
+    # verze znacka + 1 chybí, jako by ji měl přidělenou jiný, dosud běžící zápis
+    kurzor.execute(
+        "INSERT INTO verze_zapisu (verze, zapsano) VALUES (%s, CURRENT_TIMESTAMP)",
+        (znacka + 2,),
+    )
+    kurzor.execute(
+        "INSERT INTO ukoly (nazev, popis, stav, verze, verze_vlozeni) VALUES (%s, %s, %s, %s, %s)",
+        ("Za mezerou", "Popis", "nezahájeno", znacka + 2, znacka + 2),
+    )
+    assert aktualni_verze_zmen(pripojeni=transakce) == znacka
+    zmeny = nacist_zmeny(znacka, pripojeni=transakce)
+    assert zmeny["vlozene"] == [] and zmeny["verze"] == znacka
+
+    # mezera starší než MAX_TRVANI_ZAPISU patří zrušenému zápisu
+    kurzor.execute(
+        "UPDATE verze_zapisu SET zapsano = '2000-01-01 00:00:00' WHERE verze = %s",
+        (znacka + 2,),
+    )
+    kurzor.close()
+    zmeny = nacist_zmeny(znacka, pripojeni=transakce)
+    assert [ukol.nazev for ukol in zmeny["vlozene"]] == ["Za mezerou"]
+    assert zmeny["verze"] == znacka + 2
+
+
+def test_procisteni_verzi_zapisu(transakce, monkeypatch):
+    """
+    Ověřuje, že zápis po PROCISTIT_PO_VERZICH verzích odstraní z verze_zapisu
+    řádky pod bezpečnou verzí, ponechá nejnovější a že sledování změn
+    od starší značky i od začátku pracuje dál.
+    """
+
+    znacka = aktualni_verze_zmen(pripojeni=transakce)
+    monkeypatch.setattr("src.jadro.PROCISTIT_PO_VERZICH", 1)
+    vlozena_id = [
+        uloz_ukoly_hromadne([(f"Pročištění {i}", "Popis")], pripojeni=transakce)[0][0]
+        for i in range(3)
+    ]
+
+    kurzor = transakce.cursor()
+    kurzor.execute("SELECT verze FROM verze_zapisu")
+    zbyvajici = [radek[0] for radek in kurzor.fetchall()]
+    kurzor.close()
+    posledni = aktualni_verze_zmen(pripojeni=transakce)
+    assert zbyvajici == [posledni]
+    zmeny = nacist_zmeny(znacka, pripojeni=transakce)
+    assert [ukol.id for ukol in zmeny["vlozene"]] == vlozena_id
+    assert zmeny["verze"] == posledni
+    assert nacist_zmeny(0, pripojeni=transakce)["verze"] == posledni
+
+
+def test_posledni_chyba_a_cekani_na_zamek():
+    """
+    Ověřuje, že zachycená chyba databáze je dostupná přes posledni_chyba()
+    jen jednou a že se vypršené čekání na zámek pozná u obou úložišť.
+    """
+
+    pripojeni = UlozisteSQLite().pripojit()
+    pripojeni.close()
+    assert not uloz_ukol_do_databaze("Název", "Popis", pripojeni=pripojeni)
+    assert isinstance(posledni_chyba(), sqlite3.Error)
+    assert posledni_chyba() is None
+    assert nacist_vsechny_ukoly_z_databaze(pripojeni=pripojeni) == []
+    assert isinstance(posledni_chyba(), sqlite3.Error)
+
+    assert je_cekani_na_zamek(sqlite3.OperationalError("database is locked"))
+    assert je_cekani_na_zamek(mysql.connector.errors.DatabaseError(errno=1205))
+    assert not je_cekani_na_zamek(mysql.connector.errors.DatabaseError(errno=1213))
+    assert je_cekani_na_zamek(ChybaMySQL(mysql.connector.errors.DatabaseError(errno=1205)))
+
+
+def test_chyba_mysql_je_chybou_databaze():
+    """
+    Ověřuje, že chyba ovladače MySQL dorazí jako ChybaDatabaze importovaná
+    ještě před načtením ovladače, tj. že se n-tice chyb nikdy nemění.
+    """
+
+    zachycene = ChybaDatabaze
+    assert UlozisteMySQL(host="127.0.0.1", port=1, connection_timeout=2).pripojit() is None
+    chyba = posledni_chyba()
+    assert isinstance(chyba, zachycene) and isinstance(chyba, ChybaMySQL)
+    assert isinstance(chyba.__cause__, mysql.connector.Error)
+    assert chyba.errno == chyba.__cause__.errno
+    assert ChybaDatabaze is zachycene
+
+
+def test_metriky_dotazu():
+    """
+    Ověřuje, že metriky sloučí dotazy lišící se jen počtem zástupců,
+    sečtou řádky a chyby, zapíšou pomalý dotaz do logu a jdou exportovat
+    do JSON i formátu Prometheus.
+    """
+
+    metriky = MetrikyDotazu(prah_pomaleho=0.5)
+    metriky.zaznamenat_dotaz("op", "DELETE FROM ukoly WHERE id IN (%s, %s)", 0.001, 2)
+    metriky.zaznamenat_dotaz("op", "DELETE FROM ukoly\n WHERE id IN (%s)", 0.002, 1)
+    metriky.zaznamenat_dotaz(
+        "op", "SELECT 1", 0.7, chyba=sqlite3.OperationalError("database is locked")
+    )
+    metriky.zaznamenat_operaci("op", 0.8)
+
+    snimek = json.loads(json.dumps(metriky.snimek()))
+    dotazy = {dotaz["dotaz"]: dotaz for dotaz in snimek["dotazy"]}
+    smazani = dotazy["DELETE FROM ukoly WHERE id IN (...)"]
+    assert smazani["latence"]["pocet"] == 2
+    assert smazani["radky"] == 3
+    assert dotazy["SELECT 1"]["chyby"] == {"OperationalError": 1}
+    assert [zaznam["dotaz"] for zaznam in snimek["pomale_dotazy"]] == ["SELECT 1"]
+
+    text = metriky.prometheus()
+    assert 'paty_operace_sekundy_bucket{operace="op",le="1.0"} 1' in text
+    assert 'paty_dotaz_sekundy_count{operace="op",dotaz="SELECT 1"} 1' in text
+
+
+def test_metriky_operace_z_poolu(transakce):
+    """Ověřuje, že volání bez parametru připojení se započítá k operaci i jejím dotazům."""
+
+    metriky = nastavit_metriky()
+    nacist_ukoly_v_rozsahu(0, 1)
+    snimek = metriky.snimek()
+    assert snimek["operace"]["nacist_ukoly_v_rozsahu"]["latence"]["pocet"] == 1
+    assert snimek["operace"]["nacist_ukoly_v_rozsahu"]["ziskani_spojeni"]["pocet"] == 1
+    assert any(dotaz["operace"] == "nacist_ukoly_v_rozsahu" for dotaz in snimek["dotazy"])
+
+
+def test_metriky_radku_pri_neznamem_rowcount():
+    """
+    Ověřuje, že řádky dotazu, u kterého kurzor po execute nezná rowcount
+    (nebufferovaný a připravený kurzor MySQL) a zvyšuje ho až při čtení,
+    se započítají při čtení právě jednou.
+    """
+
+    class KurzorMySQL:
+        def __init__(self):
+            self.rowcount = -1
+            self._radky = []
+
+        def execute(self, dotaz, parametry=()):
+            self.rowcount = -1
+            self._radky = [(1,), (2,), (3,)]
+
+        def fetchone(self):
+            radek = self._radky.pop(0)
+            self.rowcount = max(self.rowcount, 0) + 1
+            return radek
+
+        def fetchall(self):
+            radky, self._radky = self._radky, []
+            self.rowcount = max(self.rowcount, 0) + len(radky)
+            return radky
+
+    metriky = nastavit_metriky()
+    kurzor = _MerenyKurzor(KurzorMySQL(), "op")
+    kurzor.execute("SELECT id FROM ukoly")
+    assert kurzor.fetchone() == (1,)
+    assert kurzor.fetchall() == [(2,), (3,)]
+
+    (dotaz,) = metriky.snimek()["dotazy"]
+    assert dotaz["radky"] == 3
+
+
+def test_hledat_ukoly(transakce):
+    """
+    Ověřuje, že vyhledávání najde úkoly podle slov z názvu i popisu
+    bez ohledu na diakritiku, řadí je podle relevance, filtruje podle stavu
+    a stránkuje.
+    """
+
+    if testovaci_uloziste.nazev == "mysql":
+        # index FULLTEXT v InnoDB vidí až potvrzené řádky, test ale vše vrací zpět
+        pytest.skip("Fulltext v MySQL nevidí nepotvrzená data transakce")
+    vlozena_id, _ = uloz_ukoly_hromadne(
+        [
+            ("Koupit mléko", "mléko a chléb na snídani"),
+            ("Uklidit garáž", "vynést staré mléko"),
+            ("Zavolat instalatérovi", "kape kohoutek"),
+        ],
+        pripojeni=transakce,
+    )
+    zmenit_stav_ukolu_v_databazi(vlozena_id[1], "hotovo", pripojeni=transakce)
+
+    ukoly, dalsi = hledat_ukoly("mleko", pripojeni=transakce)
+    assert [ukol["id"] for ukol in ukoly] == vlozena_id[:2]
+    assert ukoly[0]["skore"] > ukoly[1]["skore"]
+    assert dalsi is None
+
+    ukoly, _ = hledat_ukoly("mléko", stavy="hotovo", pripojeni=transakce)
+    assert [ukol["id"] for ukol in ukoly] == [vlozena_id[1]]
+
+    prvni, dalsi = hledat_ukoly("mléko kohoutek", limit=2, pripojeni=transakce)
+    druha, konec = hledat_ukoly("mléko kohoutek", po=dalsi, limit=2, pripojeni=transakce)
+    assert len(prvni) == 2 and len(druha) == 1 and konec is None
+    assert hledat_ukoly("!!!", pripojeni=transakce) == ([], None)
+
+
+def test_export_a_import_ukolu(transakce, tmp_path):
+    """
+    Ověřuje, že export do CSV i JSON Lines zapíše všechny úkoly se stavem
+    a že import exportovaného souboru je vloží znovu jako nové úkoly
+    (druhý export obsahuje i úkoly vložené importem prvního).
+    """
+
+    vlozena_id, _ = uloz_ukoly_hromadne(
+        [("Export 1", "Popis, s čárkou"), ("Export 2", "Popis\nna dva řádky")],
+        pripojeni=transakce,
+    )
+    zmenit_stav_ukolu_v_databazi(vlozena_id[0], "hotovo", pripojeni=transakce)
+
+    for nazev in ("ukoly.csv", "ukoly.jsonl"):
+        soubor = tmp_path / nazev
+        prubeh = []
+        zapsano = exportovat_ukoly(
+            str(soubor), velikost_davky=1, prubeh=prubeh.append, pripojeni=transakce
+        )
+        assert zapsano >= 2
+        assert prubeh == list(range(1, zapsano + 1))
+
+        vysledek = importovat_ukoly(str(soubor), pripojeni=transakce)
+        assert vysledek["vlozeno"] == zapsano
+        assert vysledek["odmitnute"] == [] and vysledek["dokonceno"]
+
+    kurzor = transakce.cursor()
+    kurzor.execute(
+        "SELECT nazev, popis, stav FROM ukoly WHERE nazev LIKE 'Export %' ORDER BY id"
+    )
+    radky = kurzor.fetchall()
+    kurzor.close()
+    assert radky == [
+        ("Export 1", "Popis, s čárkou", "hotovo"),
+        ("Export 2", "Popis\nna dva řádky", "nezahájeno"),
+    ] * 4
+    with pytest.raises(ValueError):
+        exportovat_ukoly(str(tmp_path / "ukoly.txt"), pripojeni=transakce)
+
+
+def test_import_pokracuje_po_preruseni(transakce, tmp_path):
+    """
+    Ověřuje, že import zapisuje po dávkách, odmítne neplatné řádky
+    a po přerušení pokračuje za poslední potvrzenou dávkou.
+    """
+
+    soubor = tmp_path / "import.jsonl"
+    soubor.write_text(
+        "\n".join(
+            [
+                json.dumps({"nazev": "Import 1", "popis": "Popis"}),
+                json.dumps({"nazev": "Import 2", "popis": "Popis", "stav": "probíhá"}),
+                json.dumps({"nazev": "Import 3", "popis": " "}),
+                "{neplatný json",
+                json.dumps({"nazev": "Import 5", "popis": "Popis", "stav": "zrušeno"}),
+                json.dumps({"nazev": "Import 6", "popis": "Popis"}),
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    def prerusit(zpracovano, vlozeno):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        importovat_ukoly(str(soubor), velikost_davky=2, prubeh=prerusit, pripojeni=transakce)
+
+    prubeh = []
+    vysledek = importovat_ukoly(
+        str(soubor), velikost_davky=2, prubeh=lambda *postup: prubeh.append(postup),
+        pripojeni=transakce,
+    )
+    assert vysledek["preskoceno"] == 2
+    assert vysledek["vlozeno"] == 1
+    assert [poradi for poradi, _ in vysledek["odmitnute"]] == [2, 3, 4]
+    assert vysledek["dokonceno"]
+    assert prubeh == [(4, 0), (6, 1)]
+
+    assert importovat_ukoly(str(soubor), pripojeni=transakce)["vlozeno"] == 0
+    kurzor = transakce.cursor()
+    kurzor.execute("SELECT nazev, stav FROM ukoly WHERE nazev LIKE 'Import %' ORDER BY id")
+    assert kurzor.fetchall() == [
+        ("Import 1", "nezahájeno"), ("Import 2", "probíhá"), ("Import 6", "nezahájeno")
+    ]
+    kurzor.close()
+    assert importovat_ukoly(str(soubor), pokracovat=False, pripojeni=transakce)["vlozeno"] == 3
+
+
+def test_import_jadra_je_lehky():
+    """
+    Ověřuje, že import jádra v novém procesu nenačte tkinter, ovladač MySQL
+    ani další moduly z TEZKE_MODULY. Dobu importu měří benchmarks.cas_importu.
+    """
+
+    assert zmerit_import("src.jadro", opakovani=1)["tezke"] == []
+
+
+class FalesneSpojeni:
+    """Jednoduchá náhrada spojení pro testy poolu bez databáze."""
+
+    def __init__(self):
+        self.zive = True
+        self.zavreno = False
+
+    def is_connected(self):
+        return self.zive
+
+    def close(self):
+        self.zavreno = True
+
+
+# Test poolu - spojení se znovu použije
+def test_pool_znovu_pouzije_spojeni():
+    """
+    Ověřuje, že vrácené spojení pool při dalším zapůjčení použije znovu
+    a nevytváří nové.
+    """
+
+    vytvorena = []
+
+    def tovarna():
+        vytvorena.append(FalesneSpojeni())
+        return vytvorena[-1]
+
+    pool = PoolPripojeni(tovarna, velikost=2)
+    pool.ziskat().close()
+    pool.ziskat().close()
+    assert len(vytvorena) == 1
+    assert pool.pocet_volnych() == 1
+
+
+# Test poolu - mrtvé a nečinné spojení se nahradí
+def test_pool_nahradi_mrtve_a_necinne_spojeni():
+    """
+    Ověřuje kontrolu zdraví při zapůjčení a vyřazení nečinných spojení.
+    - Spojení, které přestalo odpovídat, se zavře a nahradí novým.
+    - Spojení nečinné déle než 'max_necinnost' se zavře.
+    """
+
+    vytvorena = []
+
+    def tovarna():
+        vytvorena.append(FalesneSpojeni())
+        return vytvorena[-1]
+
+    pool = PoolPripojeni(tovarna, velikost=2)
+    pool.ziskat().close()
+    vytvorena[0].zive = False
+    pool.ziskat().close()
+    assert len(vytvorena) == 2
+    assert vytvorena[0].zavreno
+
+    pool.max_necinnost = 0
+    pool.ziskat().close()
+    assert vytvorena[1].zavreno
+    assert len(vytvorena) == 3
+
+
+# Test poolu - vyčerpaný pool vrátí None
+def test_pool_vycerpany_vrati_none():
+    """
+    Ověřuje, že při vyčerpání poolu a uplynutí doby čekání vrátí pool None.
+    """
+
+    pool = PoolPripojeni(FalesneSpojeni, velikost=1, cekani=0.01)
+    zapujcene = pool.ziskat()
+    assert pool.ziskat() is None
+    zapujcene.close()
+    assert pool.ziskat() is not None
+
+
+# Test směrovače čtení - vyčerpaný pool repliky
+def test_vycerpana_replika_necha_cist_z_primarniho(tmp_path):
+    """
+    Ověřuje, že při vyčerpaném poolu repliky směrovač na spojení nečeká,
+    přečte z primárního úložiště a repliku nevynechá; zpět do poolu vrácené
+    spojení se hned znovu použije.
+    """
+
+    smerovac = SmerovacCteni(
+        [UlozisteSQLite(str(tmp_path / "replika.db"))],
+        cteni_po_zapisu=0,
+        pool=PoolPripojeni(FalesneSpojeni, velikost=1, cekani=5),
+    )
+    zapujcene = smerovac.ziskat()
+    assert zapujcene is not None
+    zacatek = time.monotonic()
+    assert smerovac.ziskat() is None
+    assert time.monotonic() - zacatek < 1
+    assert smerovac.statistika() == {"repliky": [{"cteni": 1, "dostupna": True}], "z_primarniho": 1}
+    zapujcene.close()
+    spojeni = smerovac.ziskat()
+    assert spojeni is not None
+    spojeni.close()
+    smerovac.zavrit_vse()
+
+
+# Test poolu - nepotvrzený zápis není z jiného spojení vidět
+def test_nepotvrzeny_zapis_neni_videt_z_jineho_spojeni():
+    """
+    Ověřuje, že v databázi SQLite ':memory:' sdílené spojeními poolu
+    čtení z jiného spojení nevidí nepotvrzený zápis a nečeká na něj;
+    po potvrzení je zápis vidět.
+    """
+
+    uloziste = UlozisteSQLite()
+    pool = PoolPripojeni(uloziste.pripojit, velikost=2)
+    zapisujici, ctouci = pool.ziskat(), pool.ziskat()
+
+    def pocet_ukolu():
+        kurzor = ctouci.cursor()
+        kurzor.execute("SELECT COUNT(*) FROM ukoly")
+        pocet = kurzor.fetchone()[0]
+        kurzor.close()
+        ctouci.commit()
+        return pocet
+
+    try:
+        kurzor = zapisujici.cursor()
+        uloziste.vytvorit_tabulku_ukoly(kurzor)
+        zapisujici.commit()
+        kurzor.execute(
+            "INSERT INTO ukoly (nazev, popis, stav) VALUES (%s, %s, %s)",
+            ("Nepotvrzený", "Popis", "nezahájeno"),
+        )
+        kurzor.close()
+        assert pocet_ukolu() == 0
+        zapisujici.commit()
+        assert pocet_ukolu() == 1
+    finally:
+        zapisujici.close()
+        ctouci.close()
+        pool.zavrit_vse()
+
+
+# Test cache - zásahy, LRU a TTL
+def test_cache_zasahy_lru_a_ttl():
+    """
+    Ověřuje počítání zásahů a minutí, vyřazení nejdéle nepoužité položky
+    při překročení velikosti a vypršení položek po uplynutí TTL.
+    """
+
+    cache = CacheUkolu(ttl=60, max_polozek=2)
+    cache.ulozit("a", 1, None, cache.generace)
+    cache.ulozit("b", 2, None, cache.generace)
+    assert cache.ziskat("a") == (True, 1)
+    cache.ulozit("c", 3, None, cache.generace)
+    assert cache.ziskat("b") == (False, None)
+    assert cache.statistika() == {"zasahy": 1, "minuti": 1, "polozky": 2}
+
+    cache.ttl = 0
+    assert cache.ziskat("a") == (False, None)
+
+
+# Test cache - zneplatnění podle rozsahu ID
+def test_cache_zneplatneni_podle_id():
+    """
+    Ověřuje, že zápis zneplatní jen položky, jejichž rozsah ID změněný úkol
+    pokrývá, a že výsledek čtení souběžného se zápisem se neuloží.
+    """
+
+    cache = CacheUkolu()
+    cache.ulozit("prvni stranka", [], (0, 10), cache.generace)
+    cache.ulozit("posledni stranka", [], (10, None), cache.generace)
+    cache.ulozit("cela tabulka", [], None, cache.generace)
+
+    cache.zneplatnit([15])
+    assert cache.ziskat("prvni stranka")[0]
+    assert not cache.ziskat("posledni stranka")[0]
+    assert not cache.ziskat("cela tabulka")[0]
+
+    generace = cache.generace
+    cache.zneplatnit([5])
+    cache.ulozit("prvni stranka", [], (0, 10), generace)
+    assert not cache.ziskat("prvni stranka")[0]